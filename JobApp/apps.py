@@ -8,3 +8,6 @@ class JobappConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "JobApp"
+
+    def ready(self):
+        from JobApp import signals  # noqa: F401
@@ -0,0 +1,206 @@
+"""
+JWT authentication authorizing requests from the token's claims.
+
+`ClaimsJWTAuthentication` does not load the user when a request is
+authenticated. `request.user` is a `ClaimsUser` answering the checks
+permissions and profile views make (`is_authenticated`, `pk`,
+`employer_id`, `candidate_id`) from the signed claims, and loading the
+full `User` only when anything else is read from it.
+
+Claims alone only authorize safe requests of views that do not act on
+the user's own profile, and only while the token's generation claim
+matches the user's token generation in the cache. The generation is
+bumped when the user is deactivated or deleted or loses a profile
+(see `JobApp.signals`), so the user of an outdated token is loaded and
+a deleted or deactivated user is rejected with 401. Unsafe requests,
+and views resolving the user's profile through
+`resolve_actor(request, load_user=True)`, always load the user.
+
+`resolve_actor` exposes the user's profiles as `request.employer` and
+`request.candidate`, resolved with at most one query per request: the
+user loaded together with its employer and candidate.
+"""
+
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from JobApp.caching import get_token_generation
+from JobApp.tokens import (
+    CANDIDATE_ID_CLAIM,
+    EMPLOYER_ID_CLAIM,
+    GENERATION_CLAIM,
+    ROLE_CLAIM,
+)
+
+
+ACTOR_RELATIONS = ("employer", "candidate")
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    A lazy `User` backed by a validated token.
+
+    Unless `trusted`, i.e. for tokens issued before role claims were added
+    or before the user's token generation was bumped, the employer and
+    candidate ids are read from the loaded user.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token, load_user, trusted):
+        self.__dict__["_token"] = token
+        self.__dict__["_trusted"] = trusted
+        super().__init__(load_user)
+
+    def __bool__(self):
+        return True
+
+    def _get_user(self):
+        if self._wrapped is empty:
+            self._setup()
+        return self._wrapped
+
+    def _get_role_claim(self, claim):
+        if not self._trusted:
+            return getattr(self._get_user(), claim)
+        return self._token.get(claim)
+
+    @property
+    def pk(self):
+        return self._token[api_settings.USER_ID_CLAIM]
+
+    @property
+    def id(self):
+        return self.pk
+
+    @property
+    def employer_id(self):
+        return self._get_role_claim(EMPLOYER_ID_CLAIM)
+
+    @property
+    def candidate_id(self):
+        return self._get_role_claim(CANDIDATE_ID_CLAIM)
+
+
+class LazyProfile(SimpleLazyObject):
+    """
+    A lazy `Employer` or `Candidate` whose id is known from the token
+    claims, loaded with the user on first use of any other attribute.
+    """
+
+    def __init__(self, pk, load_profile):
+        self.__dict__["_pk"] = pk
+        super().__init__(load_profile)
+
+    def __bool__(self):
+        return True
+
+    @property
+    def pk(self):
+        return self._pk
+
+    @property
+    def id(self):
+        return self._pk
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` returning a `ClaimsUser` instead of querying the
+    user. The user is checked (existence, `is_active`) when it is loaded,
+    which happens right away for unsafe requests and tokens whose claims
+    are not trusted.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None and request.method not in SAFE_METHODS:
+            result[0]._get_user()
+        return result
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        trusted = ROLE_CLAIM in validated_token and validated_token.get(
+            GENERATION_CLAIM
+        ) == get_token_generation(validated_token[api_settings.USER_ID_CLAIM])
+        user = ClaimsUser(
+            validated_token, partial(self.load_user, validated_token), trusted
+        )
+        if not trusted:
+            user._get_user()
+        return user
+
+    def load_user(self, validated_token):
+        """
+        Loads the token's user together with its employer and candidate.
+        """
+        lookup = {
+            api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM]
+        }
+        try:
+            user = self.user_model.objects.select_related(*ACTOR_RELATIONS).get(
+                **lookup
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
+
+
+def _get_profile(user, relation):
+    try:
+        return getattr(user, relation)
+    except ObjectDoesNotExist:
+        return None
+
+
+def _get_lazy_profile(user, relation):
+    profile_id = getattr(user, f"{relation}_id")
+    if profile_id is None:
+        return None
+    return LazyProfile(profile_id, lambda: getattr(user._get_user(), relation))
+
+
+def resolve_actor(request, load_user=False):
+    """
+    Sets `request.employer` and `request.candidate` to the authenticated
+    user's profiles, or None, once per request.
+
+    With trusted claims and without `load_user` the profiles are `LazyProfile`
+    objects sharing the lazy user's single query; otherwise the user and
+    both profiles are loaded right away with one query, failing with 401
+    when the user no longer exists.
+    """
+    if "employer" in request.__dict__:
+        return
+    user = request.user
+    if not user.is_authenticated:
+        profiles = dict.fromkeys(ACTOR_RELATIONS)
+    elif isinstance(user, ClaimsUser) and user._trusted and not load_user:
+        profiles = {
+            relation: _get_lazy_profile(user, relation) for relation in ACTOR_RELATIONS
+        }
+    else:
+        if isinstance(user, ClaimsUser):
+            actor = user._get_user()
+        else:
+            actor = (
+                get_user_model()
+                .objects.select_related(*ACTOR_RELATIONS)
+                .get(pk=user.pk)
+            )
+        profiles = {
+            relation: _get_profile(actor, relation) for relation in ACTOR_RELATIONS
+        }
+    request.employer = profiles["employer"]
+    request.candidate = profiles["candidate"]
@@ -0,0 +1,196 @@
+"""
+Versioned response caches for the public job listings and employer
+overviews.
+
+Cached entries are keyed on generation counters stored in the default
+cache. Any change to the data rendered by a response bumps its
+generation, which makes every previously cached entry unreachable
+without having to enumerate keys, so the scheme works with any Django
+cache backend (including the local-memory and file backends).
+
+Job listings share one generation. Each employer overview has its own,
+so a change to one employer only invalidates that employer's overview;
+a second generation covers the lookup tables (cities, industries,
+skills, benefits) embedded in every overview.
+
+Every user also has a token generation, carried by the tokens issued to
+the user and bumped when the claims of those tokens can no longer be
+trusted (see `JobApp.authentication`).
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from JobApp import metrics
+
+
+GENERATION_KEY = "job-listings:generation"
+RESPONSE_PREFIX = "job-listings:response"
+EMPLOYER_GENERATION_KEY = "employer-overview:{}:generation"
+OVERVIEW_LOOKUPS_GENERATION_KEY = "employer-overview:lookups:generation"
+OVERVIEW_PREFIX = "employer-overview:response"
+TOKEN_GENERATION_KEY = "auth-tokens:{}:generation"
+CACHE_HEADER = "X-Cache"
+
+
+def get_generation(key=GENERATION_KEY):
+    """
+    Returns the current generation stored under `key`, the job listings
+    generation by default.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        # Seed from the clock so a generation lost on eviction never
+        # resurrects entries cached under an earlier value.
+        cache.add(key, time.time_ns())
+        generation = cache.get(key)
+    return generation
+
+
+def _bump_generation(key=GENERATION_KEY):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns())
+
+
+def _invalidate(key):
+    """
+    Bumps the generation under `key` immediately and once more after the
+    current transaction commits, so responses cached from pre-commit data
+    while the transaction was open are discarded as well.
+    """
+    _bump_generation(key)
+    transaction.on_commit(lambda: _bump_generation(key))
+
+
+def invalidate_job_listings():
+    """
+    Invalidates all cached job listings.
+    """
+    _invalidate(GENERATION_KEY)
+
+
+def invalidate_employer_overview(employer_id):
+    """
+    Invalidates the cached overviews of one employer.
+    """
+    _invalidate(EMPLOYER_GENERATION_KEY.format(employer_id))
+
+
+def invalidate_employer_overviews():
+    """
+    Invalidates the cached overviews of all employers.
+    """
+    _invalidate(OVERVIEW_LOOKUPS_GENERATION_KEY)
+
+
+def get_token_generation(user_id):
+    """
+    Returns the generation of the tokens issued to one user.
+    """
+    return get_generation(TOKEN_GENERATION_KEY.format(user_id))
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Stops authorizing requests from the claims of the tokens issued to one
+    user so far; their user is loaded on every request instead.
+    """
+    _invalidate(TOKEN_GENERATION_KEY.format(user_id))
+
+
+def get_employer_overview_key(employer_id, *parts):
+    """
+    Returns the cache key of an employer overview, versioned on the
+    employer's generation and the lookup tables generation.
+    """
+    return ":".join(
+        str(part)
+        for part in (
+            OVERVIEW_PREFIX,
+            get_generation(OVERVIEW_LOOKUPS_GENERATION_KEY),
+            get_generation(EMPLOYER_GENERATION_KEY.format(employer_id)),
+            employer_id,
+            *parts,
+        )
+    )
+
+
+def normalize_query_params(query_params):
+    """
+    Returns the query parameters as a sorted list of `(name, value)` pairs.
+    """
+    return sorted(
+        (name, value.strip())
+        for name, values in query_params.lists()
+        for value in values
+    )
+
+
+class ResponseCacheMixin:
+    """
+    Caches the list responses of anonymous requests in the default cache.
+
+    Entries are keyed on the job listings generation, the request's path
+    and its normalized query parameters, and expire after
+    `RESPONSE_CACHE_TIMEOUT` seconds. Responses carry an `X-Cache` header
+    reporting `HIT` or `MISS`; the totals are counted in `JobApp.metrics`.
+
+    When combined with `ConditionalGetMixin` (listed after this mixin),
+    the response version is cached as well, so cache hits run no queries.
+    """
+
+    response_cache_prefix = RESPONSE_PREFIX
+
+    def get_response_cache_key(self, request):
+        if request.user.is_authenticated:
+            return None
+        payload = json.dumps(
+            [
+                request.build_absolute_uri(request.path),
+                request.accepted_renderer.format,
+                normalize_query_params(request.query_params),
+            ],
+            separators=(",", ":"),
+        )
+        digest = hashlib.sha1(payload.encode()).hexdigest()
+        return f"{self.response_cache_prefix}:{get_generation()}:{digest}"
+
+    def get_version(self):
+        key = self.get_response_cache_key(self.request)
+        if key is None:
+            return super().get_version()
+        key = f"{key}:version"
+        cached = cache.get(key)
+        if cached is None:
+            cached = (super().get_version(),)
+            cache.set(key, cached, getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+        return cached[0]
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return super().list(request, *args, **kwargs)
+
+        data = cache.get(key)
+        if data is not None:
+            metrics.increment("response_cache.hit")
+            return Response(data, headers={CACHE_HEADER: "HIT"})
+
+        metrics.increment("response_cache.miss")
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                key,
+                response.data,
+                getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300),
+            )
+        response[CACHE_HEADER] = "MISS"
+        return response
@@ -0,0 +1,155 @@
+"""
+Faceted counts for the job board.
+
+`job_offer_facets` returns, for the current `JobOfferFilter` state, how
+many offers match each value of the seniority, contract, remoteness,
+skill, city, industry and benefit facets. Every facet is counted with a
+single grouped query over the offers matching all *other* filters, so
+selecting a value never hides its siblings. Results are cached under a
+key derived from the normalized filter parameters and the job listings
+generation, so they are invalidated together with the listings.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django_filters import utils
+from rest_framework.settings import api_settings
+
+from JobApp.caching import get_generation
+from JobApp.filters import JobOfferFilter
+from JobApp.models import EmployerBenefit, JobOffer, JobOfferSkill
+from JobApp.search import JobOfferSearchFilter
+
+
+CACHE_PREFIX = "job-facets"
+
+CHOICE_FACETS = {
+    "seniority": JobOffer.Seniority,
+    "contract": JobOffer.ContractType,
+    "remoteness": JobOffer.RemotenessLevel,
+}
+
+RELATED_FACETS = {
+    "city": "search_document__city__name",
+    "industry": "search_document__industry__name",
+}
+
+
+# Facets whose values are selected by several filter parameters; all of
+# them are dropped when counting the facet.
+FACET_PARAMS = {
+    "skill": ("skill", "skill_all", "skill_match"),
+    "benefits": ("benefits", "benefits_match"),
+}
+
+
+def _facet_limit():
+    return getattr(settings, "JOB_FACETS_LIMIT", 20)
+
+
+def normalize_facet_params(query_params):
+    """
+    Returns the filter parameters relevant to facets as a sorted mapping
+    of parameter name to the sorted list of its distinct values, so that
+    equivalent requests share a cache entry.
+    """
+    names = [*JobOfferFilter.base_filters, api_settings.SEARCH_PARAM]
+    normalized = {}
+    for name in sorted(names):
+        values = {
+            value.strip()
+            for raw in query_params.getlist(name)
+            for value in raw.split(",")
+            if value.strip()
+        }
+        if values:
+            normalized[name] = sorted(values)
+    return normalized
+
+
+def _cache_key(params):
+    payload = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{get_generation()}:{digest}"
+
+
+def _filtered_offers(request, params, exclude=None):
+    """
+    Returns the offers matching the search terms and every filter
+    parameter except those of the `exclude` facet, or raises
+    `ValidationError`.
+    """
+    data = {name: ",".join(values) for name, values in params.items()}
+    for name in FACET_PARAMS.get(exclude, (exclude,)):
+        data.pop(name, None)
+    filterset = JobOfferFilter(data, queryset=JobOffer.objects.all())
+    if not filterset.is_valid():
+        raise utils.translate_validation(filterset.errors)
+    queryset = JobOfferSearchFilter().filter_matches(request, filterset.qs)
+    return queryset.order_by()
+
+
+def _grouped(queryset, field, count_field="pk"):
+    return [
+        {"value": row[field], "count": row["count"]}
+        for row in queryset.exclude(**{f"{field}__isnull": True})
+        .values(field)
+        .annotate(count=Count(count_field, distinct=True))
+        .order_by("-count", field)[: _facet_limit()]
+    ]
+
+
+def _choice_counts(queryset, name, choices):
+    counts = dict(
+        queryset.values_list(f"search_document__{name}")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    return [
+        {"value": value, "display": display, "count": counts.get(value, 0)}
+        for value, display in choices.choices
+    ]
+
+
+def _skill_counts(queryset):
+    return _grouped(
+        JobOfferSkill.objects.filter(offer__in=queryset.values("pk")),
+        "skill__name",
+        count_field="offer",
+    )
+
+
+def _benefit_counts(queryset):
+    return _grouped(
+        EmployerBenefit.objects.filter(employer__joboffer__in=queryset.values("pk")),
+        "benefit__name",
+        count_field="employer__joboffer",
+    )
+
+
+def job_offer_facets(request):
+    """
+    Returns the facet counts for the request's filter and search parameters.
+    """
+    params = normalize_facet_params(request.query_params)
+    key = _cache_key(params)
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+
+    facets = {"total": _filtered_offers(request, params).count()}
+    for name, choices in CHOICE_FACETS.items():
+        facets[name] = _choice_counts(
+            _filtered_offers(request, params, name), name, choices
+        )
+    facets["skill"] = _skill_counts(_filtered_offers(request, params, "skill"))
+    for name, field in RELATED_FACETS.items():
+        facets[name] = _grouped(_filtered_offers(request, params, name), field)
+    facets["benefits"] = _benefit_counts(_filtered_offers(request, params, "benefits"))
+
+    cache.set(key, facets, getattr(settings, "JOB_FACETS_CACHE_TIMEOUT", 60))
+    return facets
@@ -0,0 +1,68 @@
+import json
+
+from django.db import models
+from django.db.models import Lookup
+
+
+class IdListField(models.JSONField):
+    """
+    A JSON array of integer ids (e.g. the skill ids of a job offer).
+
+    Supports the `overlap` (any of the given ids) and `contains_all`
+    (every given id) lookups, compiled to `jsonb` containment on
+    PostgreSQL, where a GIN index can serve them, and to `json_each`
+    subqueries on SQLite.
+    """
+
+
+class _IdListLookup(Lookup):
+    prepare_rhs = False
+
+    def get_prep_lookup(self):
+        return sorted({int(value) for value in self.rhs})
+
+
+@IdListField.register_lookup
+class IdListOverlap(_IdListLookup):
+    lookup_name = "overlap"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if not self.rhs:
+            return "1 = 0", []
+        placeholders = ", ".join(["%s"] * len(self.rhs))
+        sql = (
+            f"EXISTS (SELECT 1 FROM json_each({lhs}) "
+            f"WHERE json_each.value IN ({placeholders}))"
+        )
+        return sql, [*lhs_params, *self.rhs]
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if not self.rhs:
+            return "1 = 0", []
+        sql = " OR ".join([f"{lhs} @> %s::jsonb"] * len(self.rhs))
+        params = []
+        for value in self.rhs:
+            params.extend([*lhs_params, json.dumps([value])])
+        return f"({sql})", params
+
+
+@IdListField.register_lookup
+class IdListContainsAll(_IdListLookup):
+    lookup_name = "contains_all"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        if not self.rhs:
+            return "1 = 1", []
+        placeholders = ", ".join(["%s"] * len(self.rhs))
+        sql = (
+            f"(SELECT COUNT(DISTINCT json_each.value) FROM json_each({lhs}) "
+            f"WHERE json_each.value IN ({placeholders})) = %s"
+        )
+        return sql, [*lhs_params, *self.rhs, len(self.rhs)]
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f"{lhs} @> %s::jsonb", [*lhs_params, json.dumps(self.rhs)]
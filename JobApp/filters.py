@@ -1,5 +1,7 @@
 from datetime import timedelta
+import math
 
+from django.db.models import Count, Exists, OuterRef
 from django.utils import timezone
 import django_filters
 from django_filters import widgets
@@ -17,6 +19,193 @@ from .models import (
 )
 
 
+def min_experience_days(years):
+    """
+    Returns the smallest number of experience days that rounds to at least
+    `years` half-years, or None when every candidate qualifies.
+
+    Experience is displayed as `round(days / 365.25 * 2) / 2`. Rounding
+    `days * 8 / 1461` to at least `n` half-years means
+    `days * 16 > 1461 * (2n - 1)`; the right-hand side is odd, so the
+    boundary is never hit exactly and rounding ties cannot occur.
+    """
+    half_years = math.ceil(years * 2)
+    if half_years <= 0:
+        return None
+    return 1461 * (2 * half_years - 1) // 16 + 1
+
+
+def max_experience_days(years):
+    """
+    Returns the largest number of experience days that rounds to at most
+    `years` half-years, or None when no candidate qualifies.
+    """
+    half_years = math.floor(years * 2)
+    if half_years < 0:
+        return None
+    return 1461 * (2 * half_years + 1) // 16
+
+
+class MatchModeMixin:
+    """
+    Adds AND/OR semantics to a multi-valued filter.
+
+    `RelatedExistsFilterSet` pairs every such filter with a
+    `<name>_match` parameter: `any` (the default) keeps rows matching at
+    least one of the values, `all` keeps rows matching every value.
+    Filters created with a fixed `match` mode get no parameter.
+    """
+
+    match_param = None
+
+    def __init__(self, *args, match=None, **kwargs):
+        self.match = match
+        super().__init__(*args, **kwargs)
+
+    def get_match_mode(self):
+        if self.match is not None:
+            return self.match
+        if self.match_param is None:
+            return MatchFilter.ANY
+        return self.parent.form.cleaned_data.get(self.match_param) or MatchFilter.ANY
+
+
+class MatchFilter(django_filters.ChoiceFilter):
+    """
+    The `<name>_match` parameter of a `MatchModeMixin` filter. It does not
+    filter by itself; the paired filter reads its value.
+    """
+
+    ANY = "any"
+    ALL = "all"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("choices", [(self.ANY, "any"), (self.ALL, "all")])
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        return qs
+
+
+class RelatedExistsMixin:
+    """
+    Compiles a filter across a one-to-many relation into a correlated
+    `EXISTS` subquery instead of a join, so a row matching several related
+    rows is still returned once and aggregates over the row are not
+    multiplied.
+
+    Matching every value is compiled into a single grouped subquery
+    (`GROUP BY <parent> HAVING COUNT(DISTINCT <column>) = n`) over the
+    related rows holding any of the values.
+
+    The first part of `field_name` is the reverse relation and the rest
+    the lookup path on the related model, e.g. `candidateskill__skill`.
+    """
+
+    def get_match_mode(self):
+        return MatchFilter.ANY
+
+    def get_values(self, value):
+        return list(value)
+
+    def related_rows(self, values):
+        """
+        Returns the related rows holding any of the values and the name of
+        their foreign key to the filtered model.
+        """
+        relation_name, _, path = self.field_name.partition("__")
+        relation = self.model._meta.get_field(relation_name)
+        rows = relation.related_model._default_manager.filter(**{f"{path}__in": values})
+        return rows, relation.field.name
+
+    def exists(self, values):
+        rows, parent = self.related_rows(values)
+        return Exists(rows.filter(**{parent: OuterRef("pk")}))
+
+    def matching_all(self, values):
+        rows, parent = self.related_rows(values)
+        _, _, path = self.field_name.partition("__")
+        return (
+            rows.order_by()
+            .values(parent)
+            .annotate(matched=Count(path, distinct=True))
+            .filter(matched=len(values))
+            .values(parent)
+        )
+
+    def filter(self, qs, value):
+        if value is None or value == "":
+            return qs
+        values = list(dict.fromkeys(self.get_values(value)))
+        if not values:
+            return qs
+        if self.get_match_mode() == MatchFilter.ALL and len(values) > 1:
+            return qs.filter(pk__in=self.matching_all(values))
+        return qs.filter(self.exists(values))
+
+
+class RelatedMultipleChoiceFilter(
+    MatchModeMixin, RelatedExistsMixin, django_filters.ModelMultipleChoiceFilter
+):
+    """
+    Filters rows by related objects selected by `to_field_name`, e.g. skill names.
+    """
+
+    def get_values(self, value):
+        return [obj.pk for obj in value]
+
+
+class RelatedInFilter(MatchModeMixin, RelatedExistsMixin, django_filters.BaseInFilter):
+    """
+    Filters rows by CSV values of a column of a related model.
+    """
+
+
+class RelatedBooleanFilter(RelatedExistsMixin, django_filters.BooleanFilter):
+    """
+    Filters rows having a related row with the given flag value.
+    """
+
+    def get_values(self, value):
+        return [value]
+
+
+class IdListFilter(MatchModeMixin, django_filters.ModelMultipleChoiceFilter):
+    """
+    Filters rows whose `IdListField` contains any (or, with `<name>_match=all`,
+    every) of the selected objects.
+    """
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        lookup = (
+            "contains_all" if self.get_match_mode() == MatchFilter.ALL else "overlap"
+        )
+        return qs.filter(**{f"{self.field_name}__{lookup}": [obj.pk for obj in value]})
+
+
+class RelatedExistsFilterSet(django_filters.FilterSet):
+    """
+    FilterSet adding a `<name>_match` parameter for every `MatchModeMixin` filter.
+    """
+
+    @classmethod
+    def get_filters(cls):
+        filters = super().get_filters()
+        for name, filter_ in list(filters.items()):
+            if isinstance(filter_, MatchModeMixin) and filter_.match is None:
+                filter_.match_param = f"{name}_match"
+                filters.setdefault(
+                    filter_.match_param,
+                    MatchFilter(
+                        field_name=filter_.match_param,
+                        label=f"Match any or all {name} values",
+                    ),
+                )
+        return filters
+
+
 class UserFilter(django_filters.FilterSet):
     """
     FilterSet for filtering users by city and country.
@@ -45,7 +234,7 @@ class UserFilter(django_filters.FilterSet):
         fields = ["city", "country"]
 
 
-class EmployerFilter(django_filters.FilterSet):
+class EmployerFilter(RelatedExistsFilterSet):
     """
     FilterSet for filtering employers based on city, country and industry.
     Filters:
@@ -53,6 +242,8 @@ class EmployerFilter(django_filters.FilterSet):
         - country: Filters employers by country name.
         - industry: Filters employers by industry name.
         - benefits: Filters employers by benefits offered.
+
+    Multi-valued filters accept a `<name>_match=any|all` parameter.
     """
 
     city = django_filters.ModelMultipleChoiceFilter(
@@ -75,8 +266,8 @@ class EmployerFilter(django_filters.FilterSet):
         label="Industry",
         widget=widgets.CSVWidget,
     )
-    benefits = django_filters.ModelMultipleChoiceFilter(
-        field_name="benefits__name",
+    benefits = RelatedMultipleChoiceFilter(
+        field_name="employerbenefit__benefit",
         to_field_name="name",
         queryset=Benefit.objects.all(),
         label="Benefit",
@@ -88,7 +279,7 @@ class EmployerFilter(django_filters.FilterSet):
         fields = ["city", "country", "industry", "benefits"]
 
 
-class CandidateFilter(django_filters.FilterSet):
+class CandidateFilter(RelatedExistsFilterSet):
     """
     FilterSet for filtering candidates based on various criteria.
 
@@ -96,6 +287,7 @@ class CandidateFilter(django_filters.FilterSet):
         - city: Filters candidates by city name.
         - country: Filters candidates by country name.
         - skill: Filters candidates by skill name.
+        - skill_all: Filters candidates having every one of the given skills.
         - field_of_study: Filters candidates by field of study.
         - school_name: Filters candidates by school name.
         - degree: Filters candidates by degree.
@@ -103,6 +295,10 @@ class CandidateFilter(django_filters.FilterSet):
         - job_is_current: Filters candidates by whether their job is current.
         - job_position: Filters candidates by job position.
         - min_experience_years: Filters candidates by minimum years of experience.
+
+    Filters on skills, education and experience are compiled into `EXISTS`
+    subqueries, and the multi-valued ones accept a `<name>_match=any|all`
+    parameter.
     """
 
     city = django_filters.ModelMultipleChoiceFilter(
@@ -118,35 +314,43 @@ class CandidateFilter(django_filters.FilterSet):
         label="Country",
         widget=widgets.CSVWidget,
     )
-    skill = django_filters.ModelMultipleChoiceFilter(
-        field_name="candidateskill__skill__name",
+    skill = RelatedMultipleChoiceFilter(
+        field_name="candidateskill__skill",
         to_field_name="name",
         queryset=Skill.objects.all(),
         label="Skill",
         widget=widgets.CSVWidget,
     )
-    field_of_study = django_filters.BaseInFilter(
+    skill_all = RelatedMultipleChoiceFilter(
+        field_name="candidateskill__skill",
+        to_field_name="name",
+        queryset=Skill.objects.all(),
+        label="Skill (all of)",
+        match=MatchFilter.ALL,
+        widget=widgets.CSVWidget,
+    )
+    field_of_study = RelatedInFilter(
         field_name="candidateeducation__field_of_study",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
-    school_name = django_filters.BaseInFilter(
+    school_name = RelatedInFilter(
         field_name="candidateeducation__school_name",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
-    degree = django_filters.BaseInFilter(
+    degree = RelatedInFilter(
         field_name="candidateeducation__degree",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
-    education_is_current = django_filters.BooleanFilter(
+    education_is_current = RelatedBooleanFilter(
         field_name="candidateeducation__is_current",
     )
-    job_is_current = django_filters.BooleanFilter(
+    job_is_current = RelatedBooleanFilter(
         field_name="candidateexperience__is_current",
     )
-    job_position = django_filters.BaseInFilter(
+    job_position = RelatedInFilter(
         field_name="candidateexperience__job_position",
         lookup_expr="in",
         widget=widgets.CSVWidget,
@@ -162,45 +366,19 @@ class CandidateFilter(django_filters.FilterSet):
         """
         Filters the queryset to include only candidates with at least the specified number of years of experience.
         """
-
-        def days_to_half_years(days):
-            if days is None:
-                return 0
-            return round((days / 365.25) * 2) / 2
-
-        ids = [
-            c.id
-            for c in queryset
-            if days_to_half_years(
-                getattr(c, "total_experience_days", 0).days
-                if getattr(c, "total_experience_days", None)
-                else 0
-            )
-            >= value
-        ]
-        return queryset.filter(id__in=ids)
+        min_days = min_experience_days(value)
+        if min_days is None:
+            return queryset
+        return queryset.filter(total_experience_days__gte=min_days)
 
     def filter_max_experience_years(self, queryset, name, value):
         """
         Filters the queryset to include only candidates with at most the specified number of years of experience.
         """
-
-        def days_to_half_years(days):
-            if days is None:
-                return 0
-            return round((days / 365.25) * 2) / 2
-
-        ids = [
-            c.id
-            for c in queryset
-            if days_to_half_years(
-                getattr(c, "total_experience_days", 0).days
-                if getattr(c, "total_experience_days", None)
-                else 0
-            )
-            <= value
-        ]
-        return queryset.filter(id__in=ids)
+        max_days = max_experience_days(value)
+        if max_days is None:
+            return queryset.none()
+        return queryset.filter(total_experience_days__lte=max_days)
 
     class Meta:
         model = Candidate
@@ -218,60 +396,92 @@ class CandidateFilter(django_filters.FilterSet):
         ]
 
 
-class JobOfferFilter(django_filters.FilterSet):
+class JobOfferFilter(RelatedExistsFilterSet):
     """
     FilterSet for filtering job offers based on various criteria.
 
-    Filters:
+    All filters read the offer's `JobOfferSearchDocument`, which carries
+    a denormalized copy of the filtered columns, so combining filters
+    never joins the location, employer, skill or benefit tables.
 
+    Filters:
+        - city: Filters job offers by city name.
+        - country: Filters job offers by country name.
+        - skill: Filters job offers requiring any (or, with `skill_match=all`,
+          every) of the given skills.
+        - skill_all: Filters job offers requiring every one of the given skills.
+        - industry: Filters job offers by the employer's industry name.
+        - seniority: Filters job offers by seniority level.
+        - contract: Filters job offers by contract type.
+        - remoteness: Filters job offers by remoteness level.
+        - min_wage: Filters job offers by minimum wage.
+        - max_wage: Filters job offers by maximum wage.
+        - benefits: Filters job offers whose employer offers any (or, with
+          `benefits_match=all`, every) of the given benefits.
+        - posted_within: Filters job offers by age (e.g. 1d, 7d, 24h).
     """
 
     city = django_filters.ModelMultipleChoiceFilter(
-        field_name="location__city__name",
+        field_name="search_document__city",
         to_field_name="name",
+        method="filter_in",
         queryset=City.objects.all(),
         widget=widgets.CSVWidget,
     )
     country = django_filters.ModelMultipleChoiceFilter(
-        field_name="location__city__country__name",
+        field_name="search_document__country",
         to_field_name="name",
+        method="filter_in",
         queryset=Country.objects.all(),
         label="Country",
         widget=widgets.CSVWidget,
     )
-    skill = django_filters.ModelMultipleChoiceFilter(
-        field_name="jobofferskill__skill__name",
+    skill = IdListFilter(
+        field_name="search_document__skill_ids",
         to_field_name="name",
         queryset=Skill.objects.all(),
         label="Skill",
         widget=widgets.CSVWidget,
     )
+    skill_all = IdListFilter(
+        field_name="search_document__skill_ids",
+        to_field_name="name",
+        queryset=Skill.objects.all(),
+        label="Skill (all of)",
+        match=MatchFilter.ALL,
+        widget=widgets.CSVWidget,
+    )
     industry = django_filters.ModelMultipleChoiceFilter(
-        field_name="employer__industry__name",
+        field_name="search_document__industry",
         to_field_name="name",
+        method="filter_in",
         queryset=Industry.objects.all(),
         label="Industry",
         widget=widgets.CSVWidget,
     )
     seniority = django_filters.BaseInFilter(
-        field_name="seniority",
+        field_name="search_document__seniority",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
     contract = django_filters.BaseInFilter(
-        field_name="contract",
+        field_name="search_document__contract",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
     remoteness = django_filters.BaseInFilter(
-        field_name="remoteness",
+        field_name="search_document__remoteness",
         lookup_expr="in",
         widget=widgets.CSVWidget,
     )
-    min_wage = django_filters.NumberFilter(field_name="wage", lookup_expr="gte")
-    max_wage = django_filters.NumberFilter(field_name="wage", lookup_expr="lte")
-    benefits = django_filters.ModelMultipleChoiceFilter(
-        field_name="employer__employerbenefit__benefit__name",
+    min_wage = django_filters.NumberFilter(
+        field_name="search_document__wage", lookup_expr="gte"
+    )
+    max_wage = django_filters.NumberFilter(
+        field_name="search_document__wage", lookup_expr="lte"
+    )
+    benefits = IdListFilter(
+        field_name="search_document__benefit_ids",
         to_field_name="name",
         queryset=Benefit.objects.all(),
         label="Benefit",
@@ -282,6 +492,14 @@ class JobOfferFilter(django_filters.FilterSet):
         label="Posted within (e.g., 1d, 7d, 30d, 24h)",
     )
 
+    def filter_in(self, queryset, name, value):
+        """
+        Filters the queryset to offers referencing any of the selected objects.
+        """
+        if not value:
+            return queryset
+        return queryset.filter(**{f"{name}__in": [obj.pk for obj in value]})
+
     def filter_posted_within(self, queryset, name, value):
         try:
             unit = value[-1].lower()
@@ -295,7 +513,7 @@ class JobOfferFilter(django_filters.FilterSet):
                 delta = timedelta(minutes=amount)
             else:
                 return queryset
-            return queryset.filter(created_at__gte=now - delta)
+            return queryset.filter(search_document__created_at__gte=now - delta)
         except (ValueError, IndexError):
             return queryset
 
@@ -0,0 +1,47 @@
+"""
+Password hashers of the `PASSWORD_HASHING_PROFILE` setting.
+
+Every profile keeps all hashers below in `PASSWORD_HASHERS` after its
+preferred one, so passwords hashed under another profile still verify and
+are rehashed with the preferred hasher on the next successful login.
+"""
+
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the OWASP recommended 19 MiB of memory, two passes and a
+    single lane, since our pods get half a CPU. Requires `argon2-cffi`.
+    """
+
+    time_cost = 2
+    memory_cost = 19_456
+    parallelism = 1
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with N = 2^15, r = 8 and p = 1 (32 MiB per hash).
+    """
+
+    work_factor = 2**15
+    block_size = 8
+    parallelism = 1
+    maxmem = 64 * 1024 * 1024
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with a thousand iterations, for development and load tests only.
+
+    Uses its own algorithm name, so the hashes it produces are upgraded
+    once a stronger profile is selected.
+    """
+
+    algorithm = "pbkdf2_sha256_fast"
+    iterations = 1_000
@@ -0,0 +1,169 @@
+from statistics import median
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from JobApp.management.commands.benchmark_candidate_filters import _bench_city
+from JobApp.models import Industry, User
+from JobApp.throttles import LoginIPThrottle
+from JobApp.tokens import issue_tokens
+from JobApp.views.candidate_views import RegisterCandidateView
+from JobApp.views.employer_views import RegisterEmployerView
+from JobApp.views.user_views import MyTokenObtainPairView, UserRegistrationView
+
+
+BENCH_EMAIL = "bench-auth-{:07d}@example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+
+class _ExhaustedLoginThrottle(LoginIPThrottle):
+    """
+    A login throttle allowing a single attempt, to time rejected logins.
+    """
+
+    scope = "bench_login_ip"
+    rate = "1/day"
+
+
+def _mint_pairs(user, pairs):
+    """
+    The original implementation: every serializer rendering tokens signed
+    its own refresh/access pair.
+    """
+    for _ in range(pairs):
+        refresh = RefreshToken.for_user(user)
+        str(refresh), str(refresh.access_token)
+
+
+def _issue_once(user):
+    user.__dict__.pop("_issued_tokens", None)
+    issue_tokens(user)
+
+
+def _cpu_ms(function, repeat):
+    timings = []
+    for index in range(repeat):
+        started = time.process_time()
+        function(index)
+        timings.append((time.process_time() - started) * 1000)
+    return median(timings), min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the CPU time of token issuance, logins and registrations, and "
+        "the resulting requests per second of a single worker. Rows created by "
+        "the benchmark are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        with transaction.atomic():
+            self.run(repeat)
+            transaction.set_rollback(True)
+
+    def run(self, repeat):
+        city = _bench_city()
+        user = User.objects.create_user(
+            email=BENCH_EMAIL.format(0), password=BENCH_PASSWORD, city=city
+        )
+        factory = APIRequestFactory()
+
+        # A login used to sign 3 pairs, a registration 2 (plus the login's 3
+        # for `/api/users/register/`); `issue_tokens` signs one per event.
+        scenarios = [
+            ("tokens: 3 pairs (old login)", lambda _: _mint_pairs(user, 3)),
+            ("tokens: 2 pairs (old registration)", lambda _: _mint_pairs(user, 2)),
+            ("tokens: issue_tokens", lambda _: _issue_once(user)),
+        ]
+
+        # Throttles are disabled for the timed logins and registrations, the
+        # rejected login scenario exhausts a throttle of its own.
+        login = MyTokenObtainPairView.as_view(throttle_classes=[])
+
+        def log_in(_):
+            response = login(
+                factory.post(
+                    "/api/users/login/",
+                    {"email": user.email, "password": BENCH_PASSWORD},
+                    format="json",
+                )
+            )
+            assert response.status_code == 200, response.data
+
+        throttled_login = MyTokenObtainPairView.as_view(
+            throttle_classes=[_ExhaustedLoginThrottle]
+        )
+
+        def log_in_throttled(_):
+            response = throttled_login(
+                factory.post(
+                    "/api/users/login/",
+                    {"email": user.email, "password": "wrong-password"},
+                    format="json",
+                )
+            )
+            assert response.status_code in (401, 429), response.data
+
+        industry, _ = Industry.objects.get_or_create(name="Bench Industry")
+        registrations = [
+            ("user", UserRegistrationView.as_view(throttle_classes=[]), {}),
+            ("candidate", RegisterCandidateView.as_view(throttle_classes=[]), {}),
+            (
+                "employer",
+                RegisterEmployerView.as_view(throttle_classes=[]),
+                {"industry": industry.pk},
+            ),
+        ]
+
+        def sign_up(kind, view, extra):
+            def run(index):
+                number = {"user": 1, "candidate": 2, "employer": 3}[kind] * 100_000
+                number += index
+                response = view(
+                    factory.post(
+                        f"/api/{kind}s/register/",
+                        {
+                            "email": BENCH_EMAIL.format(number),
+                            "password": BENCH_PASSWORD,
+                            "phone_number": f"+6{number:011d}",
+                            "city": city.pk,
+                            "first_name": "Bench",
+                            "last_name": "User",
+                            "company_name": f"Bench Company {number}",
+                            "website_url": f"https://bench-{number}.example.com",
+                            **extra,
+                        },
+                        format="json",
+                    )
+                )
+                assert response.status_code == 201, response.data
+
+            return run
+
+        scenarios.append(("login request", log_in))
+        scenarios.append(("throttled login request", log_in_throttled))
+        scenarios += [
+            (f"{kind} registration request", sign_up(kind, view, extra))
+            for kind, view, extra in registrations
+        ]
+        try:
+            for label, function in scenarios:
+                median_ms, min_ms = _cpu_ms(function, repeat)
+                self.stdout.write(
+                    f"{label:>34}: median {median_ms:8.2f} ms CPU, "
+                    f"min {min_ms:8.2f} ms CPU, {1000 / median_ms:8.1f}/s per worker"
+                )
+        finally:
+            # APIRequestFactory requests come from 127.0.0.1.
+            cache.delete(
+                _ExhaustedLoginThrottle.cache_format
+                % {"scope": _ExhaustedLoginThrottle.scope, "ident": "127.0.0.1"}
+            )
@@ -0,0 +1,161 @@
+from datetime import date, timedelta
+from statistics import median
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db.models import DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import Coalesce
+
+from JobApp.filters import CandidateFilter
+from JobApp.mixins import CandidateWithExperienceMixin
+from JobApp.models import Candidate, CandidateExperience, City, Country, User
+from JobApp.summaries import refresh_candidate_summaries
+
+
+BENCH_EMAIL = "bench-candidate-{:07d}@example.com"
+
+
+def _bench_city():
+    country, _ = Country.objects.get_or_create(name="Bench Country")
+    city, _ = City.objects.get_or_create(
+        name="Bench City", province="Bench Province", country=country
+    )
+    return city
+
+
+def _seed_candidates(target, batch_size, stdout):
+    existing = User.objects.filter(email__startswith="bench-candidate-").count()
+    if existing >= target:
+        return
+    city = _bench_city()
+    password = make_password(None)
+    for start in range(existing, target, batch_size):
+        stop = min(start + batch_size, target)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=BENCH_EMAIL.format(i),
+                    phone_number=f"+4{i:011d}",
+                    password=password,
+                    city=city,
+                )
+                for i in range(start, stop)
+            ]
+        )
+        candidates = Candidate.objects.bulk_create(
+            [Candidate(user=user) for user in users]
+        )
+        experiences = []
+        for i, candidate in enumerate(candidates, start=start):
+            # Zero to three jobs of up to ~4 years each, the last one current.
+            for job in range(i % 4):
+                date_from = date(2010, 1, 1) + timedelta(
+                    days=(i * 37 + job * 900) % 5000
+                )
+                current = job == i % 4 - 1 and i % 3 == 0
+                experiences.append(
+                    CandidateExperience(
+                        candidate=candidate,
+                        company_name="Bench Company",
+                        job_position="Bench Position",
+                        date_from=date_from,
+                        date_to=(
+                            None
+                            if current
+                            else date_from + timedelta(days=200 + (i * 13) % 1300)
+                        ),
+                        is_current=current,
+                    )
+                )
+        CandidateExperience.objects.bulk_create(experiences)
+        refresh_candidate_summaries(candidate.pk for candidate in candidates)
+        stdout.write(f"  seeded {stop}/{target} candidates")
+
+
+def _python_filter(min_years, max_years):
+    """
+    The original implementation: aggregates every candidate's experience,
+    rounds it in Python and re-filters the queryset with the matching ids.
+    """
+    today = date.today()
+    queryset = Candidate.objects.annotate(
+        total_experience_days=Sum(
+            ExpressionWrapper(
+                (
+                    Coalesce("candidateexperience__date_to", today)
+                    - F("candidateexperience__date_from")
+                ),
+                output_field=DurationField(),
+            )
+        )
+    )
+
+    def half_years(candidate):
+        days = candidate.total_experience_days
+        days = days.days if days else 0
+        return round((days / 365.25) * 2) / 2
+
+    ids = [
+        candidate.id
+        for candidate in queryset
+        if min_years <= half_years(candidate) <= max_years
+    ]
+    return queryset.filter(id__in=ids)
+
+
+def _summary_filter(min_years, max_years):
+    return CandidateFilter(
+        {"min_experience_years": min_years, "max_experience_years": max_years},
+        queryset=CandidateWithExperienceMixin().get_queryset(),
+    ).qs
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the original Python implementation of the candidate experience "
+        "filters with the CandidateSummary backed one, seeding candidates up to "
+        "each of --sizes first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10000,100000,1000000",
+            help="Comma separated candidate counts (default: 10000,100000,1000000).",
+        )
+        parser.add_argument("--min-years", type=float, default=2)
+        parser.add_argument("--max-years", type=float, default=5)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument(
+            "--skip-python",
+            type=int,
+            default=100_000,
+            help="Skip the Python implementation above this many candidates.",
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        min_years, max_years = options["min_years"], options["max_years"]
+
+        for size in sizes:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(f"Seeding {size} candidates...")
+            )
+            _seed_candidates(size, options["batch_size"], self.stdout)
+            total = Candidate.objects.count()
+
+            implementations = [("summary", _summary_filter)]
+            if total <= options["skip_python"]:
+                implementations.insert(0, ("python", _python_filter))
+            for label, implementation in implementations:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    count = implementation(min_years, max_years).count()
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{label:>7} {total:>8} candidates: {count} matches, "
+                    f"median {median(timings):10.2f} ms, min {min(timings):10.2f} ms"
+                )
@@ -0,0 +1,177 @@
+from statistics import median
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from JobApp.caching import invalidate_job_listings
+from JobApp.models import (
+    City,
+    Country,
+    Employer,
+    EmployerLocation,
+    Industry,
+    JobOffer,
+    User,
+)
+from JobApp.pagination import OptionalPagination
+from JobApp.search import refresh_search_documents
+from JobApp.views.job_views import JobOfferListView
+
+
+BENCH_PREFIX = "Bench Offer"
+BENCH_EMAIL = "bench-employer@example.com"
+
+
+def _bench_location():
+    country, _ = Country.objects.get_or_create(name="Bench Country")
+    city, _ = City.objects.get_or_create(
+        name="Bench City", province="Bench Province", country=country
+    )
+    industry, _ = Industry.objects.get_or_create(name="Bench Industry")
+    user = User.objects.filter(email=BENCH_EMAIL).first()
+    if user is None:
+        user = User.objects.create_user(
+            email=BENCH_EMAIL,
+            password=None,
+            phone_number="+300000000000",
+            city=city,
+        )
+    employer, _ = Employer.objects.get_or_create(
+        user=user,
+        defaults={
+            "company_name": "Bench Employer",
+            "website_url": "https://bench-employer.example.com",
+            "industry": industry,
+        },
+    )
+    location, _ = EmployerLocation.objects.get_or_create(employer=employer, city=city)
+    return employer, location
+
+
+def _seed_offers(target, batch_size, stdout):
+    existing = JobOffer.objects.count()
+    if existing >= target:
+        return existing
+    employer, location = _bench_location()
+    seniorities = JobOffer.Seniority.values
+    contracts = JobOffer.ContractType.values
+    remoteness = JobOffer.RemotenessLevel.values
+    for start in range(existing, target, batch_size):
+        stop = min(start + batch_size, target)
+        offers = JobOffer.objects.bulk_create(
+            [
+                JobOffer(
+                    employer=employer,
+                    location=location,
+                    description="Seeded pagination benchmark offer.",
+                    position=f"{BENCH_PREFIX} {i:07d}",
+                    seniority=seniorities[i % len(seniorities)],
+                    contract=contracts[i % len(contracts)],
+                    remoteness=remoteness[i % len(remoteness)],
+                    wage=4000 + i % 20000,
+                    currency="PLN",
+                )
+                for i in range(start, stop)
+            ]
+        )
+        # `bulk_create` sends no signals; without documents the offers
+        # would be missing from every filtered or searched listing.
+        refresh_search_documents(offer.pk for offer in offers)
+        stdout.write(f"  seeded {stop}/{target} offers")
+    return target
+
+
+def _remove_seeded(stdout):
+    """
+    Deletes the benchmark employer together with its seeded offers.
+    """
+    offers = JobOffer.objects.filter(employer__user__email=BENCH_EMAIL).count()
+    User.objects.filter(email=BENCH_EMAIL).delete()
+    stdout.write(f"  removed {offers} seeded offers")
+
+
+def _cursor_for_page(page, page_size):
+    if page <= 1:
+        return ""
+    offset = (page - 1) * page_size - 1
+    created_at, pk = JobOffer.objects.order_by("-created_at", "-id").values_list(
+        "created_at", "id"
+    )[offset]
+    return OptionalPagination.make_cursor([created_at.isoformat(), pk])
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare offset and keyset pagination latency of /api/jobs/ on the first "
+        "and a deep page, seeding job offers up to --offers first. Run with "
+        "--clean to remove the seeded offers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offers",
+            type=int,
+            default=1_000_000,
+            help="Number of job offers the table should hold (default: 1000000).",
+        )
+        parser.add_argument("--page", type=int, default=1000, help="Deep page number.")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--clean",
+            action="store_true",
+            help="Remove the seeded offers and their employer instead of benchmarking.",
+        )
+
+    def handle(self, *args, **options):
+        if options["clean"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("Removing seeded offers..."))
+            _remove_seeded(self.stdout)
+            return
+
+        page_size = options["page_size"]
+        deep_page = options["page"]
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Seeding job offers..."))
+        total = _seed_offers(options["offers"], options["batch_size"], self.stdout)
+
+        factory = APIRequestFactory()
+        view = JobOfferListView.as_view()
+        scenarios = []
+        for page in (1, deep_page):
+            scenarios.append(("offset", page, {"page": page, "page_size": page_size}))
+            scenarios.append(
+                (
+                    "cursor",
+                    page,
+                    {
+                        "cursor": _cursor_for_page(page, page_size),
+                        "page_size": page_size,
+                    },
+                )
+            )
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(f"Benchmarking /api/jobs/ with {total} offers")
+        )
+        for mode, page, params in scenarios:
+            timings = []
+            for _ in range(options["repeat"]):
+                # Measure the queries, not hits of the anonymous response cache.
+                invalidate_job_listings()
+                request = factory.get("/api/jobs/", params)
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    self.stderr.write(
+                        f"{mode} page {page}: HTTP {response.status_code}"
+                    )
+                    break
+            self.stdout.write(
+                f"{mode:>6} page {page:>6}: median {median(timings):8.2f} ms, "
+                f"min {min(timings):8.2f} ms"
+            )
@@ -0,0 +1,88 @@
+from statistics import median
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from JobApp.management.commands.benchmark_candidate_filters import _bench_city
+from JobApp.models import User
+from JobApp.views.user_views import MyTokenObtainPairView
+
+
+BENCH_EMAIL = "bench-hashing-{}@example.com"
+BENCH_PASSWORD = "bench-password-123"
+
+
+def _profile_hashers(profile):
+    """
+    Returns `PASSWORD_HASHERS` with the profile's hasher preferred.
+    """
+    preferred = settings.PASSWORD_HASHING_PROFILES[profile]
+    return [
+        preferred,
+        *(hasher for hasher in settings.PASSWORD_HASHERS if hasher != preferred),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure logins per second of a single worker under each password "
+        "hashing profile. Rows created by the benchmark are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            default=",".join(settings.PASSWORD_HASHING_PROFILES),
+            help="Comma separated profiles (default: all).",
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"].split(",")
+        unknown = set(profiles) - set(settings.PASSWORD_HASHING_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profiles: {', '.join(sorted(unknown))}")
+
+        with transaction.atomic():
+            city = _bench_city()
+            for profile in profiles:
+                with override_settings(PASSWORD_HASHERS=_profile_hashers(profile)):
+                    self.benchmark(profile, city, options["repeat"])
+            transaction.set_rollback(True)
+
+    def benchmark(self, profile, city, repeat):
+        try:
+            get_hasher().encode("probe", get_hasher().salt())
+        except ValueError as error:
+            self.stdout.write(f"{profile:>7}: skipped, {error}")
+            return
+
+        user = User.objects.create_user(
+            email=BENCH_EMAIL.format(profile),
+            phone_number=f"bench-hashing-{profile}",
+            password=BENCH_PASSWORD,
+            city=city,
+        )
+        login = MyTokenObtainPairView.as_view(throttle_classes=[])
+        factory = APIRequestFactory()
+        timings = []
+        for _ in range(repeat):
+            request = factory.post(
+                "/api/users/login/",
+                {"email": user.email, "password": BENCH_PASSWORD},
+                format="json",
+            )
+            started = time.process_time()
+            response = login(request)
+            timings.append((time.process_time() - started) * 1000)
+            assert response.status_code == 200, response.data
+        self.stdout.write(
+            f"{profile:>7}: median {median(timings):8.2f} ms CPU, "
+            f"min {min(timings):8.2f} ms CPU, "
+            f"{1000 / median(timings):8.1f} logins/s per worker"
+        )
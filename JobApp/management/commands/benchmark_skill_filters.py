@@ -0,0 +1,231 @@
+import random
+from statistics import median
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Exists, OuterRef
+
+from JobApp.filters import CandidateFilter, JobOfferFilter
+from JobApp.management.commands.benchmark_pagination import _bench_location
+from JobApp.models import (
+    Candidate,
+    CandidateSkill,
+    JobOffer,
+    JobOfferSearchDocument,
+    JobOfferSkill,
+    Skill,
+    User,
+)
+
+
+BENCH_SKILL = "Bench Skill {:02d}"
+BENCH_EMAIL = "bench-skill-candidate-{:07d}@example.com"
+BENCH_POSITION = "Bench Skill Offer {:07d}"
+
+
+def _bench_skills(count):
+    Skill.objects.bulk_create(
+        [Skill(name=BENCH_SKILL.format(i)) for i in range(count)],
+        ignore_conflicts=True,
+    )
+    names = [BENCH_SKILL.format(i) for i in range(count)]
+    skills = Skill.objects.in_bulk(names, field_name="name")
+    return [skills[name].pk for name in names]
+
+
+def _pick_skills(rng, skill_ids):
+    """
+    Picks a skill set where earlier skills are more popular, so queries
+    for the first few skills have non-empty results.
+    """
+    return [
+        skill_id
+        for index, skill_id in enumerate(skill_ids)
+        if rng.random() < 0.6 * 0.85**index
+    ]
+
+
+def _seed_candidates(target, skill_ids, batch_size, stdout):
+    existing = User.objects.filter(email__startswith="bench-skill-candidate-").count()
+    if existing >= target:
+        return
+    _, location = _bench_location()
+    password = make_password(None)
+    for start in range(existing, target, batch_size):
+        stop = min(start + batch_size, target)
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=BENCH_EMAIL.format(i),
+                    phone_number=f"+5{i:011d}",
+                    password=password,
+                    city_id=location.city_id,
+                )
+                for i in range(start, stop)
+            ]
+        )
+        candidates = Candidate.objects.bulk_create(
+            [Candidate(user=user) for user in users]
+        )
+        rng = random.Random(start)
+        CandidateSkill.objects.bulk_create(
+            [
+                CandidateSkill(candidate=candidate, skill_id=skill_id)
+                for candidate in candidates
+                for skill_id in _pick_skills(rng, skill_ids)
+            ]
+        )
+        stdout.write(f"  seeded {stop}/{target} candidates")
+
+
+def _seed_offers(target, skill_ids, batch_size, stdout):
+    existing = JobOffer.objects.filter(position__startswith="Bench Skill Offer").count()
+    if existing >= target:
+        return
+    employer, location = _bench_location()
+    for start in range(existing, target, batch_size):
+        stop = min(start + batch_size, target)
+        offers = JobOffer.objects.bulk_create(
+            [
+                JobOffer(
+                    employer=employer,
+                    location=location,
+                    description="Seeded skill filter benchmark offer.",
+                    position=BENCH_POSITION.format(i),
+                    seniority=JobOffer.Seniority.JUNIOR,
+                    contract=JobOffer.ContractType.B2B_CONTRACT,
+                    remoteness=JobOffer.RemotenessLevel.REMOTE,
+                    wage=5000,
+                    currency="PLN",
+                )
+                for i in range(start, stop)
+            ]
+        )
+        rng = random.Random(-start - 1)
+        offer_skills = {offer.pk: _pick_skills(rng, skill_ids) for offer in offers}
+        JobOfferSkill.objects.bulk_create(
+            [
+                JobOfferSkill(offer_id=offer_id, skill_id=skill_id)
+                for offer_id, skills in offer_skills.items()
+                for skill_id in skills
+            ]
+        )
+        JobOfferSearchDocument.objects.bulk_create(
+            [
+                JobOfferSearchDocument(
+                    offer=offer,
+                    document=offer.position.lower(),
+                    city_id=location.city_id,
+                    industry_id=employer.industry_id,
+                    skill_ids=sorted(offer_skills[offer.pk]),
+                    seniority=offer.seniority,
+                    contract=offer.contract,
+                    remoteness=offer.remoteness,
+                    wage=offer.wage,
+                    created_at=offer.created_at,
+                )
+                for offer in offers
+            ],
+            ignore_conflicts=True,
+        )
+        stdout.write(f"  seeded {stop}/{target} offers")
+
+
+def _exists_per_skill(model, link_model, parent, skill_ids):
+    """
+    One correlated EXISTS per required skill.
+    """
+    queryset = model.objects.all()
+    for skill_id in skill_ids:
+        queryset = queryset.filter(
+            Exists(
+                link_model.objects.filter(
+                    **{parent: OuterRef("pk"), "skill_id": skill_id}
+                )
+            )
+        )
+    return queryset
+
+
+def _grouped(model, link_model, parent, skill_ids):
+    """
+    One grouped `HAVING COUNT(DISTINCT skill_id) = n` subquery.
+    """
+    return model.objects.filter(
+        pk__in=link_model.objects.filter(skill_id__in=skill_ids)
+        .values(parent)
+        .annotate(matched=Count("skill_id", distinct=True))
+        .filter(matched=len(skill_ids))
+        .values(parent)
+    )
+
+
+def _names(skill_ids):
+    names = dict(Skill.objects.filter(pk__in=skill_ids).values_list("pk", "name"))
+    return ",".join(names[skill_id] for skill_id in skill_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark all-of skill filters for 1-10 required skills on candidates "
+        "and job offers, seeding --candidates and --offers rows first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--candidates", type=int, default=100_000)
+        parser.add_argument("--offers", type=int, default=100_000)
+        parser.add_argument("--skills", type=int, default=40)
+        parser.add_argument("--max-required", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        skill_ids = _bench_skills(options["skills"])
+        self.stdout.write(self.style.MIGRATE_HEADING("Seeding candidates..."))
+        _seed_candidates(
+            options["candidates"], skill_ids, options["batch_size"], self.stdout
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING("Seeding job offers..."))
+        _seed_offers(options["offers"], skill_ids, options["batch_size"], self.stdout)
+
+        scenarios = [
+            (
+                "candidates",
+                "exists",
+                lambda ids: _exists_per_skill(
+                    Candidate, CandidateSkill, "candidate", ids
+                ),
+            ),
+            (
+                "candidates",
+                "skill_all",
+                lambda ids: CandidateFilter(
+                    {"skill_all": _names(ids)}, queryset=Candidate.objects.all()
+                ).qs,
+            ),
+            (
+                "offers",
+                "having",
+                lambda ids: _grouped(JobOffer, JobOfferSkill, "offer", ids),
+            ),
+            (
+                "offers",
+                "skill_all",
+                lambda ids: JobOfferFilter(
+                    {"skill_all": _names(ids)}, queryset=JobOffer.objects.all()
+                ).qs,
+            ),
+        ]
+        for required in range(1, options["max_required"] + 1):
+            required_ids = skill_ids[:required]
+            for table, label, build in scenarios:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    count = build(required_ids).count()
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{required:>2} skills {table:>10} {label:>9}: {count:>7} matches, "
+                    f"median {median(timings):8.2f} ms, min {min(timings):8.2f} ms"
+                )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from JobApp.search import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search and filter documents of all job offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of offers rebuilt per batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding job offer search documents...")
+        processed = rebuild_search_documents(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search documents for {processed} offers.")
+        )
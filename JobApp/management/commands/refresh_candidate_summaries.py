@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from JobApp.summaries import (
+    rebuild_candidate_summaries,
+    roll_forward_candidate_summaries,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll the summaries of currently employed candidates forward to today. "
+        "Meant to run daily; use --all to rebuild every summary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild the summaries of all candidates.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of candidates refreshed per batch (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            self.stdout.write("Rebuilding candidate summaries...")
+            processed = rebuild_candidate_summaries(batch_size=options["batch_size"])
+        else:
+            self.stdout.write("Rolling candidate summaries forward...")
+            processed = roll_forward_candidate_summaries(
+                batch_size=options["batch_size"]
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed summaries of {processed} candidates.")
+        )
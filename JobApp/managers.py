@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import connections, models, router
 
 
 class CustomUserManager(BaseUserManager):
@@ -36,3 +37,44 @@ class CustomUserManager(BaseUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
 
         return self.create_user(email, password, **extra_fields)
+
+
+class OfferResponseManager(models.Manager):
+    """
+    Manager of job offer responses (applications).
+    """
+
+    def apply(self, offer_id: int, candidate_id: int) -> int | None:
+        """
+        Inserts the response of a candidate to a job offer with a single
+        `INSERT ... SELECT ... ON CONFLICT DO NOTHING` statement.
+
+        Returns the id of the new response, or None when the candidate has
+        already applied or the offer or candidate does not exist.
+        """
+        meta = self.model._meta
+        offer = meta.get_field("offer")
+        candidate = meta.get_field("candidate")
+        using = router.db_for_write(self.model)
+        quote = connections[using].ops.quote_name
+        sql = (
+            "INSERT INTO {table} ({offer_column}, {candidate_column}) "
+            "SELECT o.{offer_pk}, c.{candidate_pk} "
+            "FROM {offer_table} o, {candidate_table} c "
+            "WHERE o.{offer_pk} = %s AND c.{candidate_pk} = %s "
+            "ON CONFLICT ({offer_column}, {candidate_column}) DO NOTHING "
+            "RETURNING {pk}"
+        ).format(
+            table=quote(meta.db_table),
+            pk=quote(meta.pk.column),
+            offer_column=quote(offer.column),
+            candidate_column=quote(candidate.column),
+            offer_table=quote(offer.related_model._meta.db_table),
+            offer_pk=quote(offer.related_model._meta.pk.column),
+            candidate_table=quote(candidate.related_model._meta.db_table),
+            candidate_pk=quote(candidate.related_model._meta.pk.column),
+        )
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, [offer_id, candidate_id])
+            row = cursor.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,306 @@
+"""
+Candidate matching for job offers.
+
+`CandidateSkillIndex` is the candidate counterpart of
+`JobApp.recommendations.OfferSkillIndex`: every candidate owns a slot,
+every skill, city and country owns a bitmask of candidate slots, and the
+index keeps each candidate's work history so total experience can be
+computed without touching the database.
+
+A candidate's match score for an offer combines:
+
+- skill overlap: the share of the offer's skills the candidate has,
+- experience: total experience relative to the offer's seniority,
+- location: 1 for the offer's city, 0.5 for its country, 0 otherwise,
+
+weighted by `SKILL_WEIGHT`, `EXPERIENCE_WEIGHT` and `LOCATION_WEIGHT`.
+Candidates are visited by decreasing skill overlap using a bit-sliced
+counter, and the walk stops once no remaining candidate can beat the
+current top `limit`, so only candidates that can still make the list are
+scored individually. Candidates sharing an overlap and location only
+differ in experience; those known to have the experience the offer's
+seniority asks for share the group's best score and are ranked without
+computing their experience, and a group is left as soon as the top
+`limit` reach its best possible score.
+"""
+
+from datetime import date
+import heapq
+import threading
+import time
+
+from django.conf import settings
+
+from JobApp.models import (
+    Candidate,
+    CandidateExperience,
+    CandidateSkill,
+    JobOffer,
+    JobOfferSkill,
+)
+from JobApp.recommendations import count_bits, iter_bits_descending, slots_with_count
+from JobApp.summaries import experience_days
+
+
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+LOCATION_WEIGHT = 0.15
+
+SENIORITY_EXPERIENCE_YEARS = {
+    JobOffer.Seniority.INTERN: 0,
+    JobOffer.Seniority.JUNIOR: 1,
+    JobOffer.Seniority.Regular: 3,
+    JobOffer.Seniority.SENIOR: 5,
+    JobOffer.Seniority.LEAD: 8,
+}
+
+
+def experience_score(days, seniority):
+    """
+    Returns how well `days` of experience cover the seniority's target.
+    """
+    target = SENIORITY_EXPERIENCE_YEARS.get(seniority, 0)
+    if not target:
+        return 1.0
+    return min(days / 365.25 / target, 1.0)
+
+
+class CandidateSkillIndex:
+    """
+    In-memory bitset index of candidate skills and locations.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the index; it is rebuilt on next use.
+        """
+        with self._lock:
+            self._built_at = None
+            self._slots = {}
+            self._candidates = []
+            self._skills = {}
+            self._cities = {}
+            self._countries = {}
+            self._candidate_skills = {}
+            self._candidate_places = {}
+            self._experience = {}
+            self._experienced = {}
+            self._alive = 0
+
+    def _ensure_built(self):
+        ttl = getattr(settings, "RECOMMENDATION_INDEX_TTL", 300)
+        if self._built_at is None or time.monotonic() - self._built_at > ttl:
+            self.rebuild()
+
+    @staticmethod
+    def _load(candidates):
+        """
+        Returns `(places, skills, experience)` dictionaries of the given
+        candidate queryset.
+        """
+        places = {
+            candidate_id: (city_id, country_id)
+            for candidate_id, city_id, country_id in candidates.values_list(
+                "id", "user__city_id", "user__city__country_id"
+            )
+        }
+        skills = {}
+        for candidate_id, skill_id in CandidateSkill.objects.filter(
+            candidate_id__in=candidates.values("id")
+        ).values_list("candidate_id", "skill_id"):
+            skills.setdefault(candidate_id, set()).add(skill_id)
+        experience = {}
+        for candidate_id, date_from, date_to in CandidateExperience.objects.filter(
+            candidate_id__in=candidates.values("id")
+        ).values_list("candidate_id", "date_from", "date_to"):
+            experience.setdefault(candidate_id, []).append((date_from, date_to))
+        return places, skills, experience
+
+    def rebuild(self):
+        """
+        Rebuilds the index from the database.
+        """
+        places, skills, experience = self._load(Candidate.objects.order_by("id"))
+        with self._lock:
+            self.reset()
+            for candidate_id, place in places.items():
+                self._add(
+                    candidate_id,
+                    place,
+                    skills.get(candidate_id, ()),
+                    experience.get(candidate_id, ()),
+                )
+            self._built_at = time.monotonic()
+
+    def _add(self, candidate_id, place, skill_ids, intervals):
+        slot = len(self._candidates)
+        bit = 1 << slot
+        self._slots[candidate_id] = slot
+        self._candidates.append(candidate_id)
+        self._alive |= bit
+        city_id, country_id = place
+        self._candidate_places[candidate_id] = place
+        self._cities[city_id] = self._cities.get(city_id, 0) | bit
+        self._countries[country_id] = self._countries.get(country_id, 0) | bit
+        self._candidate_skills[candidate_id] = set(skill_ids)
+        for skill_id in skill_ids:
+            self._skills[skill_id] = self._skills.get(skill_id, 0) | bit
+        self._experience[candidate_id] = list(intervals)
+        # Experience only grows, so candidates stay in these masks until
+        # their history changes (which re-adds them).
+        days = experience_days(intervals)
+        for years in set(SENIORITY_EXPERIENCE_YEARS.values()):
+            if days >= years * 365.25:
+                self._experienced[years] = self._experienced.get(years, 0) | bit
+
+    def _remove(self, candidate_id):
+        slot = self._slots.pop(candidate_id, None)
+        if slot is None:
+            return
+        clear = ~(1 << slot)
+        self._alive &= clear
+        city_id, country_id = self._candidate_places.pop(candidate_id)
+        self._cities[city_id] &= clear
+        self._countries[country_id] &= clear
+        for skill_id in self._candidate_skills.pop(candidate_id):
+            self._skills[skill_id] &= clear
+        del self._experience[candidate_id]
+        for years in self._experienced:
+            self._experienced[years] &= clear
+
+    def refresh_candidates(self, candidate_ids):
+        """
+        Re-reads the given candidates from the database.
+        """
+        candidate_ids = set(candidate_ids)
+        if not candidate_ids:
+            return
+        with self._lock:
+            if self._built_at is None:
+                return
+            places, skills, experience = self._load(
+                Candidate.objects.filter(pk__in=candidate_ids)
+            )
+            for candidate_id in sorted(candidate_ids):
+                self._remove(candidate_id)
+                if candidate_id in places:
+                    self._add(
+                        candidate_id,
+                        places[candidate_id],
+                        skills.get(candidate_id, ()),
+                        experience.get(candidate_id, ()),
+                    )
+
+    def remove_candidates(self, candidate_ids):
+        """
+        Drops the given candidates from the index.
+        """
+        with self._lock:
+            for candidate_id in candidate_ids:
+                self._remove(candidate_id)
+
+    def top(self, skill_ids, seniority, city_id, country_id, limit=20):
+        """
+        Returns up to `limit` `(candidate_id, scores)` pairs ranked by
+        match score, where `scores` maps `score`, `skill_score`,
+        `experience_score` and `location_score` to their values.
+        Candidates without any shared skill are only listed for offers
+        that require no skills.
+        """
+        with self._lock:
+            self._ensure_built()
+            skill_ids = set(skill_ids)
+            masks = [
+                self._skills[skill] for skill in skill_ids if skill in self._skills
+            ]
+            universe = self._alive
+            city_mask = self._cities.get(city_id, 0)
+            country_mask = self._countries.get(country_id, 0)
+            planes = count_bits(masks, universe)
+            today = date.today()
+            years = SENIORITY_EXPERIENCE_YEARS.get(seniority, 0)
+            experienced = self._experienced.get(years, 0) if years else universe
+
+            heap = []
+            lowest_overlap = 0 if not skill_ids else 1
+            for overlap in range(len(masks), lowest_overlap - 1, -1):
+                skill_score = overlap / len(skill_ids) if skill_ids else 1.0
+                best_possible = (
+                    SKILL_WEIGHT * skill_score + EXPERIENCE_WEIGHT + LOCATION_WEIGHT
+                )
+                if len(heap) >= limit and heap[0][0] >= best_possible:
+                    break
+                matching = slots_with_count(planes, overlap, universe)
+                for mask, location_score in (
+                    (matching & city_mask, 1.0),
+                    (matching & ~city_mask & country_mask, 0.5),
+                    (matching & ~city_mask & ~country_mask, 0.0),
+                ):
+                    group_best = (
+                        SKILL_WEIGHT * skill_score
+                        + EXPERIENCE_WEIGHT
+                        + LOCATION_WEIGHT * location_score
+                    )
+                    if len(heap) >= limit and heap[0][0] >= group_best:
+                        continue
+                    # Experienced candidates score `group_best`, so they
+                    # are ranked before the others, which score lower.
+                    for slots, known in (
+                        (iter_bits_descending(mask & experienced), True),
+                        (iter_bits_descending(mask & ~experienced), False),
+                    ):
+                        for slot in slots:
+                            if len(heap) >= limit and heap[0][0] >= group_best:
+                                break
+                            candidate_id = self._candidates[slot]
+                            if known:
+                                experience = 1.0
+                            else:
+                                experience = experience_score(
+                                    experience_days(
+                                        self._experience[candidate_id], today
+                                    ),
+                                    seniority,
+                                )
+                            scores = {
+                                "skill_score": skill_score,
+                                "experience_score": experience,
+                                "location_score": location_score,
+                            }
+                            scores["score"] = (
+                                SKILL_WEIGHT * scores["skill_score"]
+                                + EXPERIENCE_WEIGHT * scores["experience_score"]
+                                + LOCATION_WEIGHT * scores["location_score"]
+                            )
+                            entry = (scores["score"], -candidate_id, scores)
+                            if len(heap) < limit:
+                                heapq.heappush(heap, entry)
+                            elif entry[:2] > heap[0][:2]:
+                                heapq.heapreplace(heap, entry)
+
+            ranked = sorted(heap, key=lambda entry: entry[:2], reverse=True)
+            return [(-candidate_id, scores) for _, candidate_id, scores in ranked]
+
+
+candidate_index = CandidateSkillIndex()
+
+
+def match_candidates(offer, limit=20):
+    """
+    Returns the `(candidate_id, scores)` pairs best matching a job offer.
+    """
+    skill_ids = JobOfferSkill.objects.filter(offer=offer).values_list(
+        "skill_id", flat=True
+    )
+    city = offer.location.city
+    return candidate_index.top(
+        skill_ids,
+        offer.seniority,
+        city_id=city.id,
+        country_id=city.country_id,
+        limit=limit,
+    )
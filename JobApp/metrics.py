@@ -0,0 +1,34 @@
+"""
+Process-local counters exposed by the `metrics` endpoint.
+"""
+
+from collections import Counter
+import threading
+
+
+_counters = Counter()
+_lock = threading.Lock()
+
+
+def increment(name, amount=1):
+    """
+    Increments the counter `name` by `amount`.
+    """
+    with _lock:
+        _counters[name] += amount
+
+
+def snapshot():
+    """
+    Returns a copy of all counters.
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset():
+    """
+    Resets all counters.
+    """
+    with _lock:
+        _counters.clear()
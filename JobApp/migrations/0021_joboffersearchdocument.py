@@ -0,0 +1,83 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:03
+
+from django.conf import settings
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_SQL = """
+INSERT INTO "JobApp_joboffersearchdocument" (offer_id, document, search_vector)
+SELECT
+    o.id,
+    lower(concat_ws(' ', o.position, s.skills, e.company_name, i.name, c.name, o.description)),
+    setweight(to_tsvector(%(config)s::regconfig, coalesce(o.position, '')), 'A')
+    || setweight(to_tsvector(%(config)s::regconfig, coalesce(s.skills, '')), 'B')
+    || setweight(to_tsvector(%(config)s::regconfig, concat_ws(' ', e.company_name, i.name, c.name)), 'C')
+    || setweight(to_tsvector(%(config)s::regconfig, coalesce(o.description, '')), 'D')
+FROM "JobApp_joboffer" o
+JOIN "JobApp_employer" e ON e.id = o.employer_id
+JOIN "JobApp_industry" i ON i.id = e.industry_id
+JOIN "JobApp_employerlocation" l ON l.id = o.location_id
+JOIN "JobApp_city" c ON c.id = l.city_id
+LEFT JOIN (
+    SELECT js.offer_id, string_agg(sk.name, ' ') AS skills
+    FROM "JobApp_jobofferskill" js
+    JOIN "JobApp_skill" sk ON sk.id = js.skill_id
+    GROUP BY js.offer_id
+) s ON s.offer_id = o.id
+"""
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Adds the GIN index and backfills documents on PostgreSQL. Other
+    databases rely on `manage.py rebuild_search_index`.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        'CREATE INDEX "joboffer_search_vector_gin" '
+        'ON "JobApp_joboffersearchdocument" USING gin ("search_vector")'
+    )
+    schema_editor.execute(
+        BACKFILL_SQL,
+        params={"config": getattr(settings, "JOB_SEARCH_CONFIG", "simple")},
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "joboffer_search_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0020_alter_joboffer_seniority"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobOfferSearchDocument",
+            fields=[
+                (
+                    "offer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="JobApp.joboffer",
+                    ),
+                ),
+                ("document", models.TextField(blank=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0021_joboffersearchdocument"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="joboffer",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="joboffer_created_at_id_idx"
+            ),
+        ),
+    ]
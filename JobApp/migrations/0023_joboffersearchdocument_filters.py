@@ -0,0 +1,154 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import JobApp.fields
+
+
+BACKFILL_SQL = """
+UPDATE "JobApp_joboffersearchdocument" AS d
+SET
+    city_id = c.id,
+    country_id = c.country_id,
+    industry_id = e.industry_id,
+    wage = o.wage,
+    seniority = o.seniority,
+    contract = o.contract,
+    remoteness = o.remoteness,
+    created_at = o.created_at,
+    skill_ids = COALESCE(
+        (
+            SELECT jsonb_agg(DISTINCT js.skill_id ORDER BY js.skill_id)
+            FROM "JobApp_jobofferskill" js
+            WHERE js.offer_id = o.id
+        ),
+        '[]'::jsonb
+    ),
+    benefit_ids = COALESCE(
+        (
+            SELECT jsonb_agg(DISTINCT eb.benefit_id ORDER BY eb.benefit_id)
+            FROM "JobApp_employerbenefit" eb
+            WHERE eb.employer_id = o.employer_id
+        ),
+        '[]'::jsonb
+    )
+FROM "JobApp_joboffer" o
+JOIN "JobApp_employer" e ON e.id = o.employer_id
+JOIN "JobApp_employerlocation" l ON l.id = o.location_id
+JOIN "JobApp_city" c ON c.id = l.city_id
+WHERE d.offer_id = o.id
+"""
+
+
+def create_id_list_indexes(apps, schema_editor):
+    """
+    Adds GIN indexes for the id arrays and backfills the filter columns
+    on PostgreSQL. Other databases rely on `manage.py rebuild_search_index`.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in ("skill_ids", "benefit_ids"):
+        schema_editor.execute(
+            f'CREATE INDEX "jobsearch_{column}_gin" '
+            f'ON "JobApp_joboffersearchdocument" USING gin ("{column}" jsonb_path_ops)'
+        )
+    schema_editor.execute(BACKFILL_SQL)
+
+
+def drop_id_list_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for column in ("skill_ids", "benefit_ids"):
+        schema_editor.execute(f'DROP INDEX IF EXISTS "jobsearch_{column}_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0022_joboffer_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="benefit_ids",
+            field=JobApp.fields.IdListField(default=list),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="city",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="JobApp.city",
+            ),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="contract",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="country",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="JobApp.country",
+            ),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="created_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="industry",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="JobApp.industry",
+            ),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="remoteness",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="seniority",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="skill_ids",
+            field=JobApp.fields.IdListField(default=list),
+        ),
+        migrations.AddField(
+            model_name="joboffersearchdocument",
+            name="wage",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="joboffersearchdocument",
+            index=models.Index(
+                fields=["seniority", "contract", "remoteness"],
+                name="jobsearch_choices_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="joboffersearchdocument",
+            index=models.Index(fields=["wage"], name="jobsearch_wage_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="joboffersearchdocument",
+            index=models.Index(fields=["-created_at"], name="jobsearch_created_at_idx"),
+        ),
+        migrations.RunPython(create_id_list_indexes, drop_id_list_indexes),
+    ]
@@ -0,0 +1,150 @@
+# Generated by Django 5.1.15 on 2026-10-18 04:45
+
+from datetime import date
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import JobApp.fields
+
+
+# A frozen copy of `JobApp.summaries` as of this migration, so later
+# changes to the live module do not change what the backfill computes.
+DEGREE_LEVELS = (
+    (4, {"phd", "dphil", "doctor", "doctorate", "doctoral", "md"}),
+    (3, {"master", "masters", "msc", "ma", "mba", "meng", "mphil", "mres", "llm"}),
+    (2, {"bachelor", "bachelors", "bsc", "ba", "beng", "bs", "llb", "engineer"}),
+    (1, {"associate", "diploma", "certificate"}),
+)
+
+
+def experience_days(intervals, today):
+    total = 0
+    start = end = None
+    for date_from, date_to in sorted(
+        (date_from, date_to or today) for date_from, date_to in intervals
+    ):
+        if end is not None and date_from <= end:
+            end = max(end, date_to)
+            continue
+        if end is not None:
+            total += max((end - start).days, 0)
+        start, end = date_from, date_to
+    if end is not None:
+        total += max((end - start).days, 0)
+    return total
+
+
+def degree_level(degree):
+    words = set(re.findall(r"[a-z]+", degree.lower().replace(".", "")))
+    for level, names in DEGREE_LEVELS:
+        if words & names:
+            return level
+    return 0
+
+
+def summarize(experiences, educations, skill_ids, today):
+    latest = max(
+        experiences,
+        key=lambda row: (row[3] or row[2] is None, row[2] or today, row[1], row[0]),
+        default=None,
+    )
+    highest = max(
+        educations,
+        key=lambda row: (degree_level(row[1]), not row[4], row[3] or today, row[0]),
+        default=None,
+    )
+    return {
+        "experience_days": experience_days(
+            [(row[1], row[2]) for row in experiences], today
+        ),
+        "computed_on": today,
+        "skill_ids": sorted(set(skill_ids)),
+        "latest_position": latest[4] if latest else "",
+        "is_currently_employed": any(row[3] or row[2] is None for row in experiences),
+        "highest_degree": highest[1] if highest else "",
+    }
+
+
+def backfill_summaries(apps, schema_editor):
+    """
+    Computes the summaries of existing candidates.
+    """
+    Candidate = apps.get_model("JobApp", "Candidate")
+    CandidateSummary = apps.get_model("JobApp", "CandidateSummary")
+    today = date.today()
+    summaries = []
+    for candidate in Candidate.objects.prefetch_related(
+        "candidateexperience_set", "candidateeducation_set", "candidateskill_set"
+    ).iterator(chunk_size=500):
+        summaries.append(
+            CandidateSummary(
+                candidate_id=candidate.pk,
+                **summarize(
+                    [
+                        (
+                            row.id,
+                            row.date_from,
+                            row.date_to,
+                            row.is_current,
+                            row.job_position,
+                        )
+                        for row in candidate.candidateexperience_set.all()
+                    ],
+                    [
+                        (row.id, row.degree, row.date_from, row.date_to, row.is_current)
+                        for row in candidate.candidateeducation_set.all()
+                    ],
+                    [row.skill_id for row in candidate.candidateskill_set.all()],
+                    today,
+                ),
+            )
+        )
+        if len(summaries) >= 500:
+            CandidateSummary.objects.bulk_create(summaries)
+            summaries = []
+    CandidateSummary.objects.bulk_create(summaries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0024_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CandidateSummary",
+            fields=[
+                (
+                    "candidate",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="JobApp.candidate",
+                    ),
+                ),
+                ("experience_days", models.IntegerField(default=0)),
+                ("computed_on", models.DateField()),
+                ("skill_ids", JobApp.fields.IdListField(default=list)),
+                ("latest_position", models.CharField(blank=True, max_length=255)),
+                ("is_currently_employed", models.BooleanField(default=False)),
+                ("highest_degree", models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["experience_days"], name="candsummary_experience_idx"
+                    ),
+                    models.Index(
+                        fields=["is_currently_employed", "computed_on"],
+                        name="candsummary_current_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0025_candidatesummary"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="candidateskill",
+            index=models.Index(
+                fields=["skill", "candidate"], name="candidateskill_skill_cand_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobofferskill",
+            index=models.Index(
+                fields=["skill", "offer"], name="jobofferskill_skill_offer_idx"
+            ),
+        ),
+    ]
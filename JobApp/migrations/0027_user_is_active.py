@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("JobApp", "0026_skill_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+    ]
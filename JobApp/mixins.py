@@ -1,9 +1,409 @@
-from datetime import date
+from functools import lru_cache
+import hashlib
 
-from django.db.models import DurationField, ExpressionWrapper, F, Sum
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max, Prefetch, prefetch_related_objects
 from django.db.models.functions import Coalesce
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.mixins import RetrieveModelMixin
 
-from JobApp.models import Candidate
+from JobApp import metrics
+from JobApp.authentication import resolve_actor
+from JobApp.models import (
+    Candidate,
+    CandidateEducation,
+    CandidateExperience,
+    CandidateSkill,
+)
+
+
+def _get_relation(model, name):
+    """
+    Returns the relation called `name` on `model`, resolving reverse
+    accessors (e.g. `jobofferskill_set`) as well as forward fields.
+    Returns None when `name` is not a relation.
+    """
+    for relation in model._meta.related_objects:
+        if relation.get_accessor_name() == name:
+            return relation
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def _prefix_prefetch(prefix, lookup):
+    """
+    Prepends `prefix` to a prefetch lookup, keeping custom querysets intact.
+    """
+    if isinstance(lookup, Prefetch):
+        return Prefetch(
+            f"{prefix}__{lookup.prefetch_through}", queryset=lookup.queryset
+        )
+    return f"{prefix}__{lookup}"
+
+
+def _build_loading_plan(serializer, model):
+    """
+    Walks the fields of `serializer` and returns a `(select_related,
+    prefetch_related)` tuple of lookups covering every nested relation
+    that will be read while serializing instances of `model`.
+    """
+    select_related = []
+    prefetch_related = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        path = []
+        current_model = model
+        relation = None
+        for attr in field.source_attrs:
+            relation = _get_relation(current_model, attr)
+            if relation is None:
+                break
+            path.append(attr)
+            current_model = relation.related_model
+        if relation is None or not path:
+            continue
+
+        lookup = "__".join(path)
+        is_many = relation.one_to_many or relation.many_to_many
+
+        if isinstance(field, serializers.ListSerializer):
+            child_select, child_prefetch = _build_loading_plan(
+                field.child, current_model
+            )
+            prefetch_related.append(
+                Prefetch(
+                    lookup,
+                    queryset=current_model._default_manager.select_related(
+                        *child_select
+                    ).prefetch_related(*child_prefetch),
+                )
+            )
+        elif isinstance(field, serializers.BaseSerializer):
+            child_select, child_prefetch = _build_loading_plan(field, current_model)
+            if is_many:
+                prefetch_related.append(lookup)
+                continue
+            select_related.append(lookup)
+            select_related.extend(f"{lookup}__{item}" for item in child_select)
+            prefetch_related.extend(
+                _prefix_prefetch(lookup, item) for item in child_prefetch
+            )
+        elif isinstance(field, serializers.ManyRelatedField) or is_many:
+            prefetch_related.append(lookup)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField) and len(path) == 1:
+            # Primary keys are read from the local `<field>_id` column.
+            continue
+        else:
+            select_related.append(lookup)
+
+    return select_related, prefetch_related
+
+
+@lru_cache(maxsize=None)
+def get_loading_plan(serializer_class):
+    """
+    Returns the cached eager loading plan for a model serializer class.
+    """
+    model = serializer_class.Meta.model
+    select_related, prefetch_related = _build_loading_plan(serializer_class(), model)
+    return tuple(select_related), tuple(prefetch_related)
+
+
+class EagerLoadingMixin:
+    """
+    A mixin for read views that eager loads every relation rendered by
+    the view's serializer, so the number of queries does not depend on
+    the number of serialized objects.
+    """
+
+    def filter_queryset(self, queryset):
+        """
+        Returns the filtered queryset with `select_related` and
+        `prefetch_related` applied according to the serializer tree.
+        """
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return queryset
+        select_related, prefetch_related = get_loading_plan(serializer_class)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def eager_load(self, instance):
+        """
+        Loads the relations rendered by the serializer onto an instance
+        fetched elsewhere (e.g. the user's own profile), skipping those
+        that are already cached on it.
+        """
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return instance
+        select_related, prefetch_related = get_loading_plan(serializer_class)
+        prefetch_related_objects([instance], *select_related, *prefetch_related)
+        return instance
+
+
+def _has_updated_at(model):
+    try:
+        model._meta.get_field("updated_at")
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _build_version_plan(serializer, model, prefix="", many=False):
+    """
+    Walks the nested serializers of `serializer` and returns `(lookup,
+    many)` pairs of the `updated_at` columns of the objects nested in
+    instances of `model`, where `many` marks the lookups that go through
+    a multi-valued relation.
+    """
+    lookups = []
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+        if not isinstance(field, serializers.BaseSerializer):
+            continue
+
+        path = []
+        current_model = model
+        relation = None
+        is_many = many or isinstance(field, serializers.ListSerializer)
+        for attr in field.source_attrs:
+            relation = _get_relation(current_model, attr)
+            if relation is None:
+                break
+            path.append(relation.name)
+            is_many = is_many or relation.one_to_many or relation.many_to_many
+            current_model = relation.related_model
+        if relation is None or not path:
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        lookup = prefix + "__".join(path)
+        if _has_updated_at(current_model):
+            lookups.append((f"{lookup}__updated_at", is_many))
+        lookups.extend(
+            _build_version_plan(
+                field, current_model, prefix=f"{lookup}__", many=is_many
+            )
+        )
+
+    return lookups
+
+
+@lru_cache(maxsize=None)
+def get_version_plan(serializer_class):
+    """
+    Returns the cached `(lookups, many_lookups)` version plan of a model
+    serializer class, see `ConditionalGetMixin`.
+    """
+    model = serializer_class.Meta.model
+    paths = _build_version_plan(serializer_class(), model)
+    lookups = ["updated_at", *(lookup for lookup, many in paths if not many)]
+    many_lookups = [lookup for lookup, many in paths if many]
+    return tuple(dict.fromkeys(lookups)), tuple(dict.fromkeys(many_lookups))
+
+
+class ConditionalGetMixin:
+    """
+    A mixin for read views of models tracking `updated_at` that answers
+    conditional GET requests without serializing the response body.
+
+    The version of a response covers only the objects it returns: the
+    requested object of detail views, or the current page of paginated
+    lists. Lists are paginated first (the page is reused to render the
+    response), so the cost of versioning does not grow with the size of
+    the list. The version is the newest `updated_at` of those objects and
+    of every object nested in them, one aggregate query per multi-valued
+    relation (e.g. the skills of a job offer), plus their primary keys,
+    the number of objects and the pagination links (to notice deletions
+    and insertions). It is sent as a weak `ETag` and as `Last-Modified`;
+    matching `If-None-Match` or `If-Modified-Since` headers are answered
+    with `304 Not Modified`.
+
+    `cache_control` holds the `Cache-Control` directives of the view.
+    """
+
+    cache_control = {"no_cache": True}
+    _version_page = None
+
+    def get_version_queryset(self):
+        """
+        Returns the queryset whose objects make up the response.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if isinstance(self, RetrieveModelMixin):
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return queryset
+        self._version_page = page
+        return queryset.model._default_manager.filter(pk__in=[obj.pk for obj in page])
+
+    def paginate_queryset(self, queryset):
+        if self._version_page is not None:
+            return self._version_page
+        return super().paginate_queryset(queryset)
+
+    def get_page_state(self):
+        """
+        Returns the parts of the current page's response that do not come
+        from its objects: the pagination links and the total count.
+        """
+        paginator = self.paginator
+        state = [paginator.get_next_link(), paginator.get_previous_link()]
+        page = getattr(paginator, "page", None)
+        if page is not None:
+            state.append(page.paginator.count)
+        return [str(part) for part in state]
+
+    def get_version(self):
+        """
+        Returns the `(etag, last_modified)` pair of the response, or None
+        when the response cannot be versioned.
+        """
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.ModelSerializer):
+            return None
+        model = serializer_class.Meta.model
+        if not _has_updated_at(model):
+            return None
+
+        lookups, many_lookups = get_version_plan(serializer_class)
+        matching = model._default_manager.filter(
+            pk__in=self.get_version_queryset().order_by().values("pk")
+        )
+        version = matching.aggregate(
+            count=Count("pk", distinct=True),
+            **{f"v{index}": Max(lookup) for index, lookup in enumerate(lookups)},
+        )
+        if not version["count"]:
+            # Let the view answer empty lists and missing objects itself.
+            return None
+
+        timestamps = [version[f"v{index}"] for index in range(len(lookups))]
+        timestamps.extend(
+            matching.aggregate(value=Max(lookup))["value"] for lookup in many_lookups
+        )
+        timestamps = [value for value in timestamps if value is not None]
+        payload = [str(version["count"]), *(value.isoformat() for value in timestamps)]
+        if self._version_page is not None:
+            payload.extend(str(obj.pk) for obj in self._version_page)
+            payload.extend(self.get_page_state())
+        etag = 'W/"%s"' % hashlib.md5("|".join(payload).encode()).hexdigest()
+        return etag, int(max(timestamps).timestamp())
+
+    def get(self, request, *args, **kwargs):
+        version = self.get_version()
+        if version is None:
+            response = super().get(request, *args, **kwargs)
+        else:
+            etag, last_modified = version
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = super().get(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response["ETag"] = etag
+                response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, **self.cache_control)
+        return response
+
+
+class AttemptMetricsMixin:
+    """
+    A mixin for throttled views counting their attempts in `JobApp.metrics`
+    as `<attempt_metric>.throttled` or `<attempt_metric>.processed`.
+    """
+
+    attempt_metric = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        metrics.increment(f"{self.attempt_metric}.processed")
+
+    def throttled(self, request, wait):
+        metrics.increment(f"{self.attempt_metric}.throttled")
+        super().throttled(request, wait)
+
+
+class LimitMixin:
+    """
+    A mixin for ranked list views returning the top `limit` results, read
+    from the `limit` query parameter and clamped to `max_limit`.
+    """
+
+    default_limit = 20
+    max_limit = 100
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+
+class ProfileOwnerMixin:
+    """
+    A mixin for views of the authenticated user's own employer or candidate
+    profile, exposed as `request.employer` and `request.candidate` and
+    resolved once per request by `resolve_actor`. The user is loaded, so
+    tokens of deleted users are rejected.
+    """
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        resolve_actor(request, load_user=True)
+
+    def get_employer(self):
+        """
+        Returns the authenticated user's employer, raising 404 when the
+        user is not an employer.
+        """
+        if self.request.employer is None:
+            raise Http404("No Employer matches the given query.")
+        return self.request.employer
+
+    def get_candidate(self):
+        """
+        Returns the authenticated user's candidate, raising 404 when the
+        user is not a candidate.
+        """
+        if self.request.candidate is None:
+            raise Http404("No Candidate matches the given query.")
+        return self.request.candidate
+
+    def get_employer_id(self):
+        """
+        Returns the authenticated user's employer id, raising 404 when the
+        user is not an employer.
+        """
+        return self.get_employer().pk
+
+    def get_candidate_id(self):
+        """
+        Returns the authenticated user's candidate id, raising 404 when the
+        user is not a candidate.
+        """
+        return self.get_candidate().pk
 
 
 class CandidateWithExperienceMixin:
@@ -15,17 +415,47 @@ class CandidateWithExperienceMixin:
     def get_queryset(self):
         """
         Returns a queryset of `Candidate` objects, each annotated with the
-        `total_experience_days` field.
+        `total_experience_days` field read from its `CandidateSummary`.
         """
-        today = date.today()
         return Candidate.objects.annotate(
-            total_experience_days=Sum(
-                ExpressionWrapper(
-                    (
-                        Coalesce("candidateexperience__date_to", today)
-                        - F("candidateexperience__date_from")
+            total_experience_days=Coalesce("summary__experience_days", 0)
+        )
+
+
+class CandidateDossierMixin(CandidateWithExperienceMixin):
+    """
+    A mixin for views rendering candidate dossiers: candidates annotated
+    with their total experience, with their user, skills, experience and
+    education loaded up front.
+    """
+
+    def get_queryset(self):
+        """
+        Returns the annotated candidates with every dossier relation
+        eager loaded; experience and education are newest first.
+        """
+        return (
+            super()
+            .get_queryset()
+            .select_related("user")
+            .prefetch_related(
+                Prefetch(
+                    "candidateskill_set",
+                    queryset=CandidateSkill.objects.select_related("skill").order_by(
+                        "id"
                     ),
-                    output_field=DurationField(),
-                )
+                ),
+                Prefetch(
+                    "candidateexperience_set",
+                    queryset=CandidateExperience.objects.order_by(
+                        "-is_current", "-date_to"
+                    ),
+                ),
+                Prefetch(
+                    "candidateeducation_set",
+                    queryset=CandidateEducation.objects.order_by(
+                        "-is_current", "-date_to"
+                    ),
+                ),
             )
         )
@@ -2,21 +2,27 @@ import os
 import uuid
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import FileExtensionValidator, MinValueValidator
 from django.db import models
 from django.utils import timezone
 from phone_field import PhoneField
 
-from .managers import CustomUserManager
+from .fields import IdListField
+from .managers import CustomUserManager, OfferResponseManager
 
 
 class Country(models.Model):
     """
     :ivar name: The country associated with the candidate.
     :type name: CharField
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: DateTimeField
     """
 
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -32,12 +38,15 @@ class City(models.Model):
     :type zip_code: CharField
     :ivar country : Country associated with a city.
     :type country: Country
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: DateTimeField
     """
 
     name = models.CharField(max_length=255)
     province = models.CharField(max_length=255)
     zip_code = models.CharField(max_length=255, blank=True)
     country = models.ForeignKey(Country, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -61,6 +70,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     :type phone_number: PhoneField
     :ivar city: The city where the user is located.
     :type city: ForeignKey
+    :ivar is_active: Whether the user may log in and use issued tokens.
+    :type is_active: bool
     """
 
     first_name = models.CharField(max_length=255, blank=True)
@@ -69,6 +80,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     phone_number = PhoneField(max_length=255, unique=True)
     city = models.ForeignKey(City, on_delete=models.CASCADE, null=True)
     is_staff = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -80,6 +92,26 @@ class User(AbstractBaseUser, PermissionsMixin):
             return self.first_name + " " + self.last_name
         return self.email
 
+    @property
+    def employer_id(self):
+        """
+        The id of the user's employer profile, or None.
+        """
+        try:
+            return self.employer.pk
+        except ObjectDoesNotExist:
+            return None
+
+    @property
+    def candidate_id(self):
+        """
+        The id of the user's candidate profile, or None.
+        """
+        try:
+            return self.candidate.pk
+        except ObjectDoesNotExist:
+            return None
+
 
 class Candidate(models.Model):
     """
@@ -94,6 +126,8 @@ class Candidate(models.Model):
     :type resume: File
     :ivar about: Optional text field for additional information about the candidate.
     :type about: str or None
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: datetime
     """
 
     def resume_upload_path(instance, filename):
@@ -113,6 +147,7 @@ class Candidate(models.Model):
         validators=[FileExtensionValidator(allowed_extensions=["pdf", "doc", "docx"])],
     )
     about = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.user.first_name + " " + self.user.last_name
@@ -124,9 +159,12 @@ class Industry(models.Model):
 
     :ivar name: The unique name of the industry.
     :type name: CharField
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: DateTimeField
     """
 
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -150,6 +188,8 @@ class Employer(models.Model):
     :type description: models.TextField
     :ivar industry: The industry to which the employer belongs.
     :type industry: models.ForeignKey
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: models.DateTimeField
     """
 
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -157,6 +197,7 @@ class Employer(models.Model):
     website_url = models.URLField(max_length=255, unique=True, blank=True)
     description = models.TextField(blank=True, null=True)
     industry = models.ForeignKey(Industry, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.company_name + " - " + self.industry.name
@@ -168,9 +209,12 @@ class Benefit(models.Model):
 
     :ivar name: The unique name of the benefit.
     :type name: str
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: datetime
     """
 
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -201,9 +245,12 @@ class Skill(models.Model):
 
     :ivar name: The unique name of the skill.
     :type name: models.CharField
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: models.DateTimeField
     """
 
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -226,6 +273,11 @@ class CandidateSkill(models.Model):
 
     class Meta:
         unique_together = ("candidate", "skill")
+        indexes = [
+            models.Index(
+                fields=["skill", "candidate"], name="candidateskill_skill_cand_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.candidate.user.first_name} {self.candidate.user.last_name} - {self.skill.name}"
@@ -341,6 +393,8 @@ class JobOffer(models.Model):
     :type currency: CharField
     :ivar created_at: The date and time when the job offer was created.
     :type created_at: DateTimeField
+    :ivar updated_at: The date and time of the last change.
+    :type updated_at: DateTimeField
     """
 
     class Seniority(models.TextChoices):
@@ -396,6 +450,14 @@ class JobOffer(models.Model):
     wage = models.IntegerField(blank=True, null=True, validators=[MinValueValidator(0)])
     currency = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="joboffer_created_at_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.employer.company_name + " - " + self.position
@@ -416,10 +478,94 @@ class JobOfferSkill(models.Model):
     offer = models.ForeignKey(JobOffer, on_delete=models.CASCADE)
     skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["skill", "offer"], name="jobofferskill_skill_offer_idx"
+            )
+        ]
+
     def __str__(self):
         return f"{self.offer.employer.company_name} - {self.skill.name}"
 
 
+class JobOfferSearchDocument(models.Model):
+    """
+    Represents the denormalized search and filter row of a job offer.
+
+    The row is rebuilt whenever the offer, its skills or its employer
+    (including the employer's benefits) change, so searching and filtering
+    the job board never has to join the related tables.
+
+    :ivar offer: The job offer the document belongs to.
+    :type offer: OneToOneField
+    :ivar document: Lowercased searchable text (position, skills, company,
+        industry, city and description), used by non-PostgreSQL databases.
+    :type document: TextField
+    :ivar search_vector: Weighted `tsvector` of the same text, indexed with
+        GIN on PostgreSQL.
+    :type search_vector: SearchVectorField
+    :ivar city: The city of the offer's location.
+    :type city: ForeignKey
+    :ivar country: The country of the offer's location.
+    :type country: ForeignKey
+    :ivar industry: The industry of the offer's employer.
+    :type industry: ForeignKey
+    :ivar skill_ids: Ids of the skills required by the offer.
+    :type skill_ids: IdListField
+    :ivar benefit_ids: Ids of the benefits offered by the offer's employer.
+    :type benefit_ids: IdListField
+    :ivar wage: Copy of `JobOffer.wage`.
+    :type wage: IntegerField
+    :ivar seniority: Copy of `JobOffer.seniority`.
+    :type seniority: CharField
+    :ivar contract: Copy of `JobOffer.contract`.
+    :type contract: CharField
+    :ivar remoteness: Copy of `JobOffer.remoteness`.
+    :type remoteness: CharField
+    :ivar created_at: Copy of `JobOffer.created_at`.
+    :type created_at: DateTimeField
+    """
+
+    offer = models.OneToOneField(
+        JobOffer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    document = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True)
+    city = models.ForeignKey(
+        City, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    country = models.ForeignKey(
+        Country, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    industry = models.ForeignKey(
+        Industry, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    skill_ids = IdListField(default=list)
+    benefit_ids = IdListField(default=list)
+    wage = models.IntegerField(blank=True, null=True)
+    seniority = models.CharField(max_length=255, blank=True)
+    contract = models.CharField(max_length=255, blank=True)
+    remoteness = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["seniority", "contract", "remoteness"],
+                name="jobsearch_choices_idx",
+            ),
+            models.Index(fields=["wage"], name="jobsearch_wage_idx"),
+            models.Index(fields=["-created_at"], name="jobsearch_created_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"Search document for offer {self.offer_id}"
+
+
 class OfferResponse(models.Model):
     """
     Represents a response to a job offer by a candidate.
@@ -433,8 +579,63 @@ class OfferResponse(models.Model):
     offer = models.ForeignKey(JobOffer, on_delete=models.CASCADE)
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE)
 
+    objects = OfferResponseManager()
+
     class Meta:
         unique_together = ("offer", "candidate")
 
     def __str__(self):
         return f"{self.candidate.user.first_name} {self.candidate.user.last_name} applied to {self.offer.employer.company_name} - {self.offer.description}"
+
+
+class CandidateSummary(models.Model):
+    """
+    Represents the precomputed profile summary of a candidate.
+
+    The row is rebuilt whenever the candidate's skills, experience or
+    education change, and rows of currently employed candidates are rolled
+    forward daily by `manage.py refresh_candidate_summaries`, so candidate
+    listings never aggregate the related tables.
+
+    :ivar candidate: The candidate the summary belongs to.
+    :type candidate: OneToOneField
+    :ivar experience_days: Total experience in days, with overlapping jobs
+        merged and open-ended jobs counted up to `computed_on`.
+    :type experience_days: IntegerField
+    :ivar computed_on: The date the summary was computed on.
+    :type computed_on: DateField
+    :ivar skill_ids: Ids of the candidate's skills.
+    :type skill_ids: IdListField
+    :ivar latest_position: The job position of the most recent experience.
+    :type latest_position: CharField
+    :ivar is_currently_employed: Whether any experience is current or
+        open-ended.
+    :type is_currently_employed: BooleanField
+    :ivar highest_degree: The highest degree of the candidate's education.
+    :type highest_degree: CharField
+    """
+
+    candidate = models.OneToOneField(
+        Candidate,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    experience_days = models.IntegerField(default=0)
+    computed_on = models.DateField()
+    skill_ids = IdListField(default=list)
+    latest_position = models.CharField(max_length=255, blank=True)
+    is_currently_employed = models.BooleanField(default=False)
+    highest_degree = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["experience_days"], name="candsummary_experience_idx"),
+            models.Index(
+                fields=["is_currently_employed", "computed_on"],
+                name="candsummary_current_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Summary of candidate {self.candidate_id}"
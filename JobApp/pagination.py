@@ -1,16 +1,206 @@
+import base64
+import binascii
+from collections import OrderedDict
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class OptionalPagination(PageNumberPagination):
     """
     Custom pagination class that allows for optional pagination.
+
+    Views that declare `cursor_ordering` (e.g. `("-created_at", "-id")`)
+    additionally support keyset pagination: sending the `cursor` query
+    parameter (empty for the first page) switches the response to
+    `{"next", "previous", "results"}` pages that seek on the ordering
+    columns instead of using OFFSET and skip the `COUNT(*)` query. Cursor
+    pages keep the `cursor_ordering`, so requests whose ordering (an
+    `ordering` parameter or search relevance) differs from it are
+    rejected with 400.
     """
 
     page_size = 50
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    invalid_ordering_message = (
+        "Cursor pagination only supports the ordering {ordering}; "
+        "remove the cursor to order results differently."
+    )
 
     def get_page_size(self, request):
         no_paginate = request.query_params.get("no_pagination", "false").lower()
         if no_paginate == "true":
             return None
         return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = getattr(view, "cursor_ordering", None)
+        self.use_cursor = bool(
+            self.cursor_ordering and self.cursor_query_param in request.query_params
+        )
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.check_cursor_ordering(queryset)
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        ordering = [self._parse_ordering(field) for field in self.cursor_ordering]
+        if reverse:
+            ordering = [(name, not descending) for name, descending in ordering]
+
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, position))
+        queryset = queryset.order_by(
+            *(f"-{name}" if descending else name for name, descending in ordering)
+        )
+
+        results = list(queryset[: page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self._position(results[-1])
+            if position is not None and (has_more or not reverse):
+                self.previous_position = self._position(results[0])
+        return results
+
+    def check_cursor_ordering(self, queryset):
+        """
+        Raises `ValidationError` unless the queryset's ordering is a prefix
+        of the cursor ordering, which cursor pages would silently replace.
+        """
+        ordering = list(queryset.query.order_by)
+        if ordering != list(self.cursor_ordering[: len(ordering)]):
+            raise ValidationError(
+                {
+                    self.cursor_query_param: [
+                        self.invalid_ordering_message.format(
+                            ordering=",".join(self.cursor_ordering)
+                        )
+                    ]
+                }
+            )
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.use_cursor:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        if getattr(view, "cursor_ordering", None):
+            parameters.append(
+                {
+                    "name": self.cursor_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": (
+                        "Keyset pagination cursor; send it empty for the first "
+                        "page. Pages keep the default ordering, so `ordering` "
+                        "and search relevance cannot be combined with it."
+                    ),
+                    "schema": {"type": "string"},
+                }
+            )
+        return parameters
+
+    def encode_cursor(self, position, reverse):
+        """
+        Returns the URL of the page following (or, when `reverse` is set,
+        preceding) the given ordering position.
+        """
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.make_cursor(position, reverse)
+        )
+
+    @staticmethod
+    def make_cursor(position, reverse=False):
+        """
+        Returns the opaque cursor token for an ordering position.
+        """
+        payload = json.dumps({"p": position, "r": reverse}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Returns the `(position, reverse)` pair encoded in the request's
+        cursor; an empty cursor selects the first page.
+        """
+        token = request.query_params.get(self.cursor_query_param, "")
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            position = payload["p"]
+            reverse = bool(payload.get("r", False))
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.cursor_ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def _parse_ordering(field):
+        return field.lstrip("-"), field.startswith("-")
+
+    def _position(self, instance):
+        position = []
+        for field in self.cursor_ordering:
+            value = getattr(instance, self._parse_ordering(field)[0])
+            position.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return position
+
+    @staticmethod
+    def _seek_filter(ordering, position):
+        """
+        Builds the row-value comparison `(a, b) > (x, y)` for the given
+        ordering as `a > x OR (a = x AND b > y)`, honouring each column's
+        direction.
+        """
+        condition = Q()
+        for index, (name, descending) in enumerate(ordering):
+            lookup = "lt" if descending else "gt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+            for previous_index in range(index):
+                step &= Q(**{ordering[previous_index][0]: position[previous_index]})
+            condition |= step
+        return condition
@@ -1,31 +1,33 @@
 from rest_framework.permissions import BasePermission
 
+from JobApp.authentication import resolve_actor
+
 
 class IsEmployer(BasePermission):
     """
     Allows access only to users that are marked as employers.
+
+    Reads `request.employer` set by `resolve_actor`, which runs no queries
+    for tokens carrying role claims.
     """
 
     message = "Access restricted to employers only"
 
     def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and hasattr(request.user, "employer")
-        )
+        resolve_actor(request)
+        return request.employer is not None
 
 
 class IsCandidate(BasePermission):
     """
     Allows access only to users that are marked as candidates.
+
+    Reads `request.candidate` set by `resolve_actor`, which runs no queries
+    for tokens carrying role claims.
     """
 
     message = "Access restricted to candidates only"
 
     def has_permission(self, request, view):
-        return (
-            request.user
-            and request.user.is_authenticated
-            and hasattr(request.user, "candidate")
-        )
+        resolve_actor(request)
+        return request.candidate is not None
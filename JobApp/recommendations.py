@@ -0,0 +1,226 @@
+"""
+Skill-overlap job recommendations.
+
+`OfferSkillIndex` keeps an in-memory bitset index of the job board: every
+offer owns a slot (slots follow creation order), and every skill and
+city owns an integer bitmask of the slots of its offers. Ranking the
+offers of a candidate with `k` skills adds the `k` skill masks into a
+bit-sliced counter (one mask per bit of the overlap count), so a top-N
+query costs a handful of big integer operations over the whole board
+instead of a per-candidate SQL aggregation.
+
+The index is built lazily, kept up to date by the signal receivers in
+`JobApp.signals` and rebuilt after `RECOMMENDATION_INDEX_TTL` seconds to
+pick up changes made by other processes.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+
+from JobApp.models import CandidateSkill, JobOffer, JobOfferSkill
+
+
+def iter_bits_descending(mask):
+    """
+    Yields the set bit positions of `mask`, highest first.
+    """
+    while mask:
+        bit = mask.bit_length() - 1
+        yield bit
+        mask ^= 1 << bit
+
+
+def count_bits(masks, universe):
+    """
+    Adds the bitmasks into a bit-sliced counter and returns its planes:
+    bit `i` of the count of a slot is stored in bit `slot` of `planes[i]`.
+    Only slots of `universe` are counted.
+    """
+    planes = []
+    for mask in masks:
+        carry = mask & universe
+        for index, plane in enumerate(planes):
+            planes[index], carry = plane ^ carry, plane & carry
+            if not carry:
+                break
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def slots_with_count(planes, count, universe):
+    """
+    Returns the mask of the `universe` slots whose count in `planes` is
+    exactly `count`.
+    """
+    if count >> len(planes):
+        return 0
+    matching = universe
+    for index, plane in enumerate(planes):
+        matching &= plane if count >> index & 1 else ~plane
+    return matching
+
+
+class OfferSkillIndex:
+    """
+    In-memory bitset index of job offer skills and cities.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the index; it is rebuilt on next use.
+        """
+        with self._lock:
+            self._built_at = None
+            self._slots = {}
+            self._offers = []
+            self._skills = {}
+            self._cities = {}
+            self._offer_skills = {}
+            self._offer_cities = {}
+            self._alive = 0
+
+    def _ensure_built(self):
+        ttl = getattr(settings, "RECOMMENDATION_INDEX_TTL", 300)
+        if self._built_at is None or time.monotonic() - self._built_at > ttl:
+            self.rebuild()
+
+    def rebuild(self):
+        """
+        Rebuilds the index from the database.
+        """
+        offers = JobOffer.objects.order_by("created_at", "id").values_list(
+            "id", "location__city_id"
+        )
+        skills = {}
+        for offer_id, skill_id in JobOfferSkill.objects.values_list(
+            "offer_id", "skill_id"
+        ):
+            skills.setdefault(offer_id, set()).add(skill_id)
+
+        with self._lock:
+            self.reset()
+            for offer_id, city_id in offers.iterator():
+                self._add(offer_id, city_id, skills.get(offer_id, ()))
+            self._built_at = time.monotonic()
+
+    def _add(self, offer_id, city_id, skill_ids):
+        slot = len(self._offers)
+        bit = 1 << slot
+        self._slots[offer_id] = slot
+        self._offers.append(offer_id)
+        self._alive |= bit
+        self._offer_cities[offer_id] = city_id
+        self._cities[city_id] = self._cities.get(city_id, 0) | bit
+        self._offer_skills[offer_id] = set(skill_ids)
+        for skill_id in skill_ids:
+            self._skills[skill_id] = self._skills.get(skill_id, 0) | bit
+
+    def _remove(self, offer_id):
+        slot = self._slots.pop(offer_id, None)
+        if slot is None:
+            return
+        clear = ~(1 << slot)
+        self._alive &= clear
+        city_id = self._offer_cities.pop(offer_id)
+        self._cities[city_id] &= clear
+        for skill_id in self._offer_skills.pop(offer_id):
+            self._skills[skill_id] &= clear
+
+    def refresh_offers(self, offer_ids):
+        """
+        Re-reads the given offers from the database. Offers keep their
+        slot (and thus their recency) unless they were deleted.
+        """
+        offer_ids = set(offer_ids)
+        if not offer_ids:
+            return
+        with self._lock:
+            if self._built_at is None:
+                return
+            cities = dict(
+                JobOffer.objects.filter(pk__in=offer_ids).values_list(
+                    "id", "location__city_id"
+                )
+            )
+            skills = {}
+            for offer_id, skill_id in JobOfferSkill.objects.filter(
+                offer_id__in=cities
+            ).values_list("offer_id", "skill_id"):
+                skills.setdefault(offer_id, set()).add(skill_id)
+
+            for offer_id in sorted(offer_ids):
+                if offer_id not in cities:
+                    self._remove(offer_id)
+                    continue
+                if offer_id not in self._slots:
+                    self._add(offer_id, cities[offer_id], skills.get(offer_id, ()))
+                    continue
+                bit = 1 << self._slots[offer_id]
+                old_city = self._offer_cities[offer_id]
+                self._cities[old_city] &= ~bit
+                self._cities[cities[offer_id]] = (
+                    self._cities.get(cities[offer_id], 0) | bit
+                )
+                self._offer_cities[offer_id] = cities[offer_id]
+                new_skills = skills.get(offer_id, set())
+                for skill_id in self._offer_skills[offer_id] - new_skills:
+                    self._skills[skill_id] &= ~bit
+                for skill_id in new_skills - self._offer_skills[offer_id]:
+                    self._skills[skill_id] = self._skills.get(skill_id, 0) | bit
+                self._offer_skills[offer_id] = new_skills
+
+    def remove_offers(self, offer_ids):
+        """
+        Drops the given offers from the index.
+        """
+        with self._lock:
+            for offer_id in offer_ids:
+                self._remove(offer_id)
+
+    def top(self, skill_ids, city_id=None, limit=20):
+        """
+        Returns up to `limit` `(offer_id, score)` pairs ranked by the number
+        of shared skills, then offers in `city_id`, then recency. Offers
+        without any shared skill are not returned.
+        """
+        with self._lock:
+            self._ensure_built()
+            masks = [
+                self._skills[skill] for skill in skill_ids if skill in self._skills
+            ]
+            universe = self._alive
+            city_mask = self._cities.get(city_id, 0)
+            offers = self._offers
+
+            planes = count_bits(masks, universe)
+            results = []
+            for score in range(len(masks), 0, -1):
+                matching = slots_with_count(planes, score, universe)
+                for group in (matching & city_mask, matching & ~city_mask):
+                    for slot in iter_bits_descending(group):
+                        results.append((offers[slot], score))
+                        if len(results) >= limit:
+                            return results
+            return results
+
+
+offer_index = OfferSkillIndex()
+
+
+def recommend_offers(candidate, limit=20):
+    """
+    Returns the `(offer_id, score)` pairs recommended to a candidate.
+    """
+    skill_ids = set(
+        CandidateSkill.objects.filter(candidate=candidate).values_list(
+            "skill_id", flat=True
+        )
+    )
+    return offer_index.top(skill_ids, city_id=candidate.user.city_id, limit=limit)
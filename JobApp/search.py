@@ -0,0 +1,223 @@
+"""
+Full-text search for job offers.
+
+Every `JobOffer` owns a `JobOfferSearchDocument` holding its searchable
+text and a denormalized copy of the columns used by `JobOfferFilter`,
+so listing filters read a single table instead of joining through the
+employer, location and skill tables. On PostgreSQL the document also carries a weighted `tsvector`
+(GIN indexed) used for matching and relevance ranking; other databases
+fall back to substring matching on the denormalized text.
+"""
+
+from contextlib import contextmanager
+import re
+import threading
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, TextField, Value
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from JobApp.models import JobOffer, JobOfferSearchDocument
+
+
+_pending = threading.local()
+
+
+def _is_postgresql():
+    return connection.vendor == "postgresql"
+
+
+def _search_config():
+    return getattr(settings, "JOB_SEARCH_CONFIG", "simple")
+
+
+def _document_parts(offer):
+    """
+    Returns the searchable text of an offer grouped by relevance weight.
+    """
+    skills = " ".join(entry.skill.name for entry in offer.jobofferskill_set.all())
+    employer = " ".join(
+        [
+            offer.employer.company_name,
+            offer.employer.industry.name,
+            offer.location.city.name,
+        ]
+    )
+    return {
+        "A": offer.position,
+        "B": skills,
+        "C": employer,
+        "D": offer.description,
+    }
+
+
+def _filter_columns(offer):
+    """
+    Returns the denormalized filter columns of an offer's search document.
+    """
+    city = offer.location.city
+    return {
+        "city_id": city.id,
+        "country_id": city.country_id,
+        "industry_id": offer.employer.industry_id,
+        "skill_ids": sorted(
+            {entry.skill_id for entry in offer.jobofferskill_set.all()}
+        ),
+        "benefit_ids": sorted(
+            {entry.benefit_id for entry in offer.employer.employerbenefit_set.all()}
+        ),
+        "wage": offer.wage,
+        "seniority": offer.seniority,
+        "contract": offer.contract,
+        "remoteness": offer.remoteness,
+        "created_at": offer.created_at,
+    }
+
+
+def _search_vector(parts):
+    config = _search_config()
+    vector = None
+    for weight, text in parts.items():
+        part = SearchVector(
+            Value(text, output_field=TextField()), weight=weight, config=config
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def refresh_search_documents(offer_ids):
+    """
+    Rebuilds the search documents of the given job offers.
+
+    Offers that no longer exist are skipped; their documents are removed
+    together with the offer by the database cascade.
+    """
+    offer_ids = set(offer_ids)
+    if not offer_ids:
+        return
+    if getattr(_pending, "offer_ids", None) is not None:
+        _pending.offer_ids.update(offer_ids)
+        return
+
+    offers = (
+        JobOffer.objects.filter(pk__in=offer_ids)
+        .select_related("employer__industry", "location__city")
+        .prefetch_related("jobofferskill_set__skill", "employer__employerbenefit_set")
+    )
+    use_vector = _is_postgresql()
+    for offer in offers:
+        parts = _document_parts(offer)
+        defaults = {
+            "document": " ".join(parts.values()).lower(),
+            **_filter_columns(offer),
+        }
+        if use_vector:
+            defaults["search_vector"] = _search_vector(parts)
+        JobOfferSearchDocument.objects.update_or_create(offer=offer, defaults=defaults)
+
+
+@contextmanager
+def deferred_search_refresh():
+    """
+    Collects search document refreshes requested inside the block and
+    applies them once on exit, so multi-row writes rebuild each offer's
+    document a single time.
+    """
+    if getattr(_pending, "offer_ids", None) is not None:
+        yield
+        return
+
+    _pending.offer_ids = set()
+    try:
+        yield
+    except BaseException:
+        _pending.offer_ids = None
+        raise
+    offer_ids, _pending.offer_ids = _pending.offer_ids, None
+    refresh_search_documents(offer_ids)
+
+
+def rebuild_search_documents(batch_size=500):
+    """
+    Rebuilds the search documents of all job offers in batches.
+    Returns the number of processed offers.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        offer_ids = list(
+            JobOffer.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not offer_ids:
+            return processed
+        refresh_search_documents(offer_ids)
+        processed += len(offer_ids)
+        last_id = offer_ids[-1]
+
+
+class JobOfferSearchFilter(filters.SearchFilter):
+    """
+    Search backend for job offers backed by `JobOfferSearchDocument`.
+
+    On PostgreSQL every search term is matched as a prefix against the
+    GIN indexed `tsvector` and results are ranked by relevance, unless
+    an explicit `ordering` was requested. Other databases match the
+    terms as substrings of the denormalized document.
+    """
+
+    rank_annotation = "search_rank"
+
+    def get_search_query(self, request):
+        """
+        Returns the PostgreSQL `SearchQuery` for the request's search terms,
+        or the list of terms on other databases; `None` without terms.
+        """
+        terms = [
+            token
+            for term in self.get_search_terms(request)
+            for token in re.findall(r"\w+", term.lower())
+        ]
+        if not terms:
+            return None
+        if not _is_postgresql():
+            return terms
+        return SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=_search_config(),
+        )
+
+    def filter_matches(self, request, queryset):
+        """
+        Restricts the queryset to offers matching the search terms, without
+        ranking them.
+        """
+        query = self.get_search_query(request)
+        if query is None:
+            return queryset
+        if isinstance(query, list):
+            for term in query:
+                queryset = queryset.filter(search_document__document__contains=term)
+            return queryset
+        return queryset.filter(search_document__search_vector=query)
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if not isinstance(query, SearchQuery):
+            return self.filter_matches(request, queryset)
+
+        queryset = queryset.filter(search_document__search_vector=query).annotate(
+            **{
+                self.rank_annotation: SearchRank(
+                    F("search_document__search_vector"), query
+                )
+            }
+        )
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return queryset
+        return queryset.order_by(f"-{self.rank_annotation}", *queryset.query.order_by)
@@ -1,5 +1,7 @@
+from functools import lru_cache
+
+from django.db import transaction
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import (
     Benefit,
@@ -19,6 +21,9 @@ from .models import (
     Skill,
     User,
 )
+from .search import deferred_search_refresh
+from .signals import deferred_candidate_refresh, refresh_candidate_profiles
+from .tokens import issue_tokens
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -45,12 +50,10 @@ class UserSerializerToken(UserSerializer):
         fields = ["id", "email", "refresh", "access"]
 
     def get_access(self, obj):
-        token = RefreshToken.for_user(obj)
-        return str(token.access_token)
+        return issue_tokens(obj)["access"]
 
     def get_refresh(self, obj):
-        token = RefreshToken.for_user(obj)
-        return str(token)
+        return issue_tokens(obj)["refresh"]
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -143,9 +146,7 @@ class EmployerRegistrationSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = EmployerSerializer(instance, context=self.context).data
-        tokens = RefreshToken.for_user(instance.user)
-        data["refresh"] = str(tokens)
-        data["access"] = str(tokens.access_token)
+        data.update(issue_tokens(instance.user))
         return data
 
 
@@ -209,9 +210,7 @@ class CandidateRegistrationSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = CandidateSerializer(instance, context=self.context).data
-        tokens = RefreshToken.for_user(instance.user)
-        data["refresh"] = str(tokens)
-        data["access"] = str(tokens.access_token)
+        data.update(issue_tokens(instance.user))
         return data
 
 
@@ -240,11 +239,30 @@ class CandidateSerializerWithTotalExp(serializers.ModelSerializer):
         fields = ["id", "user", "resume", "about", "total_experience"]
 
     def get_total_experience(self, obj):
-        days = obj.total_experience_days.days if obj.total_experience_days else 0
-        years = days / 365.25
+        years = (obj.total_experience_days or 0) / 365.25
         return round(years * 2) / 2
 
 
+class CandidateMatchSerializer(CandidateSerializerWithTotalExp):
+    """
+    Serializer for candidates matched to a job offer, including the match score
+    and its components.
+    """
+
+    score = serializers.FloatField(read_only=True)
+    skill_score = serializers.FloatField(read_only=True)
+    experience_score = serializers.FloatField(read_only=True)
+    location_score = serializers.FloatField(read_only=True)
+
+    class Meta(CandidateSerializerWithTotalExp.Meta):
+        fields = CandidateSerializerWithTotalExp.Meta.fields + [
+            "score",
+            "skill_score",
+            "experience_score",
+            "location_score",
+        ]
+
+
 class CandidateSimlifiedSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for the Candidate model.
@@ -275,7 +293,7 @@ class CountrySerializer(serializers.ModelSerializer):
     class Meta:
         model = Country
         # fields = ['id', 'name']
-        fields = "__all__"
+        exclude = ["updated_at"]
 
 
 class CitySerializer(serializers.ModelSerializer):
@@ -286,7 +304,7 @@ class CitySerializer(serializers.ModelSerializer):
     class Meta:
         model = City
         # fields = ['id', 'name', 'country', 'province', 'zip_code']
-        fields = "__all__"
+        exclude = ["updated_at"]
 
 
 class BenefitSerializer(serializers.ModelSerializer):
@@ -296,7 +314,7 @@ class BenefitSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Benefit
-        fields = "__all__"
+        exclude = ["updated_at"]
 
 
 class EmployerBenefitSerializer(serializers.ModelSerializer):
@@ -339,7 +357,7 @@ class SkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = Skill
         # fields = ['id', 'name']
-        fields = "__all__"
+        exclude = ["updated_at"]
 
 
 class CandidateSkillSerializer(serializers.ModelSerializer):
@@ -365,6 +383,58 @@ class CandidateSkillCreateSerializer(serializers.ModelSerializer):
         fields = ["skill"]
 
 
+class CandidateSkillSetSerializer(serializers.Serializer):
+    """
+    Serializer replacing the whole skill set of a candidate.
+    """
+
+    skills = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=True
+    )
+
+    def validate_skills(self, value):
+        skill_ids = set(value)
+        found = set(Skill.objects.filter(pk__in=skill_ids).values_list("pk", flat=True))
+        missing = sorted(skill_ids - found)
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid skill ids: {', '.join(map(str, missing))}."
+            )
+        return skill_ids
+
+    def create(self, validated_data):
+        """
+        Applies the difference between the skills of the candidate given as
+        `save(candidate_id=...)` and the requested ones with one delete and
+        one insert.
+        """
+        candidate_id = validated_data["candidate_id"]
+        desired = validated_data["skills"]
+        with transaction.atomic(), deferred_candidate_refresh():
+            current = set(
+                CandidateSkill.objects.filter(candidate_id=candidate_id).values_list(
+                    "skill_id", flat=True
+                )
+            )
+            removed = current - desired
+            added = desired - current
+            if removed:
+                CandidateSkill.objects.filter(
+                    candidate_id=candidate_id, skill_id__in=removed
+                ).delete()
+            if added:
+                CandidateSkill.objects.bulk_create(
+                    [
+                        CandidateSkill(candidate_id=candidate_id, skill_id=skill_id)
+                        for skill_id in sorted(added)
+                    ],
+                    ignore_conflicts=True,
+                )
+                # bulk_create sends no signals.
+                refresh_candidate_profiles([candidate_id])
+        return candidate_id
+
+
 class JobOfferSkillSerializer(serializers.ModelSerializer):
     """
     Serializer for the JobOfferSkill model.
@@ -389,7 +459,16 @@ class JobOfferSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobOffer
-        fields = "__all__"
+        exclude = ["updated_at"]
+
+
+class RecommendedJobOfferSerializer(JobOfferSerializer):
+    """
+    Serializer for recommended job offers, including the number of skills
+    shared with the candidate.
+    """
+
+    score = serializers.IntegerField(read_only=True)
 
 
 class JobOfferCreateSerializer(serializers.ModelSerializer):
@@ -403,22 +482,22 @@ class JobOfferCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobOffer
-        exclude = ["employer"]
+        exclude = ["employer", "updated_at"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         request = self.context.get("request")
         if request and hasattr(request, "user") and request.user.is_authenticated:
-            employer = Employer.objects.get(user=request.user)
             self.fields["location"].queryset = EmployerLocation.objects.filter(
-                employer=employer
+                employer_id=request.user.employer_id
             )
 
     def create(self, validated_data):
         skills_data = validated_data.pop("skills")
-        job_offer = JobOffer.objects.create(**validated_data)
-        for skill in skills_data:
-            JobOfferSkill.objects.create(offer=job_offer, skill=skill)
+        with deferred_search_refresh():
+            job_offer = JobOffer.objects.create(**validated_data)
+            for skill in skills_data:
+                JobOfferSkill.objects.create(offer=job_offer, skill=skill)
         return job_offer
 
 
@@ -433,16 +512,17 @@ class JobOfferUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = JobOffer
-        exclude = ["employer"]
+        exclude = ["employer", "updated_at"]
 
     def update(self, instance, validated_data):
-        if "skills" in validated_data:
-            skills_data = validated_data.pop("skills")
-            instance.jobofferskill_set.all().delete()
-            for skill in skills_data:
-                JobOfferSkill.objects.create(offer=instance, skill=skill)
+        with deferred_search_refresh():
+            if "skills" in validated_data:
+                skills_data = validated_data.pop("skills")
+                instance.jobofferskill_set.all().delete()
+                for skill in skills_data:
+                    JobOfferSkill.objects.create(offer=instance, skill=skill)
 
-        return super().update(instance, validated_data)
+            return super().update(instance, validated_data)
 
 
 class CandidateExperienceSerializer(serializers.ModelSerializer):
@@ -457,6 +537,32 @@ class CandidateExperienceSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class CandidateRecordListSerializer(serializers.ListSerializer):
+    """
+    List serializer importing a batch of candidate profile records.
+
+    Items are validated together; when all of them are valid they are
+    inserted with one `bulk_create` and the candidates are refreshed once.
+    """
+
+    max_length = 100
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("allow_empty", False)
+        kwargs.setdefault("max_length", self.max_length)
+        super().__init__(*args, **kwargs)
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        with transaction.atomic(), deferred_candidate_refresh():
+            records = model.objects.bulk_create(
+                [model(**attrs) for attrs in validated_data]
+            )
+            # bulk_create sends no signals.
+            refresh_candidate_profiles({record.candidate_id for record in records})
+        return records
+
+
 class CandidateExperienceCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating CandidateExperience instances.
@@ -465,6 +571,7 @@ class CandidateExperienceCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = CandidateExperience
         exclude = ["candidate"]
+        list_serializer_class = CandidateRecordListSerializer
 
 
 class CandidateEducationSerializer(serializers.ModelSerializer):
@@ -484,11 +591,68 @@ class CandidateEducationCreateSerializer(serializers.ModelSerializer):
     Serializer for creating CandidateEducation instances.
     """
 
+    class Meta:
+        model = CandidateEducation
+        exclude = ["candidate"]
+        list_serializer_class = CandidateRecordListSerializer
+
+
+class CandidateDossierSkillSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a skill of a candidate dossier.
+    """
+
+    skill = SkillSerializer(read_only=True)
+
+    class Meta:
+        model = CandidateSkill
+        fields = ["id", "skill"]
+
+
+class CandidateDossierExperienceSerializer(serializers.ModelSerializer):
+    """
+    Serializer for an experience of a candidate dossier.
+    """
+
+    class Meta:
+        model = CandidateExperience
+        exclude = ["candidate"]
+
+
+class CandidateDossierEducationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for an education record of a candidate dossier.
+    """
+
     class Meta:
         model = CandidateEducation
         exclude = ["candidate"]
 
 
+class CandidateDossierSerializer(CandidateSerializerWithTotalExp):
+    """
+    Serializer for a candidate's profile together with their skills,
+    experience and education.
+    """
+
+    skills = CandidateDossierSkillSerializer(
+        source="candidateskill_set", many=True, read_only=True
+    )
+    experience = CandidateDossierExperienceSerializer(
+        source="candidateexperience_set", many=True, read_only=True
+    )
+    education = CandidateDossierEducationSerializer(
+        source="candidateeducation_set", many=True, read_only=True
+    )
+
+    class Meta(CandidateSerializerWithTotalExp.Meta):
+        fields = CandidateSerializerWithTotalExp.Meta.fields + [
+            "skills",
+            "experience",
+            "education",
+        ]
+
+
 class OfferResponseSerializer(serializers.ModelSerializer):
     """
     Serializer for the OfferResponse model.
@@ -503,6 +667,22 @@ class OfferResponseSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class OfferResponseMinimalSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the minimal apply response: the ids of the application,
+    offer and candidate, and the application status.
+    """
+
+    status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = OfferResponse
+        fields = ["id", "offer", "candidate", "status"]
+
+    def get_status(self, obj) -> str:
+        return "applied"
+
+
 class OfferResponseCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating OfferResponse instances.
@@ -546,6 +726,101 @@ class EmployerBenefitCreateSerializer(serializers.ModelSerializer):
         fields = ["benefit"]
 
 
+class EmployerDirectoryLocationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the locations embedded in the employer directory.
+    """
+
+    city = CitySerializer(read_only=True)
+
+    class Meta:
+        model = EmployerLocation
+        fields = ["id", "city"]
+
+
+class EmployerDirectorySerializer(EmployerSerializer):
+    """
+    Serializer for the employer directory, optionally embedding the
+    employer's offer count, locations and benefits.
+    """
+
+    offer_count = serializers.IntegerField(read_only=True)
+    locations = EmployerDirectoryLocationSerializer(
+        source="employerlocation_set", many=True, read_only=True
+    )
+    benefits = EmployerBenefitSerializer(
+        source="employerbenefit_set", many=True, read_only=True
+    )
+
+    INCLUDES = ("offer_count", "locations", "benefits")
+
+    class Meta(EmployerSerializer.Meta):
+        fields = EmployerSerializer.Meta.fields + [
+            "offer_count",
+            "locations",
+            "benefits",
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_employer_directory_serializer(include):
+    """
+    Returns the employer directory serializer class rendering only the
+    optional fields in `include`, so eager loading and response versions
+    cover exactly the embedded relations.
+    """
+    if not include:
+        return EmployerSerializer
+    included = [
+        name for name in EmployerDirectorySerializer.INCLUDES if name in include
+    ]
+    attrs = {
+        name: None
+        for name in EmployerDirectorySerializer.INCLUDES
+        if name not in include
+    }
+    attrs["Meta"] = type(
+        "Meta",
+        (EmployerDirectorySerializer.Meta,),
+        {"fields": EmployerSerializer.Meta.fields + included},
+    )
+    return type("EmployerDirectorySerializer", (EmployerDirectorySerializer,), attrs)
+
+
+class EmployerOverviewOfferSerializer(JobOfferSerializer):
+    """
+    Serializer for the job offers embedded in an employer overview.
+    """
+
+    employer = None
+
+    class Meta:
+        model = JobOffer
+        exclude = ["employer", "updated_at"]
+
+
+class EmployerOverviewSerializer(EmployerSerializer):
+    """
+    Serializer for an employer overview: the employer with its locations,
+    benefits and latest job offers.
+    """
+
+    locations = EmployerDirectoryLocationSerializer(
+        source="employerlocation_set", many=True, read_only=True
+    )
+    benefits = EmployerBenefitSerializer(
+        source="employerbenefit_set", many=True, read_only=True
+    )
+    latest_offers = EmployerOverviewOfferSerializer(many=True, read_only=True)
+
+    class Meta(EmployerSerializer.Meta):
+        fields = EmployerSerializer.Meta.fields + [
+            "locations",
+            "benefits",
+            "latest_offers",
+        ]
+
+
 class UpdateUserPasswordSerializer(serializers.Serializer):
     """
     Serializer for updating user password.
@@ -619,3 +894,28 @@ class ChoiceSerializer(serializers.Serializer):
 
     value = serializers.CharField()
     display = serializers.CharField()
+
+
+class FacetValueSerializer(serializers.Serializer):
+    """
+    Serializer for a single facet value and its offer count.
+    """
+
+    value = serializers.CharField()
+    display = serializers.CharField(required=False)
+    count = serializers.IntegerField()
+
+
+class JobOfferFacetsSerializer(serializers.Serializer):
+    """
+    Serializer for the faceted counts of the job board.
+    """
+
+    total = serializers.IntegerField()
+    seniority = FacetValueSerializer(many=True)
+    contract = FacetValueSerializer(many=True)
+    remoteness = FacetValueSerializer(many=True)
+    skill = FacetValueSerializer(many=True)
+    city = FacetValueSerializer(many=True)
+    industry = FacetValueSerializer(many=True)
+    benefits = FacetValueSerializer(many=True)
@@ -0,0 +1,283 @@
+"""
+Signal receivers keeping derived read models in sync with their sources.
+"""
+
+from contextlib import contextmanager
+import threading
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from JobApp.caching import (
+    invalidate_employer_overview,
+    invalidate_employer_overviews,
+    invalidate_job_listings,
+    invalidate_user_tokens,
+)
+from JobApp.matching import candidate_index
+from JobApp.models import (
+    Benefit,
+    Candidate,
+    CandidateEducation,
+    CandidateExperience,
+    CandidateSkill,
+    City,
+    Employer,
+    EmployerBenefit,
+    EmployerLocation,
+    Industry,
+    JobOffer,
+    JobOfferSkill,
+    Skill,
+    User,
+)
+from JobApp.recommendations import offer_index
+from JobApp.search import refresh_search_documents
+from JobApp.summaries import refresh_candidate_summaries
+
+
+_pending = threading.local()
+
+
+def _deleted_directly(origin, model):
+    """
+    Tells whether a deletion was started on `model` itself rather than
+    cascaded from a parent row that is being removed as well.
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is model
+    return isinstance(origin, model)
+
+
+def _touch(queryset):
+    """
+    Bumps `updated_at` of the given rows without sending signals.
+    """
+    queryset.update(updated_at=timezone.now())
+
+
+def refresh_candidate_profiles(candidate_ids):
+    """
+    Refreshes the summaries, `updated_at` and matching index entries of
+    candidates whose skills, experience or education changed.
+    """
+    candidate_ids = set(candidate_ids)
+    if not candidate_ids:
+        return
+    if getattr(_pending, "candidate_ids", None) is not None:
+        _pending.candidate_ids.update(candidate_ids)
+        return
+    refresh_candidate_summaries(candidate_ids)
+    _touch(Candidate.objects.filter(pk__in=candidate_ids))
+    candidate_index.refresh_candidates(candidate_ids)
+
+
+@contextmanager
+def deferred_candidate_refresh():
+    """
+    Collects candidate profile refreshes requested inside the block and
+    applies them once on exit, so multi-row writes refresh each candidate
+    a single time.
+    """
+    if getattr(_pending, "candidate_ids", None) is not None:
+        yield
+        return
+
+    _pending.candidate_ids = set()
+    try:
+        yield
+    except BaseException:
+        _pending.candidate_ids = None
+        raise
+    candidate_ids, _pending.candidate_ids = _pending.candidate_ids, None
+    refresh_candidate_profiles(candidate_ids)
+
+
+@receiver(post_save, sender=JobOffer)
+def job_offer_saved(sender, instance, **kwargs):
+    refresh_search_documents([instance.pk])
+    offer_index.refresh_offers([instance.pk])
+
+
+@receiver(post_delete, sender=JobOffer)
+def job_offer_deleted(sender, instance, **kwargs):
+    offer_index.remove_offers([instance.pk])
+
+
+@receiver(post_save, sender=JobOfferSkill)
+def job_offer_skill_saved(sender, instance, **kwargs):
+    refresh_search_documents([instance.offer_id])
+    offer_index.refresh_offers([instance.offer_id])
+    _touch(JobOffer.objects.filter(pk=instance.offer_id))
+
+
+@receiver(post_delete, sender=JobOfferSkill)
+def job_offer_skill_deleted(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin, JobOfferSkill):
+        refresh_search_documents([instance.offer_id])
+        offer_index.refresh_offers([instance.offer_id])
+        _touch(JobOffer.objects.filter(pk=instance.offer_id))
+
+
+@receiver(post_save, sender=Employer)
+def employer_saved(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(
+            JobOffer.objects.filter(employer=instance).values_list("pk", flat=True)
+        )
+
+
+@receiver(post_save, sender=EmployerLocation)
+def employer_location_saved(sender, instance, created, **kwargs):
+    if not created:
+        offer_ids = list(
+            JobOffer.objects.filter(location=instance).values_list("pk", flat=True)
+        )
+        refresh_search_documents(offer_ids)
+        offer_index.refresh_offers(offer_ids)
+
+
+@receiver(post_save, sender=EmployerBenefit)
+def employer_benefit_saved(sender, instance, **kwargs):
+    refresh_search_documents(
+        JobOffer.objects.filter(employer_id=instance.employer_id).values_list(
+            "pk", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=EmployerBenefit)
+def employer_benefit_deleted(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin, EmployerBenefit):
+        refresh_search_documents(
+            JobOffer.objects.filter(employer_id=instance.employer_id).values_list(
+                "pk", flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=JobOffer)
+@receiver(post_save, sender=EmployerLocation)
+@receiver(post_save, sender=EmployerBenefit)
+def employer_related_saved(sender, instance, created, **kwargs):
+    # The employer directory embeds offer counts, locations and benefits.
+    if created or sender is not JobOffer:
+        _touch(Employer.objects.filter(pk=instance.employer_id))
+
+
+@receiver(post_delete, sender=JobOffer)
+@receiver(post_delete, sender=EmployerLocation)
+@receiver(post_delete, sender=EmployerBenefit)
+def employer_related_deleted(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin, sender):
+        _touch(Employer.objects.filter(pk=instance.employer_id))
+
+
+@receiver([post_save, post_delete], sender=JobOffer)
+@receiver([post_save, post_delete], sender=JobOfferSkill)
+@receiver([post_save, post_delete], sender=Employer)
+@receiver([post_save, post_delete], sender=EmployerLocation)
+@receiver([post_save, post_delete], sender=EmployerBenefit)
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Industry)
+def job_listings_changed(sender, **kwargs):
+    invalidate_job_listings()
+
+
+@receiver([post_save, post_delete], sender=Employer)
+def employer_changed(sender, instance, **kwargs):
+    invalidate_employer_overview(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=JobOffer)
+@receiver([post_save, post_delete], sender=EmployerLocation)
+@receiver([post_save, post_delete], sender=EmployerBenefit)
+def employer_overview_changed(sender, instance, **kwargs):
+    invalidate_employer_overview(instance.employer_id)
+
+
+@receiver([post_save, post_delete], sender=JobOfferSkill)
+def job_offer_skill_changed(sender, instance, origin=None, **kwargs):
+    if kwargs["signal"] is post_save or _deleted_directly(origin, sender):
+        for employer_id in JobOffer.objects.filter(pk=instance.offer_id).values_list(
+            "employer_id", flat=True
+        ):
+            invalidate_employer_overview(employer_id)
+
+
+@receiver([post_save, post_delete], sender=Benefit)
+@receiver([post_save, post_delete], sender=City)
+@receiver([post_save, post_delete], sender=Industry)
+@receiver([post_save, post_delete], sender=Skill)
+def overview_lookups_changed(sender, **kwargs):
+    invalidate_employer_overviews()
+
+
+def _is_login_only(update_fields):
+    # Logins touch `last_login` and rehash passwords of outdated hashers.
+    return update_fields is not None and set(update_fields) <= {
+        "last_login",
+        "password",
+    }
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Employers and candidates embed their user, but not its login data.
+    # New users have no profile yet, and deleting a user deletes its
+    # profiles, which invalidate the caches themselves.
+    if (
+        _is_login_only(update_fields)
+        or kwargs.get("created")
+        or kwargs["signal"] is post_delete
+    ):
+        return
+    employer_ids = list(
+        Employer.objects.filter(user=instance).values_list("pk", flat=True)
+    )
+    if employer_ids:
+        # Job listings embed the users of employers only.
+        invalidate_job_listings()
+    for employer_id in employer_ids:
+        invalidate_employer_overview(employer_id)
+    _touch(Employer.objects.filter(user=instance))
+    _touch(Candidate.objects.filter(user=instance))
+    candidate_index.refresh_candidates(
+        Candidate.objects.filter(user=instance).values_list("pk", flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_access_changed(sender, instance, **kwargs):
+    # Tokens of deleted or deactivated users must not authorize requests.
+    if kwargs["signal"] is post_delete or not instance.is_active:
+        invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Employer)
+@receiver(post_delete, sender=Candidate)
+def profile_deleted(sender, instance, **kwargs):
+    # The role claims of the user's tokens still name the profile.
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=CandidateSkill)
+@receiver([post_save, post_delete], sender=CandidateExperience)
+@receiver([post_save, post_delete], sender=CandidateEducation)
+def candidate_profile_changed(sender, instance, origin=None, **kwargs):
+    if kwargs["signal"] is post_save or _deleted_directly(origin, sender):
+        refresh_candidate_profiles([instance.candidate_id])
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, created, **kwargs):
+    if created:
+        refresh_candidate_summaries([instance.pk])
+        candidate_index.refresh_candidates([instance.pk])
+
+
+@receiver(post_delete, sender=Candidate)
+def candidate_deleted(sender, instance, **kwargs):
+    candidate_index.remove_candidates([instance.pk])
@@ -0,0 +1,203 @@
+"""
+Precomputed candidate summaries.
+
+Every `Candidate` owns a `CandidateSummary` row holding the values the
+candidate listings and filters need (total experience, skill ids, latest
+position, employment status and highest degree), so they read a single
+table instead of aggregating the candidate's experience, education and
+skills on every request.
+
+Summaries are refreshed by the signal receivers in `JobApp.signals`
+whenever those rows change. Open-ended jobs are counted up to the day a
+summary was computed, so `manage.py refresh_candidate_summaries` rolls
+the summaries of currently employed candidates forward once a day.
+"""
+
+from datetime import date
+import re
+
+from django.utils import timezone
+
+from JobApp.models import (
+    Candidate,
+    CandidateEducation,
+    CandidateExperience,
+    CandidateSkill,
+    CandidateSummary,
+)
+
+
+DEGREE_LEVELS = (
+    (4, {"phd", "dphil", "doctor", "doctorate", "doctoral", "md"}),
+    (3, {"master", "masters", "msc", "ma", "mba", "meng", "mphil", "mres", "llm"}),
+    (2, {"bachelor", "bachelors", "bsc", "ba", "beng", "bs", "llb", "engineer"}),
+    (1, {"associate", "diploma", "certificate"}),
+)
+
+SUMMARY_FIELDS = [
+    "experience_days",
+    "computed_on",
+    "skill_ids",
+    "latest_position",
+    "is_currently_employed",
+    "highest_degree",
+]
+
+
+def experience_days(intervals, today=None):
+    """
+    Returns the total experience in days of `(date_from, date_to)`
+    intervals, counting open intervals up to today. Overlapping intervals
+    are merged, so concurrent jobs are only counted once.
+    """
+    today = today or date.today()
+    total = 0
+    start = end = None
+    for date_from, date_to in sorted(
+        (date_from, date_to or today) for date_from, date_to in intervals
+    ):
+        if end is not None and date_from <= end:
+            end = max(end, date_to)
+            continue
+        if end is not None:
+            total += max((end - start).days, 0)
+        start, end = date_from, date_to
+    if end is not None:
+        total += max((end - start).days, 0)
+    return total
+
+
+def degree_level(degree):
+    """
+    Returns the rank of a free-text degree: 4 for doctorates, 3 for
+    master's, 2 for bachelor's, 1 for associate degrees and diplomas and
+    0 for anything else.
+    """
+    words = set(re.findall(r"[a-z]+", degree.lower().replace(".", "")))
+    for level, names in DEGREE_LEVELS:
+        if words & names:
+            return level
+    return 0
+
+
+def summarize(experiences, educations, skill_ids, today=None):
+    """
+    Returns the summary fields of a candidate.
+
+    `experiences` are `(id, date_from, date_to, is_current, job_position)`
+    tuples and `educations` are `(id, degree, date_from, date_to,
+    is_current)` tuples. Completed degrees win over ongoing ones of the
+    same level.
+    """
+    today = today or date.today()
+    latest = max(
+        experiences,
+        key=lambda row: (row[3] or row[2] is None, row[2] or today, row[1], row[0]),
+        default=None,
+    )
+    highest = max(
+        educations,
+        key=lambda row: (degree_level(row[1]), not row[4], row[3] or today, row[0]),
+        default=None,
+    )
+    return {
+        "experience_days": experience_days(
+            [(row[1], row[2]) for row in experiences], today
+        ),
+        "computed_on": today,
+        "skill_ids": sorted(set(skill_ids)),
+        "latest_position": latest[4] if latest else "",
+        "is_currently_employed": any(row[3] or row[2] is None for row in experiences),
+        "highest_degree": highest[1] if highest else "",
+    }
+
+
+def refresh_candidate_summaries(candidate_ids, today=None):
+    """
+    Rebuilds the summaries of the given candidates.
+
+    Candidates that no longer exist are skipped; their summaries are
+    removed together with the candidate by the database cascade.
+    """
+    candidate_ids = set(
+        Candidate.objects.filter(pk__in=set(candidate_ids)).values_list("pk", flat=True)
+    )
+    if not candidate_ids:
+        return
+    today = today or date.today()
+
+    experiences = {}
+    for candidate_id, *row in CandidateExperience.objects.filter(
+        candidate_id__in=candidate_ids
+    ).values_list(
+        "candidate_id", "id", "date_from", "date_to", "is_current", "job_position"
+    ):
+        experiences.setdefault(candidate_id, []).append(tuple(row))
+    educations = {}
+    for candidate_id, *row in CandidateEducation.objects.filter(
+        candidate_id__in=candidate_ids
+    ).values_list("candidate_id", "id", "degree", "date_from", "date_to", "is_current"):
+        educations.setdefault(candidate_id, []).append(tuple(row))
+    skills = {}
+    for candidate_id, skill_id in CandidateSkill.objects.filter(
+        candidate_id__in=candidate_ids
+    ).values_list("candidate_id", "skill_id"):
+        skills.setdefault(candidate_id, []).append(skill_id)
+
+    CandidateSummary.objects.bulk_create(
+        [
+            CandidateSummary(
+                candidate_id=candidate_id,
+                **summarize(
+                    experiences.get(candidate_id, []),
+                    educations.get(candidate_id, []),
+                    skills.get(candidate_id, []),
+                    today,
+                ),
+            )
+            for candidate_id in sorted(candidate_ids)
+        ],
+        update_conflicts=True,
+        unique_fields=["candidate"],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def _refresh_in_batches(queryset, batch_size, today):
+    processed = 0
+    last_id = 0
+    while True:
+        candidate_ids = list(
+            queryset.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not candidate_ids:
+            return processed
+        refresh_candidate_summaries(candidate_ids, today)
+        Candidate.objects.filter(pk__in=candidate_ids).update(updated_at=timezone.now())
+        processed += len(candidate_ids)
+        last_id = candidate_ids[-1]
+
+
+def roll_forward_candidate_summaries(today=None, batch_size=500):
+    """
+    Recomputes the summaries of currently employed candidates computed
+    before `today`, and those of candidates without a summary. Returns
+    the number of processed candidates.
+    """
+    today = today or date.today()
+    stale = Candidate.objects.filter(
+        summary__is_currently_employed=True, summary__computed_on__lt=today
+    ) | Candidate.objects.filter(summary__isnull=True)
+    return _refresh_in_batches(stale, batch_size, today)
+
+
+def rebuild_candidate_summaries(today=None, batch_size=500):
+    """
+    Rebuilds the summaries of all candidates in batches. Returns the
+    number of processed candidates.
+    """
+    return _refresh_in_batches(
+        Candidate.objects.all(), batch_size, today or date.today()
+    )
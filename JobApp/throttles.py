@@ -0,0 +1,54 @@
+"""
+Throttles protecting the endpoints that hash passwords.
+
+Login and registration attempts are limited per client IP and per email
+address. `SimpleRateThrottle` keeps each key's sliding window of attempt
+timestamps in the default cache, and throttles are checked before the
+view handler runs, so a rejected attempt returns 429 without hashing.
+"""
+
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class IPRateThrottle(SimpleRateThrottle):
+    """
+    Limits attempts per client IP.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class EmailRateThrottle(SimpleRateThrottle):
+    """
+    Limits attempts per (case insensitive) email address of the request
+    body. Requests without an email are not counted.
+    """
+
+    def get_cache_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        digest = hashlib.sha1(email.strip().lower().encode()).hexdigest()
+        return self.cache_format % {"scope": self.scope, "ident": digest}
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailRateThrottle):
+    scope = "login_email"
+
+
+class RegistrationIPThrottle(IPRateThrottle):
+    scope = "registration_ip"
+
+
+class RegistrationEmailThrottle(EmailRateThrottle):
+    scope = "registration_email"
@@ -0,0 +1,59 @@
+"""
+JWT issuance for authentication events.
+
+Logins and registrations mint exactly one refresh/access pair through
+`issue_tokens`. The pair is remembered on the user instance, so every
+serializer rendering tokens for the same event (e.g. the login response
+and the nested `UserSerializerToken`) shares it instead of signing its
+own.
+
+Both tokens carry the user's role and employer/candidate ids as claims,
+which `JobApp.authentication.ClaimsJWTAuthentication` authorizes requests
+from without loading the user, as long as the user's token generation
+claim is current.
+"""
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from JobApp.caching import get_token_generation
+
+
+ROLE_CLAIM = "role"
+EMPLOYER_ID_CLAIM = "employer_id"
+CANDIDATE_ID_CLAIM = "candidate_id"
+GENERATION_CLAIM = "token_generation"
+
+
+def get_role_claims(user):
+    """
+    Returns the role, employer id and candidate id claims of `user`.
+    """
+    employer_id = user.employer_id
+    candidate_id = user.candidate_id
+    if employer_id is not None:
+        role = "employer"
+    elif candidate_id is not None:
+        role = "candidate"
+    else:
+        role = "user"
+    return {
+        ROLE_CLAIM: role,
+        EMPLOYER_ID_CLAIM: employer_id,
+        CANDIDATE_ID_CLAIM: candidate_id,
+    }
+
+
+def issue_tokens(user):
+    """
+    Returns the `{"refresh": ..., "access": ...}` pair issued to `user`,
+    minting it on first use.
+    """
+    tokens = getattr(user, "_issued_tokens", None)
+    if tokens is None:
+        refresh = RefreshToken.for_user(user)
+        for claim, value in get_role_claims(user).items():
+            refresh[claim] = value
+        refresh[GENERATION_CLAIM] = get_token_generation(user.pk)
+        tokens = {"refresh": str(refresh), "access": str(refresh.access_token)}
+        user._issued_tokens = tokens
+    return tokens
@@ -6,9 +6,13 @@ from django.urls import path
 
 from JobApp.views.candidate_views import (
     CandidateDetailView,
+    CandidateDossierListView,
+    CandidateDossierView,
+    CandidateEducationBatchProfileView,
     CandidateEducationDetailView,
     CandidateEducationListProfileView,
     CandidateEducationListView,
+    CandidateExperienceBatchProfileView,
     CandidateExperienceDetailView,
     CandidateExperienceListProfileView,
     CandidateExperienceListView,
@@ -22,6 +26,8 @@ from JobApp.views.candidate_views import (
 
 
 urlpatterns = [
+    path("<int:pk>/dossier/", CandidateDossierView.as_view(), name="candidate_dossier"),
+    path("dossier/", CandidateDossierListView.as_view(), name="candidate_dossiers"),
     path("<int:pk>/skills/", CandidateSkillListView.as_view(), name="candidate_skills"),
     path(
         "<int:pk>/experience/",
@@ -47,6 +53,11 @@ urlpatterns = [
         CandidateEducationDetailView.as_view(),
         name="education-detail",
     ),
+    path(
+        "profile/education/batch/",
+        CandidateEducationBatchProfileView.as_view(),
+        name="education-batch",
+    ),
     path(
         "profile/education/",
         CandidateEducationListProfileView.as_view(),
@@ -57,6 +68,11 @@ urlpatterns = [
         CandidateExperienceDetailView.as_view(),
         name="experience-detail",
     ),
+    path(
+        "profile/experience/batch/",
+        CandidateExperienceBatchProfileView.as_view(),
+        name="experience-batch",
+    ),
     path(
         "profile/experience/",
         CandidateExperienceListProfileView.as_view(),
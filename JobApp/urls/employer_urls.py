@@ -14,6 +14,7 @@ from JobApp.views.employer_views import (
     EmployerLocationDetailView,
     EmployerLocationListProfileView,
     EmployerLocationListView,
+    EmployerOverviewView,
     EmployerProfileView,
     RegisterEmployerView,
 )
@@ -49,6 +50,11 @@ urlpatterns = [
         name="employer-benefits",
     ),
     path("<int:pk>/locations/", EmployerLocationListView.as_view(), name="locations"),
+    path(
+        "<int:pk>/overview/",
+        EmployerOverviewView.as_view(),
+        name="employer-overview",
+    ),
     path("<int:pk>/", EmployerDetailView.as_view(), name="employer"),
     path("", EmployerListView.as_view(), name="employers"),
 ]
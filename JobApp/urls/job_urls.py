@@ -11,9 +11,12 @@ from JobApp.views.job_views import (
     IndustryListView,
     JobOfferApplicantsListView,
     JobOfferDetailView,
+    JobOfferFacetsView,
     JobOfferListProfileView,
     JobOfferListView,
+    JobOfferMatchesListView,
     JobOfferProfileDetailView,
+    RecommendedJobOfferListView,
     RemotenessLevelListView,
     SeniorityListView,
     SkillListView,
@@ -23,6 +26,12 @@ from JobApp.views.job_views import (
 urlpatterns = [
     path("skills/", SkillListView.as_view(), name="skill-list"),
     path("industries/", IndustryListView.as_view(), name="industry-list"),
+    path("facets/", JobOfferFacetsView.as_view(), name="job-offer-facets"),
+    path(
+        "recommended/",
+        RecommendedJobOfferListView.as_view(),
+        name="job-offer-recommended",
+    ),
     path("seniority/", SeniorityListView.as_view(), name="seniority-list"),
     path("contract-types/", ContractTypeListView.as_view(), name="contract-type-list"),
     path(
@@ -38,6 +47,11 @@ urlpatterns = [
         JobOfferApplicantsListView.as_view(),
         name="job-offer-applicants",
     ),
+    path(
+        "profile/<int:pk>/matches/",
+        JobOfferMatchesListView.as_view(),
+        name="job-offer-matches",
+    ),
     path(
         "profile/<int:pk>/",
         JobOfferProfileDetailView.as_view(),
@@ -1,11 +1,18 @@
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, status
+from rest_framework import filters, generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from JobApp.filters import CandidateFilter
-from JobApp.mixins import CandidateWithExperienceMixin
+from JobApp.mixins import (
+    AttemptMetricsMixin,
+    CandidateDossierMixin,
+    CandidateWithExperienceMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    ProfileOwnerMixin,
+)
 from JobApp.models import (
     Candidate,
     CandidateEducation,
@@ -15,6 +22,7 @@ from JobApp.models import (
 from JobApp.pagination import OptionalPagination
 from JobApp.permissions import IsEmployer
 from JobApp.serializers import (
+    CandidateDossierSerializer,
     CandidateEducationCreateSerializer,
     CandidateEducationSerializer,
     CandidateExperienceCreateSerializer,
@@ -24,12 +32,18 @@ from JobApp.serializers import (
     CandidateSerializerWithTotalExp,
     CandidateSkillCreateSerializer,
     CandidateSkillSerializer,
+    CandidateSkillSetSerializer,
 )
+from JobApp.throttles import RegistrationEmailThrottle, RegistrationIPThrottle
 from docs.candidate_docs import (
     candidate_detail_docs,
+    candidate_dossier_docs,
+    candidate_dossier_list_docs,
+    candidate_education_batch_docs,
     candidate_education_detail_docs,
     candidate_education_list_docs,
     candidate_education_profile_docs,
+    candidate_experience_batch_docs,
     candidate_experience_detail_docs,
     candidate_experience_list_docs,
     candidate_experience_profile_docs,
@@ -38,12 +52,18 @@ from docs.candidate_docs import (
     candidate_skill_detail_docs,
     candidate_skill_list_docs,
     candidate_skill_profile_docs,
+    candidate_skill_replace_docs,
     register_candidate_docs,
 )
 
 
 @candidate_list_docs
-class CandidateListView(CandidateWithExperienceMixin, generics.ListAPIView):
+class CandidateListView(
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    CandidateWithExperienceMixin,
+    generics.ListAPIView,
+):
     """
     List all candidates with their total experience.
     """
@@ -51,6 +71,7 @@ class CandidateListView(CandidateWithExperienceMixin, generics.ListAPIView):
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializerWithTotalExp
     permission_classes = [IsEmployer]
+    cache_control = {"private": True, "no_cache": True}
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -58,13 +79,19 @@ class CandidateListView(CandidateWithExperienceMixin, generics.ListAPIView):
     ]
     filterset_class = CandidateFilter
     pagination_class = OptionalPagination
+    cursor_ordering = ("id",)
     search_fields = ["user__first_name", "user__last_name", "user__email"]
     ordering_fields = ["id", "user__city__name", "user__city__country__name"]
     ordering = ["id"]
 
 
 @candidate_detail_docs
-class CandidateDetailView(CandidateWithExperienceMixin, generics.RetrieveAPIView):
+class CandidateDetailView(
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    CandidateWithExperienceMixin,
+    generics.RetrieveAPIView,
+):
     """
     Retrieve a candidate's details along with their total experience.
     """
@@ -72,10 +99,109 @@ class CandidateDetailView(CandidateWithExperienceMixin, generics.RetrieveAPIView
     queryset = Candidate.objects.all()
     serializer_class = CandidateSerializerWithTotalExp
     permission_classes = [IsEmployer]
+    cache_control = {"private": True, "no_cache": True}
+
+
+@candidate_dossier_docs
+class CandidateDossierView(
+    ConditionalGetMixin,
+    CandidateDossierMixin,
+    generics.RetrieveAPIView,
+):
+    """
+    Retrieve a candidate's profile, skills, experience and education.
+    """
+
+    serializer_class = CandidateDossierSerializer
+    permission_classes = [IsEmployer]
+    cache_control = {"private": True, "no_cache": True}
+
+
+@candidate_dossier_list_docs
+class CandidateDossierListView(
+    ConditionalGetMixin,
+    CandidateDossierMixin,
+    generics.ListAPIView,
+):
+    """
+    List the dossiers of the candidates given in `ids`, in the given order.
+    """
+
+    serializer_class = CandidateDossierSerializer
+    permission_classes = [IsEmployer]
+    cache_control = {"private": True, "no_cache": True}
+    pagination_class = None
+    max_ids = 50
+
+    def get_ids(self):
+        """
+        Returns the candidate ids of the `ids` query parameter, without duplicates.
+        """
+        try:
+            ids = [
+                int(value)
+                for value in self.request.query_params.get("ids", "").split(",")
+                if value.strip()
+            ]
+        except ValueError:
+            raise serializers.ValidationError(
+                {"ids": ["Enter a comma separated list of candidate ids."]}
+            )
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise serializers.ValidationError({"ids": ["This parameter is required."]})
+        if len(ids) > self.max_ids:
+            raise serializers.ValidationError(
+                {"ids": [f"Request at most {self.max_ids} candidates."]}
+            )
+        return ids
+
+    def filter_queryset(self, queryset):
+        return queryset.filter(pk__in=self.get_ids())
+
+    def list(self, request, *args, **kwargs):
+        candidates = self.filter_queryset(self.get_queryset()).in_bulk()
+        results = [candidates[pk] for pk in self.get_ids() if pk in candidates]
+        return Response(self.get_serializer(results, many=True).data)
+
+
+class CandidateRecordBatchView(ProfileOwnerMixin, generics.CreateAPIView):
+    """
+    Base view importing a batch of profile records of the authenticated candidate.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.save(candidate_id=self.get_candidate_id())
+
+
+@candidate_experience_batch_docs
+class CandidateExperienceBatchProfileView(CandidateRecordBatchView):
+    """
+    Import a batch of experience records of the authenticated candidate.
+    """
+
+    queryset = CandidateExperience.objects.none()
+    serializer_class = CandidateExperienceCreateSerializer
+
+
+@candidate_education_batch_docs
+class CandidateEducationBatchProfileView(CandidateRecordBatchView):
+    """
+    Import a batch of education records of the authenticated candidate.
+    """
+
+    queryset = CandidateEducation.objects.none()
+    serializer_class = CandidateEducationCreateSerializer
 
 
 @candidate_skill_list_docs
-class CandidateSkillListView(generics.ListAPIView):
+class CandidateSkillListView(EagerLoadingMixin, generics.ListAPIView):
     """
     List all skills of a candidate.
     """
@@ -90,7 +216,7 @@ class CandidateSkillListView(generics.ListAPIView):
 
 
 @candidate_experience_list_docs
-class CandidateExperienceListView(generics.ListAPIView):
+class CandidateExperienceListView(EagerLoadingMixin, generics.ListAPIView):
     """
     List all experiences of a candidate.
     """
@@ -107,7 +233,7 @@ class CandidateExperienceListView(generics.ListAPIView):
 
 
 @candidate_education_list_docs
-class CandidateEducationListView(generics.ListAPIView):
+class CandidateEducationListView(EagerLoadingMixin, generics.ListAPIView):
     """
     List all education records of a candidate.
     """
@@ -124,12 +250,14 @@ class CandidateEducationListView(generics.ListAPIView):
 
 
 @register_candidate_docs
-class RegisterCandidateView(generics.CreateAPIView):
+class RegisterCandidateView(AttemptMetricsMixin, generics.CreateAPIView):
     """
     Register a new candidate.
     """
 
     serializer_class = CandidateRegistrationSerializer
+    throttle_classes = [RegistrationIPThrottle, RegistrationEmailThrottle]
+    attempt_metric = "registration_attempts"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -144,7 +272,9 @@ class RegisterCandidateView(generics.CreateAPIView):
 
 
 @candidate_profile_docs
-class CandidateProfileView(generics.RetrieveUpdateAPIView):
+class CandidateProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.RetrieveUpdateAPIView
+):
     """
     Retrieve and update the profile of the authenticated candidate.
     """
@@ -153,13 +283,15 @@ class CandidateProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = CandidateSerializer
 
     def get_object(self):
-        return get_object_or_404(Candidate, user=self.request.user)
+        return self.eager_load(self.get_candidate())
 
 
 @candidate_skill_profile_docs
-class CandidateSkillListProfileView(generics.ListCreateAPIView):
+class CandidateSkillListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
-    List all skills of the authenticated candidate.
+    List, add or replace the skills of the authenticated candidate.
     """
 
     permission_classes = [IsAuthenticated]
@@ -171,16 +303,32 @@ class CandidateSkillListProfileView(generics.ListCreateAPIView):
         return CandidateSkillSerializer
 
     def get_queryset(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        return CandidateSkill.objects.filter(candidate=candidate).order_by("id")
+        return CandidateSkill.objects.filter(
+            candidate_id=self.get_candidate_id()
+        ).order_by("id")
 
     def perform_create(self, serializer):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        serializer.save(candidate=candidate)
+        serializer.save(candidate_id=self.get_candidate_id())
+
+    @candidate_skill_replace_docs
+    def put(self, request, *args, **kwargs):
+        """
+        Replace the authenticated candidate's skills with the given skill ids.
+        """
+        serializer = CandidateSkillSetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        candidate_id = self.get_candidate_id()
+        serializer.save(candidate_id=candidate_id)
+        skills = self.filter_queryset(
+            CandidateSkill.objects.filter(candidate_id=candidate_id).order_by("id")
+        )
+        return Response(CandidateSkillSerializer(skills, many=True).data)
 
 
 @candidate_education_profile_docs
-class CandidateEducationListProfileView(generics.ListCreateAPIView):
+class CandidateEducationListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
     List all education records of the authenticated candidate.
     """
@@ -194,18 +342,18 @@ class CandidateEducationListProfileView(generics.ListCreateAPIView):
         return CandidateEducationSerializer
 
     def get_queryset(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        return CandidateEducation.objects.filter(candidate=candidate).order_by(
-            "-is_current", "-date_to"
-        )
+        return CandidateEducation.objects.filter(
+            candidate_id=self.get_candidate_id()
+        ).order_by("-is_current", "-date_to")
 
     def perform_create(self, serializer):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        serializer.save(candidate=candidate)
+        serializer.save(candidate_id=self.get_candidate_id())
 
 
 @candidate_experience_profile_docs
-class CandidateExperienceListProfileView(generics.ListCreateAPIView):
+class CandidateExperienceListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
     List all experience records of the authenticated candidate.
     """
@@ -219,18 +367,18 @@ class CandidateExperienceListProfileView(generics.ListCreateAPIView):
         return CandidateExperienceSerializer
 
     def get_queryset(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        return CandidateExperience.objects.filter(candidate=candidate).order_by(
-            "-is_current", "-date_to"
-        )
+        return CandidateExperience.objects.filter(
+            candidate_id=self.get_candidate_id()
+        ).order_by("-is_current", "-date_to")
 
     def perform_create(self, serializer):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
-        serializer.save(candidate=candidate)
+        serializer.save(candidate_id=self.get_candidate_id())
 
 
 @candidate_experience_detail_docs
-class CandidateExperienceDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CandidateExperienceDetailView(
+    ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific experience record of the authenticated candidate.
     """
@@ -239,15 +387,16 @@ class CandidateExperienceDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
         experience_id = self.kwargs["pk"]
         return get_object_or_404(
-            CandidateExperience, pk=experience_id, candidate=candidate
+            CandidateExperience, pk=experience_id, candidate_id=self.get_candidate_id()
         )
 
 
 @candidate_education_detail_docs
-class CandidateEducationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CandidateEducationDetailView(
+    ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific education record of the authenticated candidate.
     """
@@ -256,15 +405,16 @@ class CandidateEducationDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
         education_id = self.kwargs["pk"]
         return get_object_or_404(
-            CandidateEducation, pk=education_id, candidate=candidate
+            CandidateEducation, pk=education_id, candidate_id=self.get_candidate_id()
         )
 
 
 @candidate_skill_detail_docs
-class CandidateSkillDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CandidateSkillDetailView(
+    ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific skill record of the authenticated candidate.
     """
@@ -273,6 +423,7 @@ class CandidateSkillDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        candidate = get_object_or_404(Candidate, user=self.request.user)
         skill_id = self.kwargs["pk"]
-        return get_object_or_404(CandidateSkill, pk=skill_id, candidate=candidate)
+        return get_object_or_404(
+            CandidateSkill, pk=skill_id, candidate_id=self.get_candidate_id()
+        )
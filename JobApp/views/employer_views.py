@@ -1,22 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
-from rest_framework import filters, generics, status
+from rest_framework import filters, generics, serializers, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from JobApp import metrics
+from JobApp.caching import CACHE_HEADER, get_employer_overview_key
 from JobApp.filters import EmployerFilter
-from JobApp.models import Benefit, Employer, EmployerBenefit, EmployerLocation
+from JobApp.mixins import (
+    AttemptMetricsMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    LimitMixin,
+    ProfileOwnerMixin,
+)
+from JobApp.models import (
+    Benefit,
+    Employer,
+    EmployerBenefit,
+    EmployerLocation,
+    JobOffer,
+)
 from JobApp.pagination import OptionalPagination
 from JobApp.serializers import (
     BenefitSerializer,
     EmployerBenefitCreateSerializer,
     EmployerBenefitSerializer,
+    EmployerDirectorySerializer,
     EmployerLocationCreateSerializer,
     EmployerLocationSerializer,
+    EmployerOverviewSerializer,
     EmployerRegistrationSerializer,
     EmployerSerializer,
+    get_employer_directory_serializer,
 )
+from JobApp.throttles import RegistrationEmailThrottle, RegistrationIPThrottle
 from docs.employer_docs import (
     benefit_list_docs,
     employer_benefit_detail_docs,
@@ -27,13 +49,14 @@ from docs.employer_docs import (
     employer_location_detail_docs,
     employer_location_list_docs,
     employer_location_list_profile_docs,
+    employer_overview_docs,
     employer_profile_docs,
     register_employer_docs,
 )
 
 
 @benefit_list_docs
-class BenefitListView(generics.ListAPIView):
+class BenefitListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of all benefits.
     """
@@ -41,6 +64,7 @@ class BenefitListView(generics.ListAPIView):
     queryset = Benefit.objects.all()
     serializer_class = BenefitSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 3600}
     pagination_class = OptionalPagination
     filter_backends = [
         filters.SearchFilter,
@@ -51,28 +75,67 @@ class BenefitListView(generics.ListAPIView):
 
 
 @employer_list_docs
-class EmployerListView(generics.ListAPIView):
+class EmployerListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of employers with optional filtering, searching, and ordering.
     """
 
-    queryset = Employer.objects.all()
     serializer_class = EmployerSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 300}
     pagination_class = OptionalPagination
+    cursor_ordering = ("id",)
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
     ordering = ["id"]
-    ordering_fields = ["id", "company_name", "industry__name"]
+    ordering_fields = ["id", "company_name", "industry__name", "offer_count"]
     search_fields = ["company_name", "description"]
     filterset_class = EmployerFilter
 
+    def get_include(self):
+        """
+        Returns the optional fields listed in the `include` query parameter.
+        """
+        include = {
+            value.strip()
+            for value in self.request.query_params.get("include", "").split(",")
+            if value.strip()
+        }
+        unknown = include - set(EmployerDirectorySerializer.INCLUDES)
+        if unknown:
+            raise serializers.ValidationError(
+                {
+                    "include": [
+                        "Choose from: "
+                        + ", ".join(EmployerDirectorySerializer.INCLUDES)
+                        + "."
+                    ]
+                }
+            )
+        return frozenset(include)
+
+    def get_serializer_class(self):
+        return get_employer_directory_serializer(self.get_include())
+
+    def get_queryset(self):
+        """
+        Returns the employers, annotated with their number of job offers
+        when it is included or used for ordering.
+        """
+        queryset = Employer.objects.all()
+        ordering = self.request.query_params.get("ordering", "")
+        if "offer_count" in self.get_include() or "offer_count" in ordering:
+            queryset = queryset.annotate(offer_count=Count("joboffer"))
+        return queryset
+
 
 @employer_detail_docs
-class EmployerDetailView(generics.RetrieveAPIView):
+class EmployerDetailView(
+    ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView
+):
     """
     Retrieve an employer's details.
     """
@@ -80,10 +143,61 @@ class EmployerDetailView(generics.RetrieveAPIView):
     queryset = Employer.objects.all()
     serializer_class = EmployerSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 300}
+
+
+@employer_overview_docs
+class EmployerOverviewView(LimitMixin, generics.RetrieveAPIView):
+    """
+    Retrieve an employer with its locations, benefits and latest job
+    offers, cached per employer until any of them changes.
+    """
+
+    queryset = Employer.objects.select_related("user", "industry").prefetch_related(
+        Prefetch(
+            "employerlocation_set",
+            queryset=EmployerLocation.objects.select_related("city").order_by(
+                "city__name"
+            ),
+        ),
+        Prefetch(
+            "employerbenefit_set",
+            queryset=EmployerBenefit.objects.select_related("benefit").order_by(
+                "benefit__name"
+            ),
+        ),
+    )
+    serializer_class = EmployerOverviewSerializer
+    permission_classes = [AllowAny]
+    default_limit = 5
+    max_limit = 20
+
+    def get_object(self):
+        employer = super().get_object()
+        employer.latest_offers = list(
+            JobOffer.objects.filter(employer=employer)
+            .select_related("location")
+            .prefetch_related("jobofferskill_set__skill")
+            .order_by("-created_at", "-id")[: self.get_limit()]
+        )
+        return employer
+
+    def retrieve(self, request, *args, **kwargs):
+        key = get_employer_overview_key(self.kwargs["pk"], self.get_limit())
+        data = cache.get(key)
+        if data is not None:
+            metrics.increment("employer_overview_cache.hit")
+            return Response(data, headers={CACHE_HEADER: "HIT"})
+
+        metrics.increment("employer_overview_cache.miss")
+        response = super().retrieve(request, *args, **kwargs)
+        cache.set(key, response.data, getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300))
+        response[CACHE_HEADER] = "MISS"
+        return response
 
 
 @employer_profile_docs
-class EmployerProfileView(generics.RetrieveUpdateDestroyAPIView):
+class EmployerProfileView(ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve an employer's profile details.
     """
@@ -93,16 +207,18 @@ class EmployerProfileView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return get_object_or_404(Employer, user=self.request.user)
+        return self.get_employer()
 
 
 @register_employer_docs
-class RegisterEmployerView(generics.CreateAPIView):
+class RegisterEmployerView(AttemptMetricsMixin, generics.CreateAPIView):
     """
     Register a new employer.
     """
 
     serializer_class = EmployerRegistrationSerializer
+    throttle_classes = [RegistrationIPThrottle, RegistrationEmailThrottle]
+    attempt_metric = "registration_attempts"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -117,7 +233,7 @@ class RegisterEmployerView(generics.CreateAPIView):
 
 
 @employer_location_list_docs
-class EmployerLocationListView(generics.ListAPIView):
+class EmployerLocationListView(EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of locations for a specific employer.
     """
@@ -132,7 +248,9 @@ class EmployerLocationListView(generics.ListAPIView):
 
 
 @employer_location_detail_docs
-class EmployerLocationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmployerLocationDetailView(
+    ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific location of the authenticated employer.
     """
@@ -141,13 +259,16 @@ class EmployerLocationDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
         location_id = self.kwargs["pk"]
-        return get_object_or_404(EmployerLocation, pk=location_id, employer=employer)
+        return get_object_or_404(
+            EmployerLocation, pk=location_id, employer_id=self.get_employer_id()
+        )
 
 
 @employer_location_list_profile_docs
-class EmployerLocationListProfileView(generics.ListCreateAPIView):
+class EmployerLocationListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
     Retrieve a list of locations for the authenticated employer.
     """
@@ -161,16 +282,18 @@ class EmployerLocationListProfileView(generics.ListCreateAPIView):
         return EmployerLocationSerializer
 
     def get_queryset(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        return EmployerLocation.objects.filter(employer=employer).order_by("city__name")
+        return EmployerLocation.objects.filter(
+            employer_id=self.get_employer_id()
+        ).order_by("city__name")
 
     def perform_create(self, serializer):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        serializer.save(employer=employer)
+        serializer.save(employer_id=self.get_employer_id())
 
 
 @employer_benefit_list_profile_docs
-class EmployerBenefitListProfileView(generics.ListCreateAPIView):
+class EmployerBenefitListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
     Retrieve a list of benefits for the authenticated employer.
     """
@@ -184,18 +307,18 @@ class EmployerBenefitListProfileView(generics.ListCreateAPIView):
         return EmployerBenefitSerializer
 
     def get_queryset(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        return EmployerBenefit.objects.filter(employer=employer).order_by(
-            "benefit__name"
-        )
+        return EmployerBenefit.objects.filter(
+            employer_id=self.get_employer_id()
+        ).order_by("benefit__name")
 
     def perform_create(self, serializer):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        serializer.save(employer=employer)
+        serializer.save(employer_id=self.get_employer_id())
 
 
 @employer_benefit_detail_docs
-class EmployerBenefitDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmployerBenefitDetailView(
+    ProfileOwnerMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific benefit of the authenticated employer.
     """
@@ -204,13 +327,14 @@ class EmployerBenefitDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
         benefit_id = self.kwargs["pk"]
-        return get_object_or_404(EmployerBenefit, pk=benefit_id, employer=employer)
+        return get_object_or_404(
+            EmployerBenefit, pk=benefit_id, employer_id=self.get_employer_id()
+        )
 
 
 @employer_list_benefit_docs
-class EmployerListBenefitView(generics.ListAPIView):
+class EmployerListBenefitView(EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of benefits for a specific employer.
     """
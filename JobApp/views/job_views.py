@@ -1,20 +1,38 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, status
+from rest_framework import filters, generics, serializers, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from JobApp.caching import ResponseCacheMixin
+from JobApp.facets import job_offer_facets
 from JobApp.filters import JobOfferFilter
-from JobApp.models import Candidate, Employer, Industry, JobOffer, OfferResponse, Skill
+from JobApp.matching import match_candidates
+from JobApp.mixins import (
+    CandidateWithExperienceMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    LimitMixin,
+    ProfileOwnerMixin,
+)
+from JobApp.models import Employer, Industry, JobOffer, OfferResponse, Skill
 from JobApp.pagination import OptionalPagination
 from JobApp.permissions import IsCandidate, IsEmployer
+from JobApp.recommendations import recommend_offers
+from JobApp.search import JobOfferSearchFilter
 from JobApp.serializers import (
+    CandidateMatchSerializer,
     ChoiceSerializer,
     IndustrySerializer,
     JobOfferCreateSerializer,
+    JobOfferFacetsSerializer,
     JobOfferSerializer,
     JobOfferUpdateSerializer,
+    OfferResponseMinimalSerializer,
     OfferResponseSerializer,
+    RecommendedJobOfferSerializer,
     SkillSerializer,
 )
 from docs.job_docs import (
@@ -24,9 +42,12 @@ from docs.job_docs import (
     industry_list_docs,
     job_offer_applicants_docs,
     job_offer_detail_docs,
+    job_offer_facets_docs,
     job_offer_list_docs,
     job_offer_list_profile_docs,
+    job_offer_matches_docs,
     job_offer_profile_detail_docs,
+    recommended_job_offers_docs,
     remoteness_level_list_docs,
     seniority_list_docs,
     skill_list_docs,
@@ -34,7 +55,7 @@ from docs.job_docs import (
 
 
 @skill_list_docs
-class SkillListView(generics.ListAPIView):
+class SkillListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of all skills.
     """
@@ -42,6 +63,7 @@ class SkillListView(generics.ListAPIView):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 3600}
     filter_backends = [
         filters.SearchFilter,
         filters.OrderingFilter,
@@ -52,7 +74,7 @@ class SkillListView(generics.ListAPIView):
 
 
 @industry_list_docs
-class IndustryListView(generics.ListAPIView):
+class IndustryListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of all industries.
     """
@@ -60,6 +82,7 @@ class IndustryListView(generics.ListAPIView):
     queryset = Industry.objects.all()
     serializer_class = IndustrySerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 3600}
     filter_backends = [
         filters.SearchFilter,
         filters.OrderingFilter,
@@ -70,7 +93,9 @@ class IndustryListView(generics.ListAPIView):
 
 
 @job_offer_list_docs
-class JobOfferListView(generics.ListAPIView):
+class JobOfferListView(
+    ResponseCacheMixin, ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView
+):
     """
     Retrieve a list of job offers with optional filtering, searching, and ordering.
     """
@@ -78,25 +103,32 @@ class JobOfferListView(generics.ListAPIView):
     queryset = JobOffer.objects.all()
     serializer_class = JobOfferSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 60}
     pagination_class = OptionalPagination
+    cursor_ordering = ("-created_at", "-id")
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
         filters.OrderingFilter,
+        JobOfferSearchFilter,
     ]
     filterset_class = JobOfferFilter
-    search_fields = [
-        "position",
-        "description",
-        "skills__name",
-        "employer__company_name",
-        "location__city__name",
-        "employer__industry__name",
-    ]
     ordering = ["-created_at"]
     ordering_fields = ["created_at", "wage"]
 
 
+@job_offer_facets_docs
+class JobOfferFacetsView(generics.GenericAPIView):
+    """
+    Retrieve facet counts of job offers for the current filter state.
+    """
+
+    serializer_class = JobOfferFacetsSerializer
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return Response(self.get_serializer(job_offer_facets(request)).data)
+
+
 @seniority_list_docs
 class SeniorityListView(generics.ListAPIView):
     """
@@ -143,7 +175,9 @@ class RemotenessLevelListView(generics.ListAPIView):
 
 
 @job_offer_detail_docs
-class JobOfferDetailView(generics.RetrieveAPIView):
+class JobOfferDetailView(
+    ConditionalGetMixin, EagerLoadingMixin, generics.RetrieveAPIView
+):
     """
     Retrieve a job offer's details.
     """
@@ -151,10 +185,13 @@ class JobOfferDetailView(generics.RetrieveAPIView):
     queryset = JobOffer.objects.all()
     serializer_class = JobOfferSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 60}
 
 
 @job_offer_list_profile_docs
-class JobOfferListProfileView(generics.ListCreateAPIView):
+class JobOfferListProfileView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     """
     Retrieve a list of job offers for the authenticated employer.
     """
@@ -176,16 +213,18 @@ class JobOfferListProfileView(generics.ListCreateAPIView):
         return JobOfferSerializer
 
     def get_queryset(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        return JobOffer.objects.filter(employer=employer).order_by("-created_at")
+        return JobOffer.objects.filter(employer_id=self.get_employer_id()).order_by(
+            "-created_at"
+        )
 
     def perform_create(self, serializer):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        serializer.save(employer=employer)
+        serializer.save(employer_id=self.get_employer_id())
 
 
 @job_offer_profile_detail_docs
-class JobOfferProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
+class JobOfferProfileDetailView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieve, update, or delete a specific job offer of the authenticated employer.
     """
@@ -198,19 +237,22 @@ class JobOfferProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
         return JobOfferSerializer
 
     def get_queryset(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
-        return JobOffer.objects.filter(employer=employer)
+        return JobOffer.objects.filter(employer_id=self.get_employer_id())
 
 
 @employer_job_offer_list_docs
-class EmployerJobOfferListView(generics.ListAPIView):
+class EmployerJobOfferListView(
+    ResponseCacheMixin, ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView
+):
     """
     Retrieve a list of job offers for a specific employer.
     """
 
     serializer_class = JobOfferSerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 60}
     pagination_class = OptionalPagination
+    cursor_ordering = ("-created_at", "-id")
     filter_backends = [
         filters.SearchFilter,
         filters.OrderingFilter,
@@ -220,45 +262,80 @@ class EmployerJobOfferListView(generics.ListAPIView):
     ]
     ordering = ["-created_at"]
 
+    @cached_property
+    def employer(self):
+        return get_object_or_404(Employer, pk=self.kwargs["pk"])
+
     def get_queryset(self):
-        employer = get_object_or_404(Employer, pk=self.kwargs["pk"])
-        return JobOffer.objects.filter(employer=employer)
+        return JobOffer.objects.filter(employer=self.employer)
 
 
 @apply_to_job_offer_docs
-class ApplyToJobOfferView(generics.CreateAPIView):
+class ApplyToJobOfferView(ProfileOwnerMixin, EagerLoadingMixin, generics.CreateAPIView):
     """
     Create an OfferResponse (apply) for the authenticated candidate.
+
+    The response is inserted with a single statement that ignores
+    conflicts, so a duplicate application is answered with 400 even when
+    two requests race. `?response=minimal` skips rendering the offer and
+    candidate.
     """
 
     permission_classes = [IsAuthenticated, IsCandidate]
-    serializer_class = OfferResponseSerializer
+    queryset = OfferResponse.objects.all()
+    RESPONSE_MODES = {
+        "full": OfferResponseSerializer,
+        "minimal": OfferResponseMinimalSerializer,
+    }
+
+    def get_response_mode(self):
+        """
+        Returns the value of the `response` query parameter.
+        """
+        mode = self.request.query_params.get("response", "full")
+        if mode not in self.RESPONSE_MODES:
+            raise serializers.ValidationError(
+                {"response": ["Choose from: " + ", ".join(self.RESPONSE_MODES) + "."]}
+            )
+        return mode
 
-    def create(self, request, *args, **kwargs):
-        job_offer = get_object_or_404(JobOffer, pk=self.kwargs["pk"])
-        candidate = get_object_or_404(Candidate, user=request.user)
+    def get_serializer_class(self):
+        return self.RESPONSE_MODES[self.get_response_mode()]
 
-        if OfferResponse.objects.filter(offer=job_offer, candidate=candidate).exists():
-            return Response(
-                {"detail": "You have already applied to this job offer."},
-                status=status.HTTP_400_BAD_REQUEST,
+    def create(self, request, *args, **kwargs):
+        offer_id = self.kwargs["pk"]
+        candidate_id = self.get_candidate_id()
+        serializer_class = self.get_serializer_class()
+
+        offer_response_id = OfferResponse.objects.apply(offer_id, candidate_id)
+        if offer_response_id is None:
+            if OfferResponse.objects.filter(
+                offer_id=offer_id, candidate_id=candidate_id
+            ).exists():
+                return Response(
+                    {"detail": "You have already applied to this job offer."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            raise Http404("No JobOffer matches the given query.")
+
+        if serializer_class is OfferResponseMinimalSerializer:
+            offer_response = OfferResponse(
+                id=offer_response_id, offer_id=offer_id, candidate_id=candidate_id
+            )
+        else:
+            offer_response = self.filter_queryset(self.get_queryset()).get(
+                pk=offer_response_id
             )
-
-        offer_response = OfferResponse.objects.create(
-            offer=job_offer,
-            candidate=candidate,
-        )
         return Response(
-            OfferResponseSerializer(
-                offer_response,
-                context={"request": request},
-            ).data,
+            self.get_serializer(offer_response).data,
             status=status.HTTP_201_CREATED,
         )
 
 
 @job_offer_applicants_docs
-class JobOfferApplicantsListView(generics.ListAPIView):
+class JobOfferApplicantsListView(
+    ProfileOwnerMixin, EagerLoadingMixin, generics.ListAPIView
+):
     """
     List OfferResponse (applicants) for an authenticated employer's job offer.
     """
@@ -268,10 +345,71 @@ class JobOfferApplicantsListView(generics.ListAPIView):
     pagination_class = OptionalPagination
 
     def get_queryset(self):
-        employer = get_object_or_404(Employer, user=self.request.user)
         job_offer = get_object_or_404(
             JobOffer,
             pk=self.kwargs["pk"],
-            employer=employer,
+            employer_id=self.get_employer_id(),
         )
         return OfferResponse.objects.filter(offer=job_offer).order_by("id")
+
+
+@recommended_job_offers_docs
+class RecommendedJobOfferListView(
+    ProfileOwnerMixin, LimitMixin, EagerLoadingMixin, generics.ListAPIView
+):
+    """
+    List job offers recommended to the authenticated candidate by skill overlap.
+    """
+
+    permission_classes = [IsAuthenticated, IsCandidate]
+    serializer_class = RecommendedJobOfferSerializer
+    queryset = JobOffer.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        candidate = self.get_candidate()
+        ranking = recommend_offers(candidate, limit=self.get_limit())
+        offers = self.filter_queryset(self.get_queryset()).in_bulk(
+            [offer_id for offer_id, _ in ranking]
+        )
+        results = []
+        for offer_id, score in ranking:
+            offer = offers.get(offer_id)
+            if offer is not None:
+                offer.score = score
+                results.append(offer)
+        return Response(self.get_serializer(results, many=True).data)
+
+
+@job_offer_matches_docs
+class JobOfferMatchesListView(
+    ProfileOwnerMixin,
+    LimitMixin,
+    EagerLoadingMixin,
+    CandidateWithExperienceMixin,
+    generics.ListAPIView,
+):
+    """
+    List candidates ranked by match score for an authenticated employer's job offer.
+    """
+
+    permission_classes = [IsAuthenticated, IsEmployer]
+    serializer_class = CandidateMatchSerializer
+
+    def list(self, request, *args, **kwargs):
+        job_offer = get_object_or_404(
+            JobOffer.objects.select_related("location__city"),
+            pk=self.kwargs["pk"],
+            employer_id=self.get_employer_id(),
+        )
+        ranking = match_candidates(job_offer, limit=self.get_limit())
+        candidates = self.filter_queryset(self.get_queryset()).in_bulk(
+            [candidate_id for candidate_id, _ in ranking]
+        )
+        results = []
+        for candidate_id, scores in ranking:
+            candidate = candidates.get(candidate_id)
+            if candidate is not None:
+                for name, value in scores.items():
+                    setattr(candidate, name, round(value, 4))
+                results.append(candidate)
+        return Response(self.get_serializer(results, many=True).data)
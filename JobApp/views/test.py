@@ -1,5 +1,11 @@
 from django.http import JsonResponse
 
+from JobApp import metrics as counters
+
 
 def health(request):
     return JsonResponse({"status": "ok"})
+
+
+def metrics(request):
+    return JsonResponse(counters.snapshot())
@@ -1,12 +1,18 @@
+from django.contrib.auth.models import update_last_login
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import filters, generics, status
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenObtainSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from JobApp.filters import UserFilter
+from JobApp.mixins import AttemptMetricsMixin, ConditionalGetMixin, EagerLoadingMixin
 from JobApp.models import City, Country, User
 from JobApp.pagination import OptionalPagination
 from JobApp.serializers import (
@@ -18,6 +24,12 @@ from JobApp.serializers import (
     UserSerializer,
     UserSerializerToken,
 )
+from JobApp.throttles import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    RegistrationEmailThrottle,
+    RegistrationIPThrottle,
+)
 from docs.user_docs import (
     city_detail_docs,
     city_list_docs,
@@ -40,48 +52,40 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = "email"
 
     def validate(self, attrs):
-        data = super().validate(attrs)
-        serializer = UserSerializerToken(self.user)
-        data.update(serializer.data)
-        return data
+        # Authenticate only; the token pair is minted once by `issue_tokens`
+        # and shared with the nested user data.
+        TokenObtainSerializer.validate(self, attrs)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return UserSerializerToken(self.user).data
 
 
 @token_obtain_pair_docs
-class MyTokenObtainPairView(TokenObtainPairView):
+class MyTokenObtainPairView(AttemptMetricsMixin, TokenObtainPairView):
     """
     Custom token obtain pair view to include user data in the response.
     """
 
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
+    attempt_metric = "login_attempts"
 
 
 @register_user_docs
-class UserRegistrationView(generics.CreateAPIView):
+class UserRegistrationView(AttemptMetricsMixin, generics.CreateAPIView):
     """
-    Register a new user.
+    Register a new user. Tokens are issued for the created user directly,
+    without authenticating (and hashing the password) a second time.
     """
 
     serializer_class = UserRegistrationSerializer
     permission_classes = [AllowAny]
-
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
-
-        token_serializer = MyTokenObtainPairSerializer(data=request.data)
-        token_serializer.is_valid(raise_exception=True)
-
-        headers = self.get_success_headers(serializer.data)
-        return Response(
-            token_serializer.validated_data,
-            status=status.HTTP_201_CREATED,
-            headers=headers,
-        )
+    throttle_classes = [RegistrationIPThrottle, RegistrationEmailThrottle]
+    attempt_metric = "registration_attempts"
 
 
 @user_list_docs
-class UserListView(generics.ListAPIView):
+class UserListView(EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of users with optional filtering, searching, and ordering.
     """
@@ -108,7 +112,7 @@ class UserListView(generics.ListAPIView):
 
 
 @user_profile_docs
-class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
+class UserProfileView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete the authenticated user's profile.
     """
@@ -117,7 +121,7 @@ class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserProfileSerializer
 
     def get_object(self):
-        return self.request.user
+        return self.eager_load(self.request.user)
 
     def destroy(self, request, *args, **kwargs):
         user = self.get_object()
@@ -131,7 +135,7 @@ class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
 
 
 @user_detail_docs
-class UserDetailView(generics.RetrieveAPIView):
+class UserDetailView(EagerLoadingMixin, generics.RetrieveAPIView):
     """
     Retrieve a user's details.
     """
@@ -164,7 +168,7 @@ class UpdateUserPasswordView(generics.UpdateAPIView):
 
 
 @country_list_docs
-class CountryListView(generics.ListAPIView):
+class CountryListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of countries.
     """
@@ -172,6 +176,7 @@ class CountryListView(generics.ListAPIView):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 3600}
     ordering = ["name"]
     pagination_class = OptionalPagination
     filter_backends = [
@@ -182,7 +187,7 @@ class CountryListView(generics.ListAPIView):
 
 
 @city_list_docs
-class CityListView(generics.ListAPIView):
+class CityListView(ConditionalGetMixin, EagerLoadingMixin, generics.ListAPIView):
     """
     Retrieve a list of cities.
     """
@@ -190,6 +195,7 @@ class CityListView(generics.ListAPIView):
     queryset = City.objects.all()
     serializer_class = CitySerializer
     permission_classes = [AllowAny]
+    cache_control = {"public": True, "max_age": 3600}
     ordering = ["name"]
     pagination_class = OptionalPagination
     filter_backends = [
@@ -200,7 +206,7 @@ class CityListView(generics.ListAPIView):
 
 
 @country_detail_docs
-class CountryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CountryDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a country.
     """
@@ -211,7 +217,7 @@ class CountryDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 @city_detail_docs
-class CityDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CityDetailView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a city.
     """
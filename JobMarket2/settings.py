@@ -4,6 +4,7 @@ from pathlib import Path
 import sys
 
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -18,6 +19,16 @@ USE_LOCAL_DB = os.getenv("USE_LOCAL_DB", "false").lower() == "true"
 
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# Text search configuration used to build job offer `tsvector` documents.
+JOB_SEARCH_CONFIG = os.getenv("JOB_SEARCH_CONFIG", "simple")
+
+# Seconds the job board facet counts are cached, and values listed per facet.
+JOB_FACETS_CACHE_TIMEOUT = int(os.getenv("JOB_FACETS_CACHE_TIMEOUT", "60"))
+JOB_FACETS_LIMIT = 20
+
+# Seconds before the in-memory job recommendation index is rebuilt.
+RECOMMENDATION_INDEX_TTL = int(os.getenv("RECOMMENDATION_INDEX_TTL", "300"))
+
 ALLOWED_HOSTS = ["*"]
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -51,8 +62,22 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "JobApp.authentication.ClaimsJWTAuthentication",
     ),
+    # Login and registration attempts allowed per client IP and per email
+    # address, see `JobApp.throttles`.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": os.getenv("LOGIN_IP_THROTTLE_RATE", "30/min"),
+        "login_email": os.getenv("LOGIN_EMAIL_THROTTLE_RATE", "10/min"),
+        "registration_ip": os.getenv("REGISTRATION_IP_THROTTLE_RATE", "20/hour"),
+        "registration_email": os.getenv("REGISTRATION_EMAIL_THROTTLE_RATE", "5/hour"),
+    },
+    # Reverse proxies in front of the app; client IPs are read from
+    # `X-Forwarded-For` only when this is set. Otherwise the connection's
+    # address is used, so the deployment must preserve it (e.g. a
+    # Kubernetes LoadBalancer with `externalTrafficPolicy: Local`), or the
+    # per-IP throttles apply to all clients at once.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 SIMPLE_JWT = {
@@ -137,6 +162,46 @@ else:
         "default": dj_database_url.config(env="DATABASE_URL", conn_max_age=600)
     }
 
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at e.g.
+# django.core.cache.backends.filebased.FileBasedCache to share across workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "job-market"),
+    }
+}
+
+# Seconds anonymous job listing responses are cached.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
+# Password hashing profile: "pbkdf2" (Django's default), "scrypt", "argon2"
+# (requires argon2-cffi) or "fast" (development and load tests only). Hashes
+# of other profiles are upgraded to the selected one on the next login.
+PASSWORD_HASHING_PROFILES = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "JobApp.hashers.TunedScryptPasswordHasher",
+    "argon2": "JobApp.hashers.TunedArgon2PasswordHasher",
+    "fast": "JobApp.hashers.FastPBKDF2PasswordHasher",
+}
+PASSWORD_HASHING_PROFILE = os.getenv("PASSWORD_HASHING_PROFILE", "pbkdf2")
+if PASSWORD_HASHING_PROFILE not in PASSWORD_HASHING_PROFILES:
+    raise ImproperlyConfigured(
+        f"Unknown PASSWORD_HASHING_PROFILE {PASSWORD_HASHING_PROFILE!r}, choose "
+        f"from {', '.join(PASSWORD_HASHING_PROFILES)}."
+    )
+PASSWORD_HASHERS = [
+    PASSWORD_HASHING_PROFILES[PASSWORD_HASHING_PROFILE],
+    *(
+        hasher
+        for profile, hasher in PASSWORD_HASHING_PROFILES.items()
+        if profile != PASSWORD_HASHING_PROFILE
+    ),
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
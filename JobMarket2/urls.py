@@ -25,7 +25,7 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
-from JobApp.views.test import health
+from JobApp.views.test import health, metrics
 
 
 urlpatterns = [
@@ -39,6 +39,7 @@ urlpatterns = [
     path("api/employers/", include("JobApp.urls.employer_urls")),
     path("", SpectacularSwaggerView.as_view(), name="docs"),
     path("health/", health, name="health"),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
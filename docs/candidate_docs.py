@@ -2,9 +2,10 @@
 Documentation for Candidate API Endpoints
 """
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from JobApp.serializers import (
+    CandidateDossierSerializer,
     CandidateEducationCreateSerializer,
     CandidateEducationSerializer,
     CandidateExperienceCreateSerializer,
@@ -13,16 +14,21 @@ from JobApp.serializers import (
     CandidateSerializer,
     CandidateSkillCreateSerializer,
     CandidateSkillSerializer,
+    CandidateSkillSetSerializer,
 )
 
 
 register_candidate_docs = extend_schema(
     summary="Register a new candidate",
-    description="Creates a new candidate account.",
+    description=(
+        "Creates a new candidate account. Attempts are throttled per client IP "
+        "and per email address."
+    ),
     request=CandidateRegistrationSerializer,
     responses={
         201: CandidateRegistrationSerializer,
         400: {"description": "Bad request"},
+        429: {"description": "Too many registration attempts"},
     },
     tags=["Candidates"],
 )
@@ -41,6 +47,42 @@ candidate_detail_docs = extend_schema(
     tags=["Candidates"],
 )
 
+candidate_dossier_docs = extend_schema(
+    summary="Get candidate dossier",
+    description=(
+        "Returns a candidate's profile, total experience, skills, experience "
+        "and education in a single response. Only accessible by employers."
+    ),
+    responses={
+        200: CandidateDossierSerializer,
+        403: {"description": "Forbidden (employers only)"},
+        404: {"description": "Candidate not found"},
+    },
+    tags=["Candidates"],
+)
+
+candidate_dossier_list_docs = extend_schema(
+    summary="List candidate dossiers",
+    description=(
+        "Returns the dossiers of the candidates listed in `ids`, in the same "
+        "order. Unknown ids are skipped. Only accessible by employers."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "ids",
+            str,
+            required=True,
+            description="Comma separated candidate ids (at most 50).",
+        )
+    ],
+    responses={
+        200: CandidateDossierSerializer(many=True),
+        400: {"description": "Missing or invalid ids"},
+        403: {"description": "Forbidden (employers only)"},
+    },
+    tags=["Candidates"],
+)
+
 candidate_skill_list_docs = extend_schema(
     summary="List candidate skills",
     description="Returns a list of skills for a specific candidate. Only accessible by employers.",
@@ -81,6 +123,22 @@ candidate_skill_profile_docs = extend_schema(
     tags=["Candidates"],
 )
 
+candidate_skill_replace_docs = extend_schema(
+    summary="Replace authenticated candidate's skills",
+    description=(
+        "Replaces the authenticated candidate's skills with the given list of "
+        "skill ids in a single transaction and returns the resulting skills."
+    ),
+    request=CandidateSkillSetSerializer,
+    responses={
+        200: CandidateSkillSerializer(many=True),
+        400: {"description": "Unknown skill ids"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "Not a candidate"},
+    },
+    tags=["Candidates"],
+)
+
 candidate_education_profile_docs = extend_schema(
     summary="List authenticated candidate's educations",
     description="Returns a list of educations for the authenticated candidate.",
@@ -97,6 +155,40 @@ candidate_experience_profile_docs = extend_schema(
     tags=["Candidates"],
 )
 
+candidate_experience_batch_docs = extend_schema(
+    summary="Import authenticated candidate's experiences",
+    description=(
+        "Creates up to 100 experience records for the authenticated candidate. "
+        "Either all records are created or, when any record is invalid, none "
+        "are and the errors are reported per item, in request order."
+    ),
+    request=CandidateExperienceCreateSerializer(many=True),
+    responses={
+        201: CandidateExperienceCreateSerializer(many=True),
+        400: {"description": "Per-item validation errors"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "Not a candidate"},
+    },
+    tags=["Candidates"],
+)
+
+candidate_education_batch_docs = extend_schema(
+    summary="Import authenticated candidate's educations",
+    description=(
+        "Creates up to 100 education records for the authenticated candidate. "
+        "Either all records are created or, when any record is invalid, none "
+        "are and the errors are reported per item, in request order."
+    ),
+    request=CandidateEducationCreateSerializer(many=True),
+    responses={
+        201: CandidateEducationCreateSerializer(many=True),
+        400: {"description": "Per-item validation errors"},
+        401: {"description": "Unauthorized"},
+        404: {"description": "Not a candidate"},
+    },
+    tags=["Candidates"],
+)
+
 candidate_experience_detail_docs = extend_schema(
     summary="Manage authenticated candidate's experience",
     description="Allows an authenticated candidate to view, update and delete their own experience.",
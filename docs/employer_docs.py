@@ -2,14 +2,16 @@
 Documentation for Employer API Endpoints
 """
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from JobApp.serializers import (
     BenefitSerializer,
     EmployerBenefitCreateSerializer,
     EmployerBenefitSerializer,
+    EmployerDirectorySerializer,
     EmployerLocationCreateSerializer,
     EmployerLocationSerializer,
+    EmployerOverviewSerializer,
     EmployerRegistrationSerializer,
     EmployerSerializer,
 )
@@ -25,19 +27,40 @@ benefit_list_docs = extend_schema(
 
 register_employer_docs = extend_schema(
     summary="Register a new employer",
-    description="Creates a new employer account.",
+    description=(
+        "Creates a new employer account. Attempts are throttled per client IP "
+        "and per email address."
+    ),
     request=EmployerRegistrationSerializer,
     responses={
         201: EmployerRegistrationSerializer,
         400: {"description": "Bad request"},
+        429: {"description": "Too many registration attempts"},
     },
     tags=["Employers"],
 )
 
 employer_list_docs = extend_schema(
     summary="List all employers",
-    description="Returns a list of all employers.",
-    responses={200: EmployerSerializer(many=True)},
+    description=(
+        "Returns a list of all employers. `include` embeds each employer's "
+        "number of job offers, locations and benefits, so a directory page "
+        "needs no further requests. Employers can be ordered by "
+        "`offer_count`."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "include",
+            str,
+            description=(
+                "Comma separated optional fields: offer_count, locations, benefits."
+            ),
+        )
+    ],
+    responses={
+        200: EmployerDirectorySerializer(many=True),
+        400: {"description": "Unknown include"},
+    },
     tags=["Employers"],
 )
 
@@ -48,6 +71,24 @@ employer_detail_docs = extend_schema(
     tags=["Employers"],
 )
 
+employer_overview_docs = extend_schema(
+    summary="Get employer overview",
+    description=(
+        "Returns an employer with its locations, benefits and latest job offers "
+        "in one response. Overviews are cached per employer and invalidated "
+        "when the employer, its locations, benefits or job offers change."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "limit",
+            int,
+            description="Number of latest job offers (default 5, at most 20).",
+        )
+    ],
+    responses={200: EmployerOverviewSerializer, 404: {"description": "Not found"}},
+    tags=["Employers"],
+)
+
 employer_profile_docs = extend_schema(
     summary="Manage employer profile",
     description="Allows an authenticated employer to view and update their own profile.",
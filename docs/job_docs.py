@@ -2,15 +2,18 @@
 Documentation for Job API Endpoints
 """
 
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
 from JobApp.serializers import (
+    CandidateMatchSerializer,
     ChoiceSerializer,
     IndustrySerializer,
     JobOfferCreateSerializer,
+    JobOfferFacetsSerializer,
     JobOfferSerializer,
     JobOfferUpdateSerializer,
     OfferResponseSerializer,
+    RecommendedJobOfferSerializer,
     SkillSerializer,
 )
 
@@ -31,11 +34,29 @@ industry_list_docs = extend_schema(
 
 job_offer_list_docs = extend_schema(
     summary="List all job offers",
-    description="Returns a list of all job offers.",
+    description=(
+        "Returns a list of all job offers. The `search` parameter runs a "
+        "full-text search over position, skills, company, industry, city and "
+        "description; results are ranked by relevance unless `ordering` is given."
+    ),
     responses={200: JobOfferSerializer(many=True)},
     tags=["Jobs"],
 )
 
+job_offer_facets_docs = extend_schema(
+    summary="Get job offer facet counts",
+    description=(
+        "Accepts the same filter and `search` parameters as the job offer list "
+        "and returns, for every facet (seniority, contract, remoteness, skills, "
+        "cities, industries and benefits), the number of matching offers per "
+        "value. Each facet ignores its own filter so sibling values stay "
+        "visible. Skill, city, industry and benefit facets list the most "
+        "frequent values only."
+    ),
+    responses={200: JobOfferFacetsSerializer},
+    tags=["Jobs"],
+)
+
 seniority_list_docs = extend_schema(
     summary="List all seniority levels",
     description="Returns a list of all seniority levels.",
@@ -93,7 +114,22 @@ employer_job_offer_list_docs = extend_schema(
 
 apply_to_job_offer_docs = extend_schema(
     summary="Apply to a job offer",
-    description="Creates an application (OfferResponse) for the authenticated candidate.",
+    description=(
+        "Creates an application (OfferResponse) for the authenticated candidate. "
+        "Duplicate applications, including concurrent ones, are rejected with 400."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "response",
+            str,
+            enum=["full", "minimal"],
+            description=(
+                "`full` (default) renders the offer and candidate, `minimal` "
+                "returns only the application, offer and candidate ids and "
+                "the application status."
+            ),
+        )
+    ],
     responses={
         201: OfferResponseSerializer,
         400: {"description": "Bad request / already applied"},
@@ -115,3 +151,48 @@ job_offer_applicants_docs = extend_schema(
     },
     tags=["Jobs"],
 )
+
+recommended_job_offers_docs = extend_schema(
+    summary="List job offers recommended to the authenticated candidate",
+    description=(
+        "Returns up to `limit` (default 20, at most 100) job offers ranked by "
+        "the number of skills they share with the candidate. Ties are broken "
+        "by offers in the candidate's city first, then by recency. Offers "
+        "without shared skills are not listed."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "limit", int, description="Maximum number of offers (default 20)."
+        )
+    ],
+    responses={
+        200: RecommendedJobOfferSerializer(many=True),
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden (candidates only)"},
+    },
+    tags=["Jobs"],
+)
+
+job_offer_matches_docs = extend_schema(
+    summary="List candidates matching an employer job offer",
+    description=(
+        "Returns up to `limit` (default 20, at most 100) candidates ranked by "
+        "match score for the authenticated employer's job offer. The score "
+        "combines the share of the offer's skills the candidate has (60%), "
+        "total experience relative to the offer's seniority (25%) and "
+        "location: same city, same country or elsewhere (15%). Candidates "
+        "sharing no skill with the offer are not listed."
+    ),
+    parameters=[
+        OpenApiParameter(
+            "limit", int, description="Maximum number of candidates (default 20)."
+        )
+    ],
+    responses={
+        200: CandidateMatchSerializer(many=True),
+        401: {"description": "Unauthorized"},
+        403: {"description": "Forbidden (employers only)"},
+        404: {"description": "Job offer not found"},
+    },
+    tags=["Jobs"],
+)
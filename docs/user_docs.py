@@ -35,9 +35,16 @@ user_profile_docs = extend_schema(
 
 register_user_docs = extend_schema(
     summary="Register a new user",
-    description="Creates a new user account.",
+    description=(
+        "Creates a new user account. Attempts are throttled per client IP "
+        "and per email address."
+    ),
     request=UserRegistrationSerializer,
-    responses={201: UserSerializerToken, 400: {"description": "Bad request"}},
+    responses={
+        201: UserSerializerToken,
+        400: {"description": "Bad request"},
+        429: {"description": "Too many registration attempts"},
+    },
     tags=["Users"],
 )
 
@@ -61,15 +68,27 @@ update_user_password_docs = extend_schema(
 
 token_obtain_pair_docs = extend_schema(
     summary="Obtain JWT token",
-    description="Obtain JWT token by providing user credentials.",
-    responses={200: UserSerializerToken},
+    description=(
+        "Obtain JWT token by providing user credentials. Attempts are "
+        "throttled per client IP and per email address."
+    ),
+    responses={
+        200: UserSerializerToken,
+        429: {"description": "Too many login attempts"},
+    },
     tags=["Users"],
 )
 
 token_obtain_pair_docs = extend_schema(
     summary="Obtain JWT token",
-    description="Obtain JWT token by providing user credentials.",
-    responses={200: UserSerializerToken},
+    description=(
+        "Obtain JWT token by providing user credentials. Attempts are "
+        "throttled per client IP and per email address."
+    ),
+    responses={
+        200: UserSerializerToken,
+        429: {"description": "Too many login attempts"},
+    },
     tags=["Users"],
 )
 
@@ -0,0 +1,16 @@
+from django.core.cache import cache
+import pytest
+
+from JobApp.matching import candidate_index
+from JobApp.recommendations import offer_index
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    offer_index.reset()
+    candidate_index.reset()
+    yield
+    cache.clear()
+    offer_index.reset()
+    candidate_index.reset()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+import pytest
+
+from JobApp.models import JobOffer, JobOfferSearchDocument, User
+
+
+@pytest.mark.django_db
+def test_benchmark_pagination_seeds_searchable_offers_and_cleans_up() -> None:
+    call_command(
+        "benchmark_pagination",
+        offers=5,
+        page=2,
+        page_size=2,
+        repeat=1,
+        batch_size=3,
+        stdout=StringIO(),
+    )
+    assert JobOffer.objects.count() == 5
+    assert JobOfferSearchDocument.objects.count() == 5
+
+    call_command("benchmark_pagination", clean=True, stdout=StringIO())
+    assert not JobOffer.objects.exists()
+    assert not JobOfferSearchDocument.objects.exists()
+    assert not User.objects.filter(email="bench-employer@example.com").exists()
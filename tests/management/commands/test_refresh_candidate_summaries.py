@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.core.management import call_command
+import pytest
+
+from JobApp.models import (
+    Candidate,
+    CandidateExperience,
+    CandidateSummary,
+    City,
+    Country,
+    User,
+)
+
+
+@pytest.mark.django_db
+def test_refresh_candidate_summaries_rolls_current_jobs_forward() -> None:
+    country = Country.objects.create(name="Test Country")
+    city = City.objects.create(name="Test City", country=country, province="Test")
+    candidates = []
+    for index in range(2):
+        user = User.objects.create_user(
+            email=f"candidate{index}@example.com",
+            password="password123",
+            phone_number=f"550000000{index}",
+            city=city,
+        )
+        candidates.append(Candidate.objects.create(user=user))
+    current, former = candidates
+    start = date.today() - timedelta(days=100)
+    CandidateExperience.objects.create(
+        candidate=current,
+        company_name="Acme",
+        job_position="Developer",
+        date_from=start,
+        is_current=True,
+    )
+    CandidateExperience.objects.create(
+        candidate=former,
+        company_name="Acme",
+        job_position="Developer",
+        date_from=start,
+        date_to=start + timedelta(days=50),
+    )
+    yesterday = date.today() - timedelta(days=1)
+    CandidateSummary.objects.update(computed_on=yesterday, experience_days=99)
+    CandidateSummary.objects.filter(candidate=former).update(experience_days=50)
+
+    call_command("refresh_candidate_summaries")
+
+    current_summary = CandidateSummary.objects.get(candidate=current)
+    assert current_summary.experience_days == 100
+    assert current_summary.computed_on == date.today()
+    assert current_summary.is_currently_employed is True
+    former_summary = CandidateSummary.objects.get(candidate=former)
+    assert former_summary.experience_days == 50
+    assert former_summary.computed_on == yesterday
+
+    CandidateSummary.objects.all().delete()
+    call_command("refresh_candidate_summaries", "--all")
+    assert CandidateSummary.objects.count() == 2
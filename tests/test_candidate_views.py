@@ -2,15 +2,19 @@ from datetime import date
 import uuid
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from JobApp.filters import CandidateFilter
 from JobApp.models import (
     Candidate,
     CandidateEducation,
     CandidateExperience,
     CandidateSkill,
+    CandidateSummary,
     City,
     Country,
     Employer,
@@ -18,6 +22,7 @@ from JobApp.models import (
     Skill,
     User,
 )
+from JobApp.tokens import issue_tokens
 
 
 def resume_file():
@@ -96,6 +101,158 @@ class TestCandidateListView:
         assert returned_ids == {candidate1.id, candidate2.id}
         assert all("total_experience" in item for item in response.data["results"])
 
+    def test_get_candidates_authorizes_from_token_claims(self, api_client, common_data):
+        _, _, _, employer_user, _, _, _, _ = common_data
+        access = issue_tokens(employer_user)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get("/api/candidates/")
+        assert response.status_code == status.HTTP_200_OK
+        assert not [
+            query
+            for query in context.captured_queries
+            if 'FROM "JobApp_employer"' in query["sql"]
+        ]
+
+    @pytest.mark.parametrize("revoke", ["deactivate", "delete"])
+    def test_get_candidates_revoked_user_token(self, api_client, common_data, revoke):
+        _, _, _, employer_user, _, candidate, _, _ = common_data
+        access = issue_tokens(employer_user)["access"]
+        if revoke == "delete":
+            employer_user.delete()
+        else:
+            employer_user.is_active = False
+            employer_user.save()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = api_client.get("/api/candidates/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = api_client.get(f"/api/candidates/{candidate.id}/dossier/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_get_candidates_by_experience(self, api_client, common_data):
+        _, _, _, employer_user, _, candidate1, _, candidate2 = common_data
+        CandidateExperience.objects.create(
+            candidate=candidate1,
+            company_name="Acme",
+            job_position="Developer",
+            date_from=date(2020, 1, 1),
+            date_to=date(2021, 7, 1),
+        )
+        api_client.force_authenticate(user=employer_user)
+
+        def ids(query):
+            response = api_client.get(f"/api/candidates/?{query}")
+            assert response.status_code == status.HTTP_200_OK
+            return {item["id"] for item in response.data["results"]}
+
+        assert ids("min_experience_years=1.5") == {candidate1.id}
+        assert ids("min_experience_years=2") == set()
+        assert ids("min_experience_years=0") == {candidate1.id, candidate2.id}
+        assert ids("max_experience_years=1") == {candidate2.id}
+        assert ids("max_experience_years=1.5") == {candidate1.id, candidate2.id}
+        assert ids("min_experience_years=1&max_experience_years=1.5") == {candidate1.id}
+
+    def test_filter_candidates_without_duplicates(self, api_client, common_data):
+        _, _, _, employer_user, _, candidate1, _, candidate2 = common_data
+        python = Skill.objects.create(name="Python")
+        django = Skill.objects.create(name="Django")
+        CandidateSkill.objects.create(candidate=candidate1, skill=python)
+        CandidateSkill.objects.create(candidate=candidate1, skill=django)
+        CandidateSkill.objects.create(candidate=candidate2, skill=python)
+        for position in ["Developer", "Developer"]:
+            CandidateExperience.objects.create(
+                candidate=candidate1,
+                company_name="Acme",
+                job_position=position,
+                date_from=date(2020, 1, 1),
+                date_to=date(2021, 1, 1),
+            )
+        api_client.force_authenticate(user=employer_user)
+
+        def results(query):
+            response = api_client.get(f"/api/candidates/?{query}")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["count"] == len(response.data["results"])
+            return response.data["results"]
+
+        matches = results("skill=Python,Django&job_position=Developer")
+        assert [item["id"] for item in matches] == [candidate1.id]
+        assert matches[0]["total_experience"] == 1.0
+        assert {item["id"] for item in results("skill=Python,Django")} == {
+            candidate1.id,
+            candidate2.id,
+        }
+        assert [
+            item["id"] for item in results("skill=Python,Django&skill_match=all")
+        ] == [candidate1.id]
+        assert [item["id"] for item in results("skill_all=Python,Django")] == [
+            candidate1.id
+        ]
+        assert {item["id"] for item in results("skill_all=Python")} == {
+            candidate1.id,
+            candidate2.id,
+        }
+
+    def test_filter_candidates_compiles_subqueries(self):
+        queryset = CandidateFilter(
+            {"skill": "", "degree": "BSc,MSc", "job_position": "Developer,Lead"},
+            queryset=Candidate.objects.all(),
+        ).qs
+        sql = str(queryset.query).upper()
+        assert "JOIN" not in sql
+        assert sql.count("EXISTS") == 2
+
+        queryset = CandidateFilter(
+            {"skill": "", "degree": "BSc,MSc", "degree_match": "all"},
+            queryset=Candidate.objects.all(),
+        ).qs
+        sql = str(queryset.query).upper()
+        assert "JOIN" not in sql
+        assert 'HAVING COUNT(DISTINCT U0."DEGREE") = 2' in sql
+
+    def test_get_candidates_merges_overlapping_experience(
+        self, api_client, common_data
+    ):
+        _, _, _, employer_user, _, candidate1, _, _ = common_data
+        for company, date_from, date_to in [
+            ("Acme", date(2018, 1, 1), date(2020, 1, 1)),
+            ("Side Project", date(2019, 1, 1), date(2019, 7, 1)),
+            ("Globex", date(2019, 6, 1), date(2021, 1, 1)),
+        ]:
+            CandidateExperience.objects.create(
+                candidate=candidate1,
+                company_name=company,
+                job_position=f"{company} Developer",
+                date_from=date_from,
+                date_to=date_to,
+            )
+        CandidateEducation.objects.create(
+            candidate=candidate1,
+            school_name="School A",
+            degree="Master of Science",
+            date_from=date(2016, 1, 1),
+            date_to=date(2018, 1, 1),
+        )
+        CandidateEducation.objects.create(
+            candidate=candidate1,
+            school_name="School B",
+            degree="BSc",
+            date_from=date(2012, 1, 1),
+            date_to=date(2015, 1, 1),
+        )
+
+        summary = CandidateSummary.objects.get(candidate=candidate1)
+        assert summary.experience_days == (date(2021, 1, 1) - date(2018, 1, 1)).days
+        assert summary.latest_position == "Globex Developer"
+        assert summary.is_currently_employed is False
+        assert summary.highest_degree == "Master of Science"
+
+        api_client.force_authenticate(user=employer_user)
+        response = api_client.get(f"/api/candidates/{candidate1.id}/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_experience"] == 3.0
+
     def test_get_candidates_without_permission(self, api_client, common_data):
         _, _, _, _, _, candidate, _, _ = common_data
         api_client.force_authenticate(user=candidate.user)
@@ -128,6 +285,93 @@ class TestCandidateDetailView:
         assert response.data["detail"] == "Access restricted to employers only"
 
 
+@pytest.mark.django_db
+class TestCandidateDossierView:
+    def add_profile(self, candidate, skill_names):
+        for name in skill_names:
+            skill, _ = Skill.objects.get_or_create(name=name)
+            CandidateSkill.objects.create(candidate=candidate, skill=skill)
+        CandidateExperience.objects.create(
+            candidate=candidate,
+            company_name="Company A",
+            job_position="Developer",
+            date_from=date(2019, 1, 1),
+            date_to=date(2020, 1, 1),
+        )
+        CandidateExperience.objects.create(
+            candidate=candidate,
+            company_name="Company B",
+            job_position="Lead",
+            date_from=date(2020, 1, 1),
+            date_to=date(2021, 1, 1),
+        )
+        CandidateEducation.objects.create(
+            candidate=candidate,
+            school_name="School A",
+            field_of_study="Computer Science",
+            degree="BSc",
+            date_from=date(2015, 1, 1),
+            date_to=date(2018, 1, 1),
+        )
+
+    def test_get_candidate_dossier(self, api_client, common_data):
+        _, _, _, employer_user, _, candidate, _, _ = common_data
+        self.add_profile(candidate, ["Python", "Django"])
+        api_client.force_authenticate(user=employer_user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f"/api/candidates/{candidate.id}/dossier/")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.data
+        assert data["id"] == candidate.id
+        assert data["user"]["email"] == candidate.user.email
+        assert data["total_experience"] == 2.0
+        assert [item["skill"]["name"] for item in data["skills"]] == [
+            "Python",
+            "Django",
+        ]
+        assert [item["company_name"] for item in data["experience"]] == [
+            "Company B",
+            "Company A",
+        ]
+        assert data["education"][0]["degree"] == "BSc"
+        assert "candidate" not in data["skills"][0]
+        assert "candidate" not in data["experience"][0]
+
+        queries = len(context.captured_queries)
+        self.add_profile(candidate, ["Golang", "Rust"])
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f"/api/candidates/{candidate.id}/dossier/")
+        assert len(response.data["skills"]) == 4
+        assert len(context.captured_queries) == queries
+
+    def test_get_candidate_dossiers_batch(self, api_client, common_data):
+        _, _, _, employer_user, _, candidate1, _, candidate2 = common_data
+        self.add_profile(candidate1, ["Python"])
+        self.add_profile(candidate2, ["Django"])
+        api_client.force_authenticate(user=employer_user)
+
+        response = api_client.get(
+            f"/api/candidates/dossier/?ids={candidate2.id},999,{candidate1.id}"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data] == [candidate2.id, candidate1.id]
+        assert response.data[0]["skills"][0]["skill"]["name"] == "Django"
+
+        response = api_client.get("/api/candidates/dossier/?ids=1,abc")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.get("/api/candidates/dossier/")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_candidate_dossier_without_permission(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, other_candidate = common_data
+        api_client.force_authenticate(user=other_candidate.user)
+        response = api_client.get(f"/api/candidates/{candidate.id}/dossier/")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        response = api_client.get(f"/api/candidates/dossier/?ids={candidate.id}")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 @pytest.mark.django_db
 class TestCandidateSkillListView:
     def test_get_candidate_skills_success(self, api_client, common_data):
@@ -277,6 +521,16 @@ class TestCandidateProfileView:
         assert response.data["id"] == candidate.id
         assert response.data["user"]["email"] == candidate.user.email
 
+    def test_get_candidate_profile_single_lookup(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        access = issue_tokens(candidate.user)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get("/api/candidates/profile/")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == candidate.id
+        assert len(context.captured_queries) == 1
+
     def test_get_candidate_profile_unauthorized(self, api_client):
         response = api_client.get("/api/candidates/profile/")
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -319,3 +573,141 @@ class TestCandidateProfileUpdateView:
             format="json",
         )
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestCandidateSkillReplaceView:
+    def test_replace_candidate_skills(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        skills = [Skill.objects.create(name=f"Skill {index}") for index in range(25)]
+        CandidateSkill.objects.create(candidate=candidate, skill=skills[0])
+        CandidateSkill.objects.create(candidate=candidate, skill=skills[1])
+        api_client.force_authenticate(user=candidate.user)
+
+        def replace(skill_ids):
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.put(
+                    "/api/candidates/profile/skills/",
+                    {"skills": skill_ids},
+                    format="json",
+                )
+            assert response.status_code == status.HTTP_200_OK
+            return response, len(context.captured_queries)
+
+        response, few_queries = replace([skills[1].id, skills[2].id])
+        assert [item["skill"]["id"] for item in response.data] == [
+            skills[1].id,
+            skills[2].id,
+        ]
+        summary = CandidateSummary.objects.get(candidate=candidate)
+        assert summary.skill_ids == [skills[1].id, skills[2].id]
+
+        response, many_queries = replace([skill.id for skill in skills[3:]])
+        assert len(response.data) == 22
+        assert many_queries == few_queries
+        assert set(
+            CandidateSkill.objects.filter(candidate=candidate).values_list(
+                "skill_id", flat=True
+            )
+        ) == {skill.id for skill in skills[3:]}
+
+        response, _ = replace([])
+        assert response.data == []
+        assert not CandidateSkill.objects.filter(candidate=candidate).exists()
+
+    def test_replace_candidate_skills_invalid(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        skill = Skill.objects.create(name="Python")
+        CandidateSkill.objects.create(candidate=candidate, skill=skill)
+        api_client.force_authenticate(user=candidate.user)
+        response = api_client.put(
+            "/api/candidates/profile/skills/",
+            {"skills": [999]},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert CandidateSkill.objects.filter(candidate=candidate).count() == 1
+
+
+@pytest.mark.django_db
+class TestCandidateRecordBatchView:
+    def experience(self, index, **overrides):
+        return {
+            "company_name": f"Company {index}",
+            "job_position": "Developer",
+            "date_from": f"{2000 + index}-01-01",
+            "date_to": f"{2001 + index}-01-01",
+            **overrides,
+        }
+
+    def test_import_candidate_experience(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        api_client.force_authenticate(user=candidate.user)
+
+        def post(count):
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.post(
+                    "/api/candidates/profile/experience/batch/",
+                    [self.experience(index) for index in range(count)],
+                    format="json",
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            return response, len(context.captured_queries)
+
+        response, few_queries = post(2)
+        assert [item["company_name"] for item in response.data] == [
+            "Company 0",
+            "Company 1",
+        ]
+        assert all(item["id"] for item in response.data)
+        response, many_queries = post(20)
+        assert many_queries == few_queries
+        assert CandidateExperience.objects.filter(candidate=candidate).count() == 22
+        summary = CandidateSummary.objects.get(candidate=candidate)
+        assert summary.experience_days == (date(2020, 1, 1) - date(2000, 1, 1)).days
+
+    def test_import_candidate_experience_invalid(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        api_client.force_authenticate(user=candidate.user)
+        response = api_client.post(
+            "/api/candidates/profile/experience/batch/",
+            [self.experience(0), self.experience(1, date_from="not a date")],
+            format="json",
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {}
+        assert "date_from" in response.data[1]
+        assert not CandidateExperience.objects.filter(candidate=candidate).exists()
+
+        response = api_client.post(
+            "/api/candidates/profile/experience/batch/", [], format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_import_candidate_education(self, api_client, common_data):
+        _, _, _, _, _, candidate, _, _ = common_data
+        api_client.force_authenticate(user=candidate.user)
+        response = api_client.post(
+            "/api/candidates/profile/education/batch/",
+            [
+                {
+                    "school_name": "School A",
+                    "field_of_study": "Computer Science",
+                    "degree": "BSc",
+                    "date_from": "2012-01-01",
+                    "date_to": "2015-01-01",
+                },
+                {
+                    "school_name": "School B",
+                    "field_of_study": "Computer Science",
+                    "degree": "MSc",
+                    "date_from": "2015-10-01",
+                    "date_to": "2017-06-01",
+                },
+            ],
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert CandidateEducation.objects.filter(candidate=candidate).count() == 2
+        summary = CandidateSummary.objects.get(candidate=candidate)
+        assert summary.highest_degree == "MSc"
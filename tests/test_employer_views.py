@@ -1,6 +1,9 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
 from JobApp.models import (
     Benefit,
@@ -10,6 +13,7 @@ from JobApp.models import (
     EmployerBenefit,
     EmployerLocation,
     Industry,
+    JobOffer,
     User,
 )
 
@@ -48,6 +52,97 @@ class TestEmployerListView:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["company_name"] == employer.company_name
 
+    def test_get_employers_with_cursor(self, api_client, common_data):
+        employer, _, _, _, _ = common_data
+        response = api_client.get("/api/employers/?cursor=")
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["next"] is None
+        assert [item["id"] for item in response.data["results"]] == [employer.id]
+
+    def test_filter_employers_by_benefits(self, api_client, common_data):
+        employer, _, _, _, _ = common_data
+        gym = Benefit.objects.create(name="Gym")
+        lunch = Benefit.objects.create(name="Lunch")
+        EmployerBenefit.objects.create(employer=employer, benefit=gym)
+        EmployerBenefit.objects.create(employer=employer, benefit=lunch)
+
+        response = api_client.get("/api/employers/?benefits=Gym,Lunch")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        assert [item["id"] for item in response.data["results"]] == [employer.id]
+
+        Benefit.objects.create(name="Car")
+        response = api_client.get("/api/employers/?benefits=Gym,Car&benefits_match=all")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 0
+
+    def test_get_employer_directory(self, api_client, common_data):
+        employer, _, industry, city, _ = common_data
+        gym = Benefit.objects.create(name="Gym")
+        for index in range(5):
+            user = User.objects.create_user(
+                email=f"directory{index}@example.com",
+                password="password123",
+                phone_number=f"+4800000000{index}",
+                city=city,
+            )
+            other = Employer.objects.create(
+                user=user,
+                company_name=f"Company {index}",
+                industry=industry,
+                website_url=f"https://company{index}.example.com",
+            )
+            location = EmployerLocation.objects.create(employer=other, city=city)
+            EmployerBenefit.objects.create(employer=other, benefit=gym)
+            for _ in range(index):
+                JobOffer.objects.create(
+                    employer=other,
+                    location=location,
+                    description="Description",
+                    position="Developer",
+                    seniority=JobOffer.Seniority.JUNIOR,
+                    contract=JobOffer.ContractType.B2B_CONTRACT,
+                    remoteness=JobOffer.RemotenessLevel.REMOTE,
+                )
+
+        url = "/api/employers/?include=offer_count,locations,benefits"
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url + "&ordering=-offer_count,id")
+        assert response.status_code == status.HTTP_200_OK
+        # Version (employers, cities, benefits), count, page, locations, benefits.
+        assert len(context.captured_queries) == 7
+        results = response.data["results"]
+        assert [item["offer_count"] for item in results] == [4, 3, 2, 1, 0, 0]
+        assert results[0]["locations"][0]["city"]["name"] == "Test City"
+        assert results[0]["benefits"][0]["benefit"]["name"] == "Gym"
+        assert results[-2]["id"] == employer.id
+        assert results[-2]["locations"] == []
+
+        response = api_client.get("/api/employers/?include=offer_count")
+        assert "locations" not in response.data["results"][0]
+        assert response.data["results"][0]["offer_count"] == 0
+        response = api_client.get("/api/employers/")
+        assert "offer_count" not in response.data["results"][0]
+        response = api_client.get("/api/employers/?include=salaries")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_employer_directory_conditional(self, api_client, common_data):
+        employer, _, _, city, _ = common_data
+        url = "/api/employers/?include=locations"
+        etag = api_client.get(url)["ETag"]
+
+        location = EmployerLocation.objects.create(employer=employer, city=city)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["locations"][0]["id"] == location.id
+
+        etag = response["ETag"]
+        location.delete()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["locations"] == []
+
 
 @pytest.mark.django_db
 class TestEmployerDetailView:
@@ -57,11 +152,116 @@ class TestEmployerDetailView:
         assert response.status_code == status.HTTP_200_OK
         assert response.data["company_name"] == employer.company_name
 
+    def test_get_employer_conditional(self, api_client, common_data):
+        employer, user, _, _, _ = common_data
+        url = f"/api/employers/{employer.id}/"
+        response = api_client.get(url)
+        etag = response["ETag"]
+        assert response["Cache-Control"] == "public, max-age=300"
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+        user.first_name = "Renamed"
+        user.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
     def test_get_employer_not_found(self, api_client):
         response = api_client.get("/api/employers/999/")
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.django_db
+class TestEmployerOverviewView:
+    def create_offer(self, employer, location, position="Developer"):
+        return JobOffer.objects.create(
+            employer=employer,
+            location=location,
+            description="Description",
+            position=position,
+            seniority=JobOffer.Seniority.JUNIOR,
+            contract=JobOffer.ContractType.B2B_CONTRACT,
+            remoteness=JobOffer.RemotenessLevel.REMOTE,
+        )
+
+    def test_get_employer_overview(self, api_client, common_data):
+        employer, _, _, city, _ = common_data
+        location = EmployerLocation.objects.create(employer=employer, city=city)
+        EmployerBenefit.objects.create(
+            employer=employer, benefit=Benefit.objects.create(name="Gym")
+        )
+        for index in range(3):
+            self.create_offer(employer, location, f"Developer {index}")
+        url = f"/api/employers/{employer.id}/overview/"
+
+        response = api_client.get(url + "?limit=2")
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-Cache"] == "MISS"
+        assert response.data["company_name"] == employer.company_name
+        assert response.data["locations"][0]["city"]["name"] == "Test City"
+        assert response.data["benefits"][0]["benefit"]["name"] == "Gym"
+        assert [offer["position"] for offer in response.data["latest_offers"]] == [
+            "Developer 2",
+            "Developer 1",
+        ]
+        assert "employer" not in response.data["latest_offers"][0]
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(url + "?limit=2")
+        assert response["X-Cache"] == "HIT"
+        assert len(context.captured_queries) == 0
+
+        response = api_client.get("/api/employers/0/overview/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_employer_overview_invalidation(self, api_client, common_data):
+        employer, _, industry, city, _ = common_data
+        user = User.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            phone_number="+48000000009",
+            city=city,
+        )
+        other = Employer.objects.create(
+            user=user,
+            company_name="Other Company",
+            industry=industry,
+            website_url="https://other.example.com",
+        )
+        other_location = EmployerLocation.objects.create(employer=other, city=city)
+        url = f"/api/employers/{employer.id}/overview/"
+        api_client.get(url)
+
+        self.create_offer(other, other_location)
+        other.description = "Changed"
+        other.save()
+        assert api_client.get(url)["X-Cache"] == "HIT"
+
+        location = EmployerLocation.objects.create(employer=employer, city=city)
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["locations"]) == 1
+
+        offer = self.create_offer(employer, location)
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert len(response.data["latest_offers"]) == 1
+
+        offer.delete()
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["latest_offers"] == []
+
+        industry.name = "Renamed"
+        industry.save()
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["industry"]["name"] == "Renamed"
+
+
 @pytest.mark.django_db
 class TestEmployerProfileView:
     def test_get_employer_profile_success(self, api_client, common_data):
@@ -91,6 +291,10 @@ class TestRegisterEmployerView:
         }
         response = api_client.post("/api/employers/register/", data)
         assert response.status_code == status.HTTP_201_CREATED
+        access = AccessToken(response.data["access"])
+        assert access["role"] == "employer"
+        assert access["employer_id"] == response.data["id"]
+        assert access["candidate_id"] is None
 
     def test_register_employer_invalid_data(self, api_client, common_data):
         _, _, industry, _, _ = common_data
@@ -150,6 +354,25 @@ class TestEmployerLocationListProfileView:
         response = api_client.post("/api/employers/profile/locations/", data)
         assert response.status_code == status.HTTP_201_CREATED
 
+    def test_create_employer_location_profile_resolves_employer_once(
+        self, api_client, common_data
+    ):
+        _, user, _, city, _ = common_data
+        api_client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(
+                "/api/employers/profile/locations/", {"city": city.id}
+            )
+        assert response.status_code == status.HTTP_201_CREATED
+        lookups = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "JobApp_user"' in query["sql"]
+            or 'FROM "JobApp_employer"' in query["sql"]
+        ]
+        assert len(lookups) == 1
+        assert 'JOIN "JobApp_employer"' in lookups[0]
+
 
 @pytest.mark.django_db
 class TestEmployerProfileBenefitListView:
@@ -1,12 +1,22 @@
+from datetime import date
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from JobApp.models import (
+    Benefit,
     Candidate,
+    CandidateExperience,
+    CandidateSkill,
     City,
     Country,
     Employer,
+    EmployerBenefit,
     EmployerLocation,
     Industry,
     JobOffer,
@@ -15,6 +25,7 @@ from JobApp.models import (
     Skill,
     User,
 )
+from JobApp.tokens import issue_tokens
 
 
 @pytest.fixture
@@ -68,6 +79,27 @@ def candidate_data(common_data):
     return candidate, user
 
 
+def add_job_offers(common_data, count):
+    employer, _, _, _, _, location, _, skill = common_data
+    for i in range(count):
+        offer = JobOffer.objects.create(
+            employer=employer,
+            location=location,
+            position=f"Extra Job Offer {i}",
+            remoteness=JobOffer.RemotenessLevel.REMOTE,
+            contract=JobOffer.ContractType.B2B_CONTRACT,
+            seniority=JobOffer.Seniority.SENIOR,
+        )
+        JobOfferSkill.objects.create(offer=offer, skill=skill)
+
+
+def count_queries(api_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    return len(context.captured_queries)
+
+
 @pytest.mark.django_db
 class TestSkillListView:
     def test_get_skills_success(self, api_client, common_data):
@@ -123,6 +155,302 @@ class TestJobOfferListView:
         assert response.data["count"] == 1
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["position"] == job_offer.position
+        assert "updated_at" not in response.data["results"][0]
+
+    def test_search_job_offers_by_skill(self, api_client, common_data):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        response = api_client.get("/api/jobs/?search=pyth")
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+
+        response = api_client.get("/api/jobs/?search=python golang")
+        assert response.data["count"] == 0
+
+    def test_search_reflects_employer_changes(self, api_client, common_data):
+        employer, _, _, _, _, _, job_offer, _ = common_data
+        employer.company_name = "Renamed Corp"
+        employer.save()
+
+        response = api_client.get("/api/jobs/?search=renamed")
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+        response = api_client.get("/api/jobs/?search=employer inc")
+        assert response.data["count"] == 0
+
+    def test_filter_job_offers(self, api_client, common_data):
+        employer, _, _, _, _, _, job_offer, _ = common_data
+        add_job_offers(common_data, 2)
+        Skill.objects.create(name="Golang")
+
+        response = api_client.get("/api/jobs/?skill=Python,Golang&seniority=JUNIOR")
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+
+        response = api_client.get("/api/jobs/?skill=Golang")
+        assert response.data["count"] == 0
+
+        response = api_client.get("/api/jobs/?skill=Python,Golang&skill_match=all")
+        assert response.data["count"] == 0
+        JobOfferSkill.objects.create(
+            offer=job_offer, skill=Skill.objects.get(name="Golang")
+        )
+        response = api_client.get("/api/jobs/?skill=Python,Golang&skill_match=all")
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+        response = api_client.get("/api/jobs/?skill_all=Python,Golang")
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+
+        response = api_client.get("/api/jobs/?city=Test City&industry=Technology")
+        assert response.data["count"] == 3
+
+    def test_filter_job_offers_by_benefit(self, api_client, common_data):
+        employer, _, _, _, _, _, job_offer, _ = common_data
+        benefit = Benefit.objects.create(name="Remote work")
+
+        response = api_client.get("/api/jobs/?benefits=Remote work")
+        assert response.data["count"] == 0
+
+        EmployerBenefit.objects.create(employer=employer, benefit=benefit)
+        response = api_client.get("/api/jobs/?benefits=Remote work")
+        assert [item["id"] for item in response.data["results"]] == [job_offer.id]
+
+        EmployerBenefit.objects.filter(employer=employer).delete()
+        response = api_client.get("/api/jobs/?benefits=Remote work")
+        assert response.data["count"] == 0
+
+    def test_cursor_pagination_walks_all_offers(self, api_client, common_data):
+        add_job_offers(common_data, 4)
+        expected = list(
+            JobOffer.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        response = api_client.get("/api/jobs/?cursor=&page_size=2")
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        assert response.data["previous"] is None
+
+        seen = [item["id"] for item in response.data["results"]]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            seen.extend(item["id"] for item in response.data["results"])
+        assert seen == expected
+
+        response = api_client.get(response.data["previous"])
+        assert [item["id"] for item in response.data["results"]] == expected[2:4]
+
+    def test_cursor_pagination_rejects_other_ordering(self, api_client, common_data):
+        response = api_client.get("/api/jobs/?cursor=&ordering=wage")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "cursor" in response.data
+
+        response = api_client.get("/api/jobs/?cursor=&ordering=-created_at")
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 1
+
+    def test_cursor_pagination_invalid_cursor(self, api_client, common_data):
+        response = api_client.get("/api/jobs/?cursor=not-a-cursor")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_job_offers_cached_until_change(self, api_client, common_data):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        response = api_client.get("/api/jobs/?page_size=10&seniority=JUNIOR")
+        assert response["X-Cache"] == "MISS"
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get("/api/jobs/?seniority=JUNIOR&page_size=10")
+        assert response["X-Cache"] == "HIT"
+        assert len(context.captured_queries) == 0
+        assert response.data["results"][0]["position"] == job_offer.position
+        assert api_client.get("/metrics/").json()["response_cache.hit"] >= 1
+
+        job_offer.position = "Renamed Job Offer"
+        job_offer.save()
+        response = api_client.get("/api/jobs/?seniority=JUNIOR&page_size=10")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["position"] == "Renamed Job Offer"
+
+    def test_get_job_offers_cache_kept_for_non_employer_users(
+        self, api_client, common_data, candidate_data
+    ):
+        _, employer_user, _, city, _, _, _, _ = common_data
+        _, candidate_user = candidate_data
+        assert api_client.get("/api/jobs/")["X-Cache"] == "MISS"
+
+        User.objects.create_user(
+            email="new@example.com",
+            password="password123",
+            phone_number="5100000099",
+            city=city,
+        )
+        candidate_user.first_name = "Renamed"
+        candidate_user.save()
+        assert api_client.get("/api/jobs/")["X-Cache"] == "HIT"
+
+        employer_user.first_name = "Renamed"
+        employer_user.save()
+        assert api_client.get("/api/jobs/")["X-Cache"] == "MISS"
+
+    def test_get_job_offers_cached_with_file_backend(
+        self, api_client, common_data, tmp_path
+    ):
+        file_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        with override_settings(CACHES=file_cache):
+            assert api_client.get("/api/jobs/")["X-Cache"] == "MISS"
+            response = api_client.get("/api/jobs/")
+            assert response["X-Cache"] == "HIT"
+            assert response.data["count"] == 1
+
+            add_job_offers(common_data, 1)
+            response = api_client.get("/api/jobs/")
+            assert response["X-Cache"] == "MISS"
+            assert response.data["count"] == 2
+
+    def test_get_job_offers_conditional(self, api_client, common_data):
+        _, _, _, _, _, _, job_offer, skill = common_data
+        response = api_client.get("/api/jobs/")
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        assert response["Cache-Control"] == "public, max-age=60"
+
+        response = api_client.get("/api/jobs/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        response = api_client.get("/api/jobs/", HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        skill.name = "Python 3"
+        skill.save()
+        response = api_client.get("/api/jobs/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+
+        JobOfferSkill.objects.filter(offer=job_offer).delete()
+        response = api_client.get(f"/api/jobs/{job_offer.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["skills"] == []
+
+    def test_get_job_offers_conditional_page(self, api_client, common_data):
+        add_job_offers(common_data, 2)
+        newest, older = JobOffer.objects.order_by("-created_at", "-id")[:2]
+        url = "/api/jobs/?page_size=1&page=2"
+        etag = api_client.get(url)["ETag"]
+
+        newest.position = "Renamed"
+        newest.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        older.position = "Renamed"
+        older.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"][0]["id"] == older.id
+
+        url = "/api/jobs/?cursor=&page_size=1"
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        add_job_offers(common_data, 1)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_get_job_offers_constant_queries(self, api_client, common_data):
+        baseline = count_queries(api_client, "/api/jobs/")
+        add_job_offers(common_data, 5)
+        assert count_queries(api_client, "/api/jobs/") == baseline
+
+
+@pytest.mark.django_db
+class TestJobOfferFacetsView:
+    def test_get_facets_success(self, api_client, common_data):
+        employer, _, _, _, _, _, _, _ = common_data
+        add_job_offers(common_data, 2)
+        benefit = Benefit.objects.create(name="Remote work")
+        EmployerBenefit.objects.create(employer=employer, benefit=benefit)
+
+        response = api_client.get("/api/jobs/facets/?seniority=JUNIOR")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total"] == 1
+        seniority = {
+            item["value"]: item["count"] for item in response.data["seniority"]
+        }
+        assert seniority["JUNIOR"] == 1
+        assert seniority["SENIOR"] == 2
+        assert seniority["LEAD"] == 0
+        remoteness = {
+            item["value"]: item["count"] for item in response.data["remoteness"]
+        }
+        assert remoteness == {"onsite": 1, "hybrid": 0, "remote": 0}
+        assert response.data["skill"] == [{"value": "Python", "count": 1}]
+        assert response.data["city"] == [{"value": "Test City", "count": 1}]
+        assert response.data["benefits"] == [{"value": "Remote work", "count": 1}]
+
+    def test_get_facets_ignore_own_skill_filters(self, api_client, common_data):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        add_job_offers(common_data, 1)
+        golang = Skill.objects.create(name="Golang")
+        JobOfferSkill.objects.create(offer=job_offer, skill=golang)
+
+        for query in ("skill_all=Python,Golang", "skill=Python,Golang&skill_match=all"):
+            response = api_client.get(f"/api/jobs/facets/?{query}")
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["total"] == 1
+            assert response.data["skill"] == [
+                {"value": "Python", "count": 2},
+                {"value": "Golang", "count": 1},
+            ]
+            seniority = {
+                item["value"]: item["count"] for item in response.data["seniority"]
+            }
+            assert seniority["SENIOR"] == 0
+
+    def test_get_facets_is_cached(self, api_client, common_data):
+        url = "/api/jobs/facets/?skill=Python&seniority=SENIOR,JUNIOR"
+        assert api_client.get(url).data["total"] == 1
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(
+                "/api/jobs/facets/?seniority=JUNIOR,SENIOR,JUNIOR&skill=Python"
+            )
+        assert response.data["total"] == 1
+        assert len(context.captured_queries) == 0
+
+    def test_get_facets_invalid_filter(self, api_client, common_data):
+        response = api_client.get("/api/jobs/facets/?skill=Unknown")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestRecommendedJobOfferListView:
+    def test_get_recommended_success(self, api_client, common_data, candidate_data):
+        _, _, _, _, _, _, job_offer, skill = common_data
+        candidate, user = candidate_data
+        golang = Skill.objects.create(name="Golang")
+        CandidateSkill.objects.create(candidate=candidate, skill=skill)
+        CandidateSkill.objects.create(candidate=candidate, skill=golang)
+        add_job_offers(common_data, 2)
+        newest = JobOffer.objects.latest("created_at", "id")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get("/api/jobs/recommended/")
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data][0] == newest.id
+        assert [item["score"] for item in response.data] == [1, 1, 1]
+
+        JobOfferSkill.objects.create(offer=job_offer, skill=golang)
+        response = api_client.get("/api/jobs/recommended/?limit=2")
+        assert [item["id"] for item in response.data] == [job_offer.id, newest.id]
+        assert response.data[0]["score"] == 2
+
+        job_offer.delete()
+        response = api_client.get("/api/jobs/recommended/")
+        assert job_offer.id not in [item["id"] for item in response.data]
+
+    def test_get_recommended_as_employer_forbidden(self, api_client, common_data):
+        _, user, _, _, _, _, _, _ = common_data
+        api_client.force_authenticate(user=user)
+        response = api_client.get("/api/jobs/recommended/")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
 @pytest.mark.django_db
@@ -148,6 +476,33 @@ class TestEmployerJobOfferListView:
         assert len(response.data["results"]) == 1
         assert response.data["results"][0]["position"] == job_offer.position
 
+    def test_get_employer_job_offers_conditional(self, api_client, common_data):
+        employer, _, _, _, _, _, _, _ = common_data
+        add_job_offers(common_data, 1)
+        url = f"/api/jobs/employer/{employer.id}/"
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        for offer in JobOffer.objects.exclude(pk=employer.pk):
+            offer.position = "Renamed"
+            offer.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_get_employer_job_offers_single_employer_lookup(
+        self, api_client, common_data
+    ):
+        employer, _, _, _, _, _, _, _ = common_data
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f"/api/jobs/employer/{employer.id}/")
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('SELECT "JobApp_employer"')
+        ] == [context.captured_queries[0]]
+
     def test_get_employer_job_offers_not_found(self, api_client):
         response = api_client.get("/api/jobs/employer/999/")
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -213,6 +568,21 @@ class TestJobOfferProfileDetailView:
         job_offer.refresh_from_db()
         assert job_offer.position == "Updated Job Offer"
 
+    def test_update_job_offer_skills_refreshes_search(self, api_client, common_data):
+        _, user, _, _, _, _, job_offer, _ = common_data
+        django_skill = Skill.objects.create(name="Django")
+        api_client.force_authenticate(user=user)
+        response = api_client.patch(
+            f"/api/jobs/profile/{job_offer.id}/",
+            {"skills": [django_skill.id]},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        document = JobOffer.objects.get(id=job_offer.id).search_document.document
+        assert "django" in document
+        assert "python" not in document
+
     def test_delete_job_offer_profile_success(self, api_client, common_data):
         _, user, _, _, _, _, job_offer, _ = common_data
         api_client.force_authenticate(user=user)
@@ -251,6 +621,45 @@ class TestApplyToJobOfferView:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_apply_minimal_response(self, api_client, common_data, candidate_data):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        candidate, user = candidate_data
+        access = issue_tokens(user)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        url = f"/api/jobs/{job_offer.id}/apply/?response=minimal"
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(url, {}, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        offer_response = OfferResponse.objects.get(offer=job_offer, candidate=candidate)
+        assert response.data == {
+            "id": offer_response.id,
+            "offer": job_offer.id,
+            "candidate": candidate.id,
+            "status": "applied",
+        }
+        # The user lookup and the insert.
+        assert len(context.captured_queries) == 2
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(url, {}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert len(context.captured_queries) == 3
+        assert OfferResponse.objects.filter(offer=job_offer).count() == 1
+
+    def test_apply_invalid_response_mode(self, api_client, common_data, candidate_data):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        _, user = candidate_data
+        api_client.force_authenticate(user=user)
+        response = api_client.post(
+            f"/api/jobs/{job_offer.id}/apply/?response=compact", {}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "response" in response.data
+        assert not OfferResponse.objects.exists()
+
     def test_apply_unauthorized(self, api_client, common_data):
         _, _, _, _, _, _, job_offer, _ = common_data
         response = api_client.post(
@@ -289,6 +698,174 @@ class TestJobOfferApplicantsListView:
         assert response.data["results"][0]["offer"]["id"] == job_offer.id
         assert response.data["results"][0]["candidate"]["id"] == candidate.id
 
+    def test_list_applicants_resolves_employer_once(
+        self, api_client, common_data, candidate_data
+    ):
+        _, employer_user, _, _, _, _, job_offer, _ = common_data
+        candidate, _ = candidate_data
+        OfferResponse.objects.create(offer=job_offer, candidate=candidate)
+        access = issue_tokens(employer_user)["access"]
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f"/api/jobs/profile/{job_offer.id}/applicants/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+        lookups = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "JobApp_user"' in query["sql"]
+            or 'FROM "JobApp_employer"' in query["sql"]
+        ]
+        assert len(lookups) == 1
+        assert 'JOIN "JobApp_employer"' in lookups[0]
+
+    def test_deleted_user_token_rejected(self, api_client, common_data):
+        _, employer_user, _, city, _, _, _, _ = common_data
+        access = issue_tokens(employer_user)["access"]
+        employer_user.delete()
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = api_client.get("/api/jobs/profile/")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = api_client.post(
+            "/api/employers/profile/locations/", {"city": city.id}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_list_applicants_with_legacy_token(self, api_client, common_data):
+        _, employer_user, _, _, _, _, job_offer, _ = common_data
+        access = RefreshToken.for_user(employer_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = api_client.get(f"/api/jobs/profile/{job_offer.id}/applicants/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 0
+
+    def test_list_matches_success(self, api_client, common_data, candidate_data):
+        _, employer_user, _, _, _, _, job_offer, skill = common_data
+        candidate, _ = candidate_data
+        CandidateSkill.objects.create(candidate=candidate, skill=skill)
+        CandidateExperience.objects.create(
+            candidate=candidate,
+            company_name="Acme",
+            job_position="Developer",
+            date_from=date(2020, 1, 1),
+            date_to=date(2022, 1, 1),
+        )
+        other_country = Country.objects.create(name="Other Country")
+        other_city = City.objects.create(
+            name="Other City", country=other_country, province="Other"
+        )
+        remote_user = User.objects.create_user(
+            email="remote@example.com",
+            password="password123",
+            phone_number="5100000002",
+            city=other_city,
+        )
+        remote = Candidate.objects.create(user=remote_user)
+        unskilled_user = User.objects.create_user(
+            email="unskilled@example.com",
+            password="password123",
+            phone_number="5100000003",
+            city=other_city,
+        )
+        Candidate.objects.create(user=unskilled_user)
+
+        api_client.force_authenticate(user=employer_user)
+        url = f"/api/jobs/profile/{job_offer.id}/matches/"
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data] == [candidate.id]
+        assert response.data[0]["score"] == 1.0
+        assert response.data[0]["total_experience"] == 2.0
+
+        CandidateSkill.objects.create(candidate=remote, skill=skill)
+        response = api_client.get(url)
+        assert [item["id"] for item in response.data] == [candidate.id, remote.id]
+        assert response.data[1]["score"] == 0.6
+        assert response.data[1]["location_score"] == 0.0
+
+    def test_list_matches_ranks_tied_candidates_by_experience(
+        self, api_client, common_data
+    ):
+        _, employer_user, _, city, _, _, job_offer, skill = common_data
+        job_offer.seniority = JobOffer.Seniority.SENIOR
+        job_offer.save()
+        candidates = []
+        for i in range(12):
+            user = User.objects.create_user(
+                email=f"tied{i}@example.com",
+                password="password123",
+                phone_number=f"51000001{i:02d}",
+                city=city,
+            )
+            candidate = Candidate.objects.create(user=user)
+            CandidateSkill.objects.create(candidate=candidate, skill=skill)
+            CandidateExperience.objects.create(
+                candidate=candidate,
+                company_name="Acme",
+                job_position="Developer",
+                date_from=date(2000, 1, 1) if i == 0 else date(2020, 1, 1),
+                date_to=date(2010, 1, 1) if i == 0 else date(2021, 1, 1),
+            )
+            candidates.append(candidate)
+
+        api_client.force_authenticate(user=employer_user)
+        url = f"/api/jobs/profile/{job_offer.id}/matches/?limit=1"
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data] == [candidates[0].id]
+        assert response.data[0]["score"] == 1.0
+
+        url = f"/api/jobs/profile/{job_offer.id}/matches/?limit=3"
+        scores = [item["score"] for item in api_client.get(url).data]
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == 1.0
+
+    def test_list_matches_for_other_employer_offer_404(
+        self, api_client, common_data, candidate_data
+    ):
+        _, _, _, _, _, _, job_offer, _ = common_data
+        other_user = User.objects.create_user(
+            email="other-employer@example.com",
+            password="password123",
+            phone_number="5100000009",
+        )
+        Employer.objects.create(
+            user=other_user,
+            company_name="Other Inc",
+            website_url="https://other.example.com",
+            industry=Industry.objects.get(),
+        )
+        api_client.force_authenticate(user=other_user)
+        response = api_client.get(f"/api/jobs/profile/{job_offer.id}/matches/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_applicants_constant_queries(
+        self, api_client, common_data, candidate_data
+    ):
+        _, employer_user, _, city, _, _, job_offer, _ = common_data
+        candidate, _ = candidate_data
+        OfferResponse.objects.create(offer=job_offer, candidate=candidate)
+        api_client.force_authenticate(user=employer_user)
+        url = f"/api/jobs/profile/{job_offer.id}/applicants/"
+        baseline = count_queries(api_client, url)
+
+        for i in range(3):
+            user = User.objects.create_user(
+                email=f"applicant{i}@example.com",
+                password="password123",
+                phone_number=f"520000000{i}",
+                city=city,
+            )
+            applicant = Candidate.objects.create(user=user)
+            OfferResponse.objects.create(offer=job_offer, candidate=applicant)
+
+        assert count_queries(api_client, url) == baseline
+
     def test_list_applicants_for_other_employer_offer_404(
         self, api_client, common_data, candidate_data
     ):
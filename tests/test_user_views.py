@@ -1,8 +1,13 @@
+from unittest import mock
+
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
+from JobApp import metrics
 from JobApp.models import City, Country, User
+from JobApp.throttles import LoginEmailThrottle, RegistrationIPThrottle
 
 
 @pytest.fixture
@@ -59,6 +64,44 @@ class TestLoginView:
         assert "access" in response.data
         assert "refresh" in response.data
         assert response.data["email"] == user.email
+        access = AccessToken(response.data["access"])
+        assert access["role"] == "user"
+        assert access["employer_id"] is None
+        assert access["candidate_id"] is None
+
+    def test_login_mints_one_token_pair(self, api_client, common_data):
+        _, user, _, _, _, _ = common_data
+        with mock.patch.object(
+            RefreshToken, "for_user", wraps=RefreshToken.for_user
+        ) as for_user:
+            response = api_client.post(
+                "/api/users/login/",
+                {"email": user.email, "password": "password123"},
+                format="json",
+            )
+        assert response.status_code == status.HTTP_200_OK
+        assert for_user.call_count == 1
+        refresh = RefreshToken(response.data["refresh"])
+        assert AccessToken(response.data["access"])["user_id"] == refresh["user_id"]
+
+    def test_login_upgrades_password_hash(self, api_client, common_data, settings):
+        _, user, _, _, _, _ = common_data
+        assert user.password.startswith("pbkdf2_sha256$")
+        fast = settings.PASSWORD_HASHING_PROFILES["fast"]
+        settings.PASSWORD_HASHERS = [
+            fast,
+            *(hasher for hasher in settings.PASSWORD_HASHERS if hasher != fast),
+        ]
+
+        response = api_client.post(
+            "/api/users/login/",
+            {"email": user.email, "password": "password123"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256_fast$")
+        assert user.check_password("password123")
 
     def test_login_failure(self, api_client):
         response = api_client.post(
@@ -70,6 +113,38 @@ class TestLoginView:
         assert "access" not in response.data
         assert "refresh" not in response.data
 
+    def test_login_throttled_per_email(self, api_client, common_data):
+        _, user, _, _, _, _ = common_data
+        before = metrics.snapshot()
+        with (
+            mock.patch.dict(
+                LoginEmailThrottle.THROTTLE_RATES, {"login_email": "2/min"}
+            ),
+            mock.patch(
+                "rest_framework_simplejwt.serializers.authenticate"
+            ) as authenticate,
+        ):
+            authenticate.return_value = None
+            responses = [
+                api_client.post(
+                    "/api/users/login/",
+                    {"email": email, "password": "badpass"},
+                    format="json",
+                )
+                for email in [user.email, user.email, user.email.upper()]
+            ]
+        assert [response.status_code for response in responses] == [
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        ]
+        assert "Retry-After" in responses[-1]
+        assert authenticate.call_count == 2
+        after = metrics.snapshot()
+        for name, count in [("processed", 2), ("throttled", 1)]:
+            key = f"login_attempts.{name}"
+            assert after[key] - before.get(key, 0) == count
+
 
 @pytest.mark.django_db
 class TestRegisterUserView:
@@ -83,10 +158,38 @@ class TestRegisterUserView:
             "first_name": "Test",
             "last_name": "User",
         }
-        response = api_client.post("/api/users/register/", payload, format="json")
+        with mock.patch(
+            "rest_framework_simplejwt.serializers.authenticate"
+        ) as authenticate:
+            response = api_client.post("/api/users/register/", payload, format="json")
         assert response.status_code == status.HTTP_201_CREATED
         assert "access" in response.data and "refresh" in response.data
         assert response.data["email"] == payload["email"]
+        authenticate.assert_not_called()
+        user = User.objects.get(email=payload["email"])
+        assert AccessToken(response.data["access"])["user_id"] == user.id
+
+    def test_register_user_throttled_per_ip(self, api_client, common_data):
+        _, _, _, city, _, _ = common_data
+        with mock.patch.dict(
+            RegistrationIPThrottle.THROTTLE_RATES, {"registration_ip": "1/min"}
+        ):
+            responses = [
+                api_client.post(
+                    "/api/users/register/",
+                    {
+                        "email": f"throttled{index}@test.com",
+                        "password": "testPassword",
+                        "phone_number": f"12345678{index}",
+                        "city": city.id,
+                    },
+                    format="json",
+                )
+                for index in range(2)
+            ]
+        assert responses[0].status_code == status.HTTP_201_CREATED
+        assert responses[1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert not User.objects.filter(email="throttled1@test.com").exists()
 
 
 @pytest.mark.django_db